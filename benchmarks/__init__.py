@@ -0,0 +1,13 @@
+"""
+Suíte de desempenho do Venture Gotchi.
+
+    python -m benchmarks --educadores 2 --turmas 3 --alunos 30 --turnos 200 --saida resultados.json
+    python -m benchmarks.comparar base.json resultados.json
+
+`fabricas` semeia um banco de teste com educadores, turmas, alunos e
+partidas com histórico longo; `medicao` mede latência (p50/p99) e
+consultas por requisição das views principais; `carga` dispara um cenário
+de carga HTTP contra um servidor local; `sessoes` conta as consultas de um
+ciclo de turno em cada perfil de sessão. O resultado vai para um JSON com o
+commit, para comparar regressões entre versões.
+"""
@@ -0,0 +1,94 @@
+"""
+Executa a suíte: semeia um banco de teste novo, mede as views e o cenário
+de carga e grava o JSON do resultado.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks das views principais.')
+    parser.add_argument('--educadores', type=int, default=2)
+    parser.add_argument('--turmas', type=int, default=3, help='Turmas por educador.')
+    parser.add_argument('--alunos', type=int, default=30, help='Alunos por turma.')
+    parser.add_argument('--turnos', type=int, default=200, help='Turnos de histórico por partida.')
+    parser.add_argument('--repeticoes', type=int, default=50, help='Requisições medidas por view.')
+    parser.add_argument('--requisicoes', type=int, default=200, help='Requisições por página no cenário de carga.')
+    parser.add_argument('--concorrencia', type=int, default=20, help='Clientes simultâneos no cenário de carga.')
+    parser.add_argument('--sem-carga', action='store_true', help='Pula o cenário de carga HTTP.')
+    parser.add_argument('--saida', default='benchmark.json', help='Arquivo JSON do resultado.')
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from benchmarks.carga import carga_local
+    from benchmarks.fabricas import semear
+    from benchmarks.medicao import medir_views
+    from benchmarks.sessoes import medir_sessoes
+
+    setup_test_environment()
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, '127.0.0.1']
+    nome_original = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        parametros = {
+            campo: getattr(args, campo)
+            for campo in ('educadores', 'turmas', 'alunos', 'turnos', 'repeticoes', 'requisicoes', 'concorrencia')
+        }
+        cenario = semear(args.educadores, args.turmas, args.alunos, args.turnos)
+        resultado = {
+            'commit': _commit(),
+            'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'banco': connection.vendor,
+            'parametros': parametros,
+            'views': medir_views(cenario, args.repeticoes),
+            'sessoes': medir_sessoes(cenario),
+            'carga': None if args.sem_carga else carga_local(cenario, args.requisicoes, args.concorrencia),
+        }
+    finally:
+        connection.creation.destroy_test_db(nome_original, verbosity=0)
+        teardown_test_environment()
+
+    with open(args.saida, 'w') as arquivo:
+        json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+
+    for view, metricas in resultado['views'].items():
+        print(
+            f'{view:<16} p50 {metricas["p50_ms"]:>8.2f} ms   p99 {metricas["p99_ms"]:>8.2f} ms   '
+            f'consultas {metricas["consultas_media"]:>5.1f} (máx {metricas["consultas_max"]})'
+        )
+    sessoes = resultado['sessoes']
+    print(
+        f'ciclo salvar_jogo → carregar_jogo: {sessoes["banco"]["ciclo"]} consultas (banco), '
+        f'{sessoes["producao"]["ciclo"]} (producao), {sessoes["economia_por_ciclo"]} a menos'
+    )
+    for pagina, metricas in (resultado['carga'] or {}).items():
+        print(
+            f'carga {pagina:<16} {metricas["req_s"]:>8.1f} req/s   p50 {metricas["p50_ms"]:>8.2f} ms   '
+            f'p99 {metricas["p99_ms"]:>8.2f} ms   erros {metricas["erros"]}'
+        )
+    print(f'Resultado gravado em {args.saida}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
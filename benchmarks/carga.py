@@ -0,0 +1,124 @@
+"""
+Cenário de carga HTTP.
+
+`servidor_local` sobe a aplicação WSGI em uma thread (como o
+LiveServerTestCase) e `disparar` faz requisições concorrentes com
+clientes autenticados por cookie de sessão, medindo vazão e latência.
+Também é usado pelo comando `benchmark_asgi` contra servidores externos.
+"""
+import logging
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.urls import reverse
+
+from benchmarks.medicao import percentil
+
+
+class _Silencioso(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def cookie_sessao(usuario):
+    """Cria uma sessão autenticada para `usuario` e devolve o cabeçalho Cookie."""
+    sessao = SessionStore()
+    sessao[SESSION_KEY] = str(usuario.pk)
+    sessao[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+    sessao[HASH_SESSION_KEY] = usuario.get_session_auth_hash()
+    sessao.create()
+    return f'{settings.SESSION_COOKIE_NAME}={sessao.session_key}'
+
+
+@contextmanager
+def servidor_local():
+    """URL base de um servidor WSGI local em uma porta livre, encerrado na saída."""
+    # SQLite em memória só existe nesta conexão: as threads do servidor a compartilham
+    compartilhadas = {
+        conexao.alias: conexao
+        for conexao in connections.all()
+        if conexao.vendor == 'sqlite' and conexao.is_in_memory_db()
+    }
+    for conexao in compartilhadas.values():
+        conexao.inc_thread_sharing()
+
+    servidor = ThreadedWSGIServer(('127.0.0.1', 0), _Silencioso, connections_override=compartilhadas)
+    servidor.set_app(get_wsgi_application())
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{servidor.server_port}'
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+        thread.join()
+        for conexao in compartilhadas.values():
+            conexao.dec_thread_sharing()
+
+
+def disparar(url, cookie, requisicoes, concorrencia):
+    """Faz `requisicoes` GETs em `url` com `concorrencia` clientes simultâneos."""
+    def requisitar(_):
+        pedido = urllib.request.Request(url, headers={'Cookie': cookie})
+        inicio = time.perf_counter()
+        try:
+            with urllib.request.urlopen(pedido, timeout=30) as resposta:
+                resposta.read()
+                ok = resposta.status == 200
+        except OSError:
+            ok = False
+        return (time.perf_counter() - inicio) * 1000, ok
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        resultados = list(executor.map(requisitar, range(requisicoes)))
+    duracao = time.perf_counter() - inicio
+
+    latencias = [latencia for latencia, _ in resultados]
+    return {
+        'requisicoes': requisicoes,
+        'concorrencia': concorrencia,
+        'req_s': round(requisicoes / duracao, 1),
+        'p50_ms': round(statistics.median(latencias), 2),
+        'p99_ms': round(percentil(latencias, 99), 2),
+        'erros': sum(not ok for _, ok in resultados),
+    }
+
+
+def paginas_leitura(cenario):
+    """(nome, caminho, cookie) das páginas de leitura do cenário semeado."""
+    aluno, educador = cookie_sessao(cenario.alunos[0]), cookie_sessao(cenario.educadores[0])
+    return [
+        ('carregar_jogo', reverse('carregar_jogo', args=[cenario.partidas[0].pk]), aluno),
+        ('ranking', reverse('ranking'), aluno),
+        ('analise_turma', reverse('analise_turma', args=[cenario.turmas[0].codigo]), educador),
+        ('metricas_turmas', reverse('metricas_turmas'), educador),
+    ]
+
+
+def carga_local(cenario, requisicoes=200, concorrencia=20):
+    """Vazão e latência de cada página de leitura em um servidor local."""
+    paginas = paginas_leitura(cenario)
+    # Com a conexão SQLite compartilhada, a medição de consultas de uma
+    # requisição enxerga as das outras: os avisos de orçamento seriam falsos
+    logger = logging.getLogger('core.query_budget')
+    nivel = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        with servidor_local() as base:
+            return {
+                nome: disparar(base + caminho, cookie, requisicoes, concorrencia)
+                for nome, caminho, cookie in paginas
+            }
+    finally:
+        logger.setLevel(nivel)
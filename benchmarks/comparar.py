@@ -0,0 +1,61 @@
+"""
+Compara dois resultados da suíte e aponta regressões.
+
+    python -m benchmarks.comparar base.json novo.json --tolerancia 0.2
+
+Latência acima de `base * (1 + tolerancia)` ou qualquer consulta a mais
+por requisição conta como regressão; o código de saída é 1 se houver.
+"""
+import argparse
+import json
+import sys
+
+METRICAS_LATENCIA = ('p50_ms', 'p99_ms')
+METRICAS_CONSULTAS = ('consultas_max',)
+
+
+def regressoes(base, novo, tolerancia=0.2):
+    """Lista de (view, métrica, valor base, valor novo) que pioraram."""
+    encontradas = []
+    for view, metricas in novo.get('views', {}).items():
+        anteriores = base.get('views', {}).get(view)
+        if anteriores is None:
+            continue
+        for metrica in METRICAS_LATENCIA:
+            if metricas[metrica] > anteriores[metrica] * (1 + tolerancia):
+                encontradas.append((view, metrica, anteriores[metrica], metricas[metrica]))
+        for metrica in METRICAS_CONSULTAS:
+            if metricas[metrica] > anteriores[metrica]:
+                encontradas.append((view, metrica, anteriores[metrica], metricas[metrica]))
+    return encontradas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compara dois JSONs da suíte de benchmarks.')
+    parser.add_argument('base')
+    parser.add_argument('novo')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Aumento de latência aceito (0.2 = 20%%).')
+    args = parser.parse_args(argv)
+
+    with open(args.base) as arquivo:
+        base = json.load(arquivo)
+    with open(args.novo) as arquivo:
+        novo = json.load(arquivo)
+
+    print(f'{base.get("commit") or "?"} -> {novo.get("commit") or "?"}')
+    for view, metricas in novo.get('views', {}).items():
+        anteriores = base.get('views', {}).get(view, {})
+        colunas = '  '.join(
+            f'{metrica} {anteriores.get(metrica, "-")} -> {metricas[metrica]}'
+            for metrica in METRICAS_LATENCIA + METRICAS_CONSULTAS
+        )
+        print(f'{view:<16} {colunas}')
+
+    encontradas = regressoes(base, novo, args.tolerancia)
+    for view, metrica, antes, depois in encontradas:
+        print(f'REGRESSÃO {view}.{metrica}: {antes} -> {depois}')
+    return 1 if encontradas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
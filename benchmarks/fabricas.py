@@ -0,0 +1,121 @@
+"""
+Fábricas de dados realistas para os benchmarks.
+
+Tudo é gravado com bulk_create: sinais e save() não rodam, então o ranking
+é reconstruído no final. Os valores vêm de um `random.Random(seed)` para
+que duas execuções com os mesmos parâmetros gerem o mesmo banco.
+"""
+import random
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from core.models import (
+    Decisao, HistoricoDecisao, Partida, SnapshotStartup, Startup, StartupMetricaTurno, Turma, User,
+)
+from core.services.codigos import formatar
+from core.services.ranking import reconstruir_ranking
+from core.services.replay import precisa_snapshot
+
+# Lotes de bulk_create para históricos longos
+TAMANHO_LOTE = 1000
+
+
+@dataclass
+class Cenario:
+    """Objetos semeados, usados pelos cenários de medição."""
+    educadores: list = field(default_factory=list)
+    turmas: list = field(default_factory=list)
+    alunos: list = field(default_factory=list)
+    partidas: list = field(default_factory=list)
+
+
+def _dinheiro(valor):
+    return Decimal(valor).quantize(Decimal('0.01'))
+
+
+def _passo(valor, delta):
+    # Como no TurnEngine, receita, valuation e equipe nunca ficam negativos
+    return max(valor + delta, 0)
+
+
+def semear(educadores=2, turmas=3, alunos=30, turnos=200, seed=0):
+    """
+    Cria `educadores`, cada um com `turmas` turmas de `alunos` alunos; cada
+    aluno tem uma partida ativa com `turnos` turnos de histórico, métricas
+    e snapshots. Como no jogo, a partida começa no turno 1 e cada decisão
+    leva ao turno seguinte: o histórico vai do turno 2 ao `turnos + 1`.
+    """
+    rng = random.Random(seed)
+    decisoes = list(Decisao.objects.filter(ativa=True).values_list('titulo', flat=True)) or ['Não fazer nada (Economizar)']
+    cenario = Cenario()
+
+    cenario.educadores = User.objects.bulk_create([
+        User(
+            username=f'bench-educador-{indice}',
+            password='!',
+            categoria=User.Categorias.EDUCADOR_NEGOCIOS,
+        )
+        for indice in range(educadores)
+    ])
+    cenario.turmas = Turma.objects.bulk_create([
+        Turma(
+            codigo=formatar(indice * turmas + numero),
+            nome=f'Turma {numero + 1}',
+            educador=educador,
+        )
+        for indice, educador in enumerate(cenario.educadores)
+        for numero in range(turmas)
+    ])
+    cenario.alunos = User.objects.bulk_create([
+        User(
+            username=f'bench-aluno-{turma.codigo}-{numero}',
+            password='!',
+            categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO,
+            codigo_turma=turma.codigo,
+            turma=turma,
+            pais='Brasil',
+            estado=rng.choice(['SP', 'RJ', 'MG', 'RS', 'PE']),
+            municipio='Cidade',
+        )
+        for turma in cenario.turmas
+        for numero in range(alunos)
+    ])
+    cenario.partidas = Partida.objects.bulk_create([
+        Partida(usuario=aluno, nome_empresa=f'Startup {aluno.username}')
+        for aluno in cenario.alunos
+    ])
+
+    startups = []
+    linhas = {HistoricoDecisao: [], StartupMetricaTurno: [], SnapshotStartup: []}
+    for partida in cenario.partidas:
+        estado = {
+            'saldo_caixa': _dinheiro(rng.uniform(20000, 60000)),
+            'receita_mensal': _dinheiro(rng.uniform(0, 5000)),
+            'valuation': _dinheiro(rng.uniform(50000, 200000)),
+            'funcionarios': rng.randint(1, 5),
+        }
+        for turno in range(2, turnos + 2):
+            anterior = dict(estado)
+            estado['receita_mensal'] = _passo(estado['receita_mensal'], _dinheiro(rng.uniform(-200, 400)))
+            estado['valuation'] = _passo(estado['valuation'], _dinheiro(rng.uniform(-500, 2000)))
+            estado['funcionarios'] = _passo(estado['funcionarios'], rng.choice((-1, 0, 0, 1)))
+            estado['saldo_caixa'] += _dinheiro(rng.uniform(-800, 1000))
+            linhas[HistoricoDecisao].append(HistoricoDecisao(
+                partida=partida,
+                turno=turno,
+                decisao_tomada=rng.choice(decisoes),
+                delta_saldo=estado['saldo_caixa'] - anterior['saldo_caixa'],
+                delta_receita=estado['receita_mensal'] - anterior['receita_mensal'],
+                delta_valuation=estado['valuation'] - anterior['valuation'],
+                delta_funcionarios=estado['funcionarios'] - anterior['funcionarios'],
+            ))
+            linhas[StartupMetricaTurno].append(StartupMetricaTurno(partida=partida, turno=turno, **estado))
+            if precisa_snapshot(turno):
+                linhas[SnapshotStartup].append(SnapshotStartup(partida=partida, turno=turno, **estado))
+        startups.append(Startup(partida=partida, turno_atual=turnos + 1, **estado))
+
+    Startup.objects.bulk_create(startups, batch_size=TAMANHO_LOTE)
+    for modelo, objetos in linhas.items():
+        modelo.objects.bulk_create(objetos, batch_size=TAMANHO_LOTE)
+    reconstruir_ranking()
+    return cenario
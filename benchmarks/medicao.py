@@ -0,0 +1,85 @@
+"""
+Latência e consultas por requisição das views principais.
+
+As requisições passam pelo Client de teste com a pilha completa de
+middlewares; o número de consultas vem do `QueryBudgetMiddleware`
+(`response.relatorio_consultas`).
+"""
+import statistics
+import time
+from dataclasses import asdict, dataclass
+
+from django.test import Client
+from django.urls import reverse
+
+DECISAO = 'Não fazer nada (Economizar)'
+
+
+@dataclass
+class ResultadoView:
+    requisicoes: int
+    p50_ms: float
+    p99_ms: float
+    consultas_media: float
+    consultas_max: int
+
+    def como_dict(self):
+        return asdict(self)
+
+
+def percentil(valores, posicao):
+    """Percentil `posicao` (1 a 99) de uma lista de valores."""
+    if len(valores) < 2:
+        return valores[0] if valores else 0.0
+    return statistics.quantiles(valores, n=100, method='inclusive')[posicao - 1]
+
+
+def medir(requisitar, repeticoes):
+    """Executa `requisitar()` `repeticoes` vezes e resume latências e consultas."""
+    latencias, consultas = [], []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        response = requisitar()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+        if response.status_code >= 400:
+            raise AssertionError(f'{response.status_code} em {response.request["PATH_INFO"]}')
+        consultas.append(response.relatorio_consultas.consultas)
+    return ResultadoView(
+        requisicoes=repeticoes,
+        p50_ms=round(statistics.median(latencias), 2),
+        p99_ms=round(percentil(latencias, 99), 2),
+        consultas_media=round(statistics.mean(consultas), 2),
+        consultas_max=max(consultas),
+    )
+
+
+def _cliente(usuario):
+    client = Client()
+    client.force_login(usuario)
+    return client
+
+
+def cenarios(cenario):
+    """Pares (nome da view, função que faz uma requisição) para o `cenario` semeado."""
+    aluno, partida = cenario.alunos[0], cenario.partidas[0]
+    educador, turma = cenario.educadores[0], cenario.turmas[0]
+    jogador, professor = _cliente(aluno), _cliente(educador)
+    # Cliente próprio: as mensagens do turno ficam na sessão dele
+    turnos = _cliente(aluno)
+
+    return [
+        ('salvar_jogo', lambda: turnos.post(reverse('salvar_jogo', args=[partida.pk]), {'decisao': DECISAO})),
+        ('carregar_jogo', lambda: jogador.get(reverse('carregar_jogo', args=[partida.pk]))),
+        ('ranking', lambda: jogador.get(reverse('ranking'))),
+        ('analise_turma', lambda: professor.get(reverse('analise_turma', args=[turma.codigo]))),
+        ('metricas_turmas', lambda: professor.get(reverse('metricas_turmas'))),
+    ]
+
+
+def medir_views(cenario, repeticoes=50):
+    """Resultado de cada view, na ordem dos cenários."""
+    resultados = {}
+    for nome, requisitar in cenarios(cenario):
+        requisitar()  # aquecimento: caches em memória e templates compilados
+        resultados[nome] = medir(requisitar, repeticoes).como_dict()
+    return resultados
@@ -0,0 +1,37 @@
+"""
+Consultas economizadas pelos perfis de sessão (PERFIS_SESSAO nas settings).
+
+Mede um ciclo salvar_jogo → carregar_jogo de um aluno em cada perfil,
+contando as consultas de toda a pilha de middlewares, inclusive a leitura
+da sessão e a gravação das mensagens do turno.
+"""
+from django.conf import settings
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from benchmarks.medicao import DECISAO
+
+
+def consultas_ciclo(aluno, partida, perfil):
+    """Consultas de salvar_jogo e carregar_jogo com o perfil de sessão `perfil`."""
+    with override_settings(**settings.PERFIS_SESSAO[perfil]):
+        client = Client()
+        client.force_login(aluno)
+        ciclo = [
+            ('salvar_jogo', lambda: client.post(reverse('salvar_jogo', args=[partida.pk]), {'decisao': DECISAO})),
+            ('carregar_jogo', lambda: client.get(reverse('carregar_jogo', args=[partida.pk]))),
+        ]
+        # Aquecimento: a primeira leitura da sessão ainda vem do banco
+        for _, requisitar in ciclo:
+            requisitar()
+        consultas = {nome: requisitar().relatorio_consultas.consultas for nome, requisitar in ciclo}
+    consultas['ciclo'] = sum(consultas.values())
+    return consultas
+
+
+def medir_sessoes(cenario):
+    """Consultas por ciclo em cada perfil e a economia do perfil 'producao' sobre o 'banco'."""
+    aluno, partida = cenario.alunos[0], cenario.partidas[0]
+    resultado = {perfil: consultas_ciclo(aluno, partida, perfil) for perfil in settings.PERFIS_SESSAO}
+    resultado['economia_por_ciclo'] = resultado['banco']['ciclo'] - resultado['producao']['ciclo']
+    return resultado
@@ -3,8 +3,11 @@ Django settings for config project.
 """
 
 import os
+import tempfile
+from importlib.util import find_spec
 from pathlib import Path
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,8 +47,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primeiro da lista para medir também as consultas de sessão e autenticação
+    'core.query_budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # WhiteNoise com suporte a ASGI (ver core/middleware.py)
+    "core.middleware.WhiteNoiseMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -73,6 +79,10 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Entrada ASGI (ex.: gunicorn config.asgi:application -k uvicorn_worker.UvicornWorker),
+# onde ranking, conquistas e analise_turma rodam como views assíncronas
+ASGI_APPLICATION = 'config.asgi.application'
+
 
 # Database
 # Lógica Inteligente: Usa SQLite localmente e Postgres no Render
@@ -96,6 +106,65 @@ if database_url:
     )
 
 
+# Cache padrão (ranking etc.): Redis quando REDIS_URL existe (requer o
+# pacote redis), compartilhado entre os workers; senão, a memória local de
+# cada processo. As sessões têm um cache próprio que, sem Redis, fica em
+# arquivos: todos os workers da máquina enxergam o mesmo logout, o que um
+# cache por processo não garante. Os arquivos são locais à máquina, então
+# sem Redis o perfil 'producao' vale para uma instância só: INSTANCIAS > 1
+# exige REDIS_URL (veja abaixo). CACHE_SESSOES_MAX deve comportar todas as
+# sessões ativas; ao atingi-lo o Django apaga um terço dos arquivos, e essas
+# sessões voltam a ser lidas do banco.
+INSTANCIAS = int(os.getenv("INSTANCIAS", "1"))
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL},
+        'sessoes': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': REDIS_URL, 'KEY_PREFIX': 'sessoes'},
+    }
+else:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'sessoes': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv("CACHE_SESSOES_DIR", os.path.join(tempfile.gettempdir(), 'venture_gotchi_sessoes')),
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv("CACHE_SESSOES_MAX", "20000"))},
+        },
+    }
+
+# Catálogos em memória (decisões, eventos, conquistas): a versão fica no
+# cache padrão; sem Redis, cada worker refaz a sua cópia a cada
+# CATALOGO_VALIDADE segundos para enxergar edições feitas em outro processo.
+CATALOGO_VALIDADE = int(os.getenv("CATALOGO_VALIDADE", "60"))
+
+# Sessões e mensagens. No perfil 'producao' a sessão é lida do cache
+# (cached_db: o banco segue como cópia durável e só é lido quando o cache
+# não tem a sessão) e as mensagens ficam apenas no cookie assinado, sem
+# gravar na sessão a cada turno. 'banco' é o padrão do Django. Sem
+# PERFIL_SESSAO, o Render (DATABASE_URL) usa 'producao'.
+PERFIS_SESSAO = {
+    'banco': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    },
+    'producao': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+}
+PERFIL_SESSAO = os.getenv("PERFIL_SESSAO", "producao" if database_url else "banco")
+if PERFIL_SESSAO not in PERFIS_SESSAO:
+    raise ImproperlyConfigured(f"PERFIL_SESSAO={PERFIL_SESSAO!r} desconhecido; use {' ou '.join(PERFIS_SESSAO)}.")
+if PERFIL_SESSAO == 'producao' and INSTANCIAS > 1 and not REDIS_URL:
+    raise ImproperlyConfigured(
+        "PERFIL_SESSAO='producao' com INSTANCIAS > 1 requer REDIS_URL: "
+        "o cache de sessões em arquivo não é compartilhado entre instâncias."
+    )
+SESSION_ENGINE = PERFIS_SESSAO[PERFIL_SESSAO]['SESSION_ENGINE']
+MESSAGE_STORAGE = PERFIS_SESSAO[PERFIL_SESSAO]['MESSAGE_STORAGE']
+SESSION_CACHE_ALIAS = 'sessoes'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -115,6 +184,39 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Custo do hash de senha (core/hashers.py). PERFIL_HASH escolhe o hasher
+# das senhas novas: 'pbkdf2' ou 'argon2' (requer argon2-cffi). Os demais
+# ficam na lista só para verificar hashes antigos, refeitos no próximo
+# login. Meça cada perfil com `python manage.py benchmark_hash`.
+PERFIL_HASH = os.getenv("PERFIL_HASH", "pbkdf2")
+HASH_PBKDF2_ITERACOES = int(os.getenv("HASH_PBKDF2_ITERACOES", "0")) or None
+HASH_ARGON2 = {
+    parametro: int(valor)
+    for parametro, variavel in (
+        ('time_cost', 'HASH_ARGON2_TEMPO'),
+        ('memory_cost', 'HASH_ARGON2_MEMORIA_KIB'),
+        ('parallelism', 'HASH_ARGON2_PARALELISMO'),
+    )
+    if (valor := os.getenv(variavel))
+}
+HASHERS_PERFIL = {
+    'pbkdf2': 'core.hashers.PBKDF2Calibrado',
+    'argon2': 'core.hashers.Argon2Calibrado',
+}
+# Falha na inicialização, não no primeiro login com um hasher indisponível
+if PERFIL_HASH not in HASHERS_PERFIL:
+    raise ImproperlyConfigured(f"PERFIL_HASH={PERFIL_HASH!r} desconhecido; use {' ou '.join(HASHERS_PERFIL)}.")
+if PERFIL_HASH == 'argon2' and find_spec('argon2') is None:
+    raise ImproperlyConfigured("PERFIL_HASH='argon2' requer o pacote argon2-cffi.")
+PASSWORD_HASHERS = [HASHERS_PERFIL[PERFIL_HASH]] + [
+    hasher for perfil, hasher in HASHERS_PERFIL.items() if perfil != PERFIL_HASH
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -148,4 +250,8 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'login'
 
+# Validade dos convites da importação de alunos (core/services/matriculas.py),
+# independente do PASSWORD_RESET_TIMEOUT; vencidos, o educador gera outros
+PRAZO_CONVITE = int(os.getenv("PRAZO_CONVITE_DIAS", "30")) * 24 * 60 * 60
+
 AUTH_USER_MODEL = 'core.User'
\ No newline at end of file
@@ -3,11 +3,13 @@ from django.contrib import admin
 from .models import (
     Conquista,
     ConquistaDesbloqueada,
+    Decisao,
     Evento,
     EventoPartida,
     Fundador,
     HistoricoDecisao,
     Partida,
+    SnapshotStartup,
     Startup,
     Turma,
 )
@@ -47,12 +49,27 @@ class StartupAdmin(admin.ModelAdmin):
 
 @admin.register(HistoricoDecisao)
 class HistoricoDecisaoAdmin(admin.ModelAdmin):
-    list_display = ("id", "partida", "turno", "data_decisao")
+    list_display = ("id", "partida", "turno", "delta_saldo", "delta_valuation", "data_decisao")
     list_filter = ("turno", "data_decisao")
     search_fields = ("partida__nome_empresa", "decisao_tomada")
     list_select_related = ("partida",)
 
 
+@admin.register(SnapshotStartup)
+class SnapshotStartupAdmin(admin.ModelAdmin):
+    list_display = ("id", "partida", "turno", "saldo_caixa", "valuation", "criado_em")
+    search_fields = ("partida__nome_empresa",)
+    list_select_related = ("partida",)
+
+
+@admin.register(Decisao)
+class DecisaoAdmin(admin.ModelAdmin):
+    list_display = ("titulo", "custo", "delta_receita", "delta_valuation", "delta_funcionarios", "ordem", "ativa")
+    list_filter = ("ativa",)
+    list_editable = ("ordem", "ativa")
+    search_fields = ("titulo", "nome_curto")
+
+
 @admin.register(Fundador)
 class FundadorAdmin(admin.ModelAdmin):
     list_display = ("partida", "nome", "experiencia", "anos_experiencia", "idade")
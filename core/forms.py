@@ -4,6 +4,17 @@ from django.core.validators import RegexValidator
 from django.contrib.auth import get_user_model
 import re
 from .models import User, Turma
+from core.services.cadastro import conflitos
+
+# Campo do formulário que vira `documento`, por categoria
+CAMPO_DOCUMENTO = {
+    User.Categorias.EDUCADOR_NEGOCIOS: 'cpf',
+    User.Categorias.ASPIRANTE_EMPREENDEDOR: 'cpf',
+    User.Categorias.PROFISSIONAL_CORPORATIVO: 'cnpj',
+}
+
+# Unicidade conferida por verificar_conflitos, não pelo full_clean do modelo
+CAMPOS_CONFERIDOS = {'username', 'email'}
 
 class CadastroUsuarioForm(UserCreationForm):
     username = forms.CharField(
@@ -113,10 +124,6 @@ class CadastroUsuarioForm(UserCreationForm):
         if not re.match(r'^[a-zA-Z0-9._@+-]+$', username):
             raise forms.ValidationError("Nome de usuário pode conter apenas letras, números, e os caracteres: . @ + -")
         
-        # Verificar se já existe
-        if User.objects.filter(username=username).exists():
-            raise forms.ValidationError(f"O nome de usuário '{username}' já está em uso. Escolha outro.")
-        
         return username
 
     def clean_email(self):
@@ -131,10 +138,6 @@ class CadastroUsuarioForm(UserCreationForm):
         if not re.match(email_regex, email):
             raise forms.ValidationError("Formato de e-mail inválido. Use um e-mail válido (exemplo: usuario@dominio.com).")
         
-        # Verificar se já existe
-        if User.objects.filter(email=email).exists():
-            raise forms.ValidationError(f"Este e-mail ('{email}') já está registrado. Use outro e-mail ou recupere sua senha.")
-        
         return email
 
     def clean_password2(self):
@@ -232,6 +235,8 @@ class CadastroUsuarioForm(UserCreationForm):
             cleaned_data['estado'] = 'SP'
         if not cleaned_data.get('pais'):
             cleaned_data['pais'] = 'Brasil'
+
+        self.verificar_conflitos()
         
         if categoria == User.Categorias.ESTUDANTE_UNIVERSITARIO:
             errors = {}
@@ -244,7 +249,8 @@ class CadastroUsuarioForm(UserCreationForm):
                 cleaned_data['codigo_turma'] = codigo_turma
                 
                 # Valida se a turma existe e está ativa no banco de dados
-                turma = Turma.objects.filter(codigo__iexact=codigo_turma, ativa=True).first()
+                turma = Turma.objects.filter(codigo=codigo_turma, ativa=True).first()
+                self.turma = turma
                 if not turma:
                     errors['codigo_turma'] = f"A turma '{codigo_turma}' não existe. Verifique o código e tente novamente."
             
@@ -327,6 +333,38 @@ class CadastroUsuarioForm(UserCreationForm):
             cleaned_data['documento'] = cnpj
         
         return cleaned_data
+
+    def verificar_conflitos(self):
+        """Usuário, e-mail e documento já usados, em uma consulta só"""
+        cleaned_data = self.cleaned_data
+        categoria = cleaned_data.get('categoria')
+        username = cleaned_data.get('username')
+        email = cleaned_data.get('email')
+        campo_documento = CAMPO_DOCUMENTO.get(categoria)
+        documento = cleaned_data.get(campo_documento) if campo_documento else None
+
+        encontrados = conflitos([username], [email], [documento])
+        if username and username.lower() in encontrados.usernames:
+            self.add_error('username', f"O nome de usuário '{username}' já está em uso. Escolha outro.")
+        if email and email.lower() in encontrados.emails:
+            self.add_error('email', f"Este e-mail ('{email}') já está registrado. Use outro e-mail ou recupere sua senha.")
+        if documento and documento in encontrados.documentos:
+            self.add_error(campo_documento, f"Este {campo_documento.upper()} já está cadastrado.")
+
+    def _get_validation_exclusions(self):
+        # A unicidade de usuário e e-mail já foi conferida em verificar_conflitos;
+        # sem isso o full_clean do modelo repetiria uma consulta por restrição
+        return super()._get_validation_exclusions() | CAMPOS_CONFERIDOS
+
+    def _post_clean(self):
+        super()._post_clean()
+        # A exclusão acima também pula validadores e tamanho máximo dos dois
+        # campos; eles rodam aqui, sem as verificações de unicidade
+        validar = CAMPOS_CONFERIDOS - super()._get_validation_exclusions()
+        try:
+            self.instance.clean_fields(exclude={campo.name for campo in User._meta.fields} - validar)
+        except forms.ValidationError as e:
+            self._update_errors(e)
     
     def save(self, commit=True):
         """
@@ -349,6 +387,8 @@ class CadastroUsuarioForm(UserCreationForm):
         elif categoria == User.Categorias.ESTUDANTE_UNIVERSITARIO:
             user.documento = None
             user.tipo_documento = 'CPF'
+            # Turma já validada no clean; evita nova busca no save do usuário
+            user.turma = getattr(self, 'turma', None)
 
         # Garantir defaults de localização ao salvar
         if not user.municipio:
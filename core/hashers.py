@@ -0,0 +1,36 @@
+"""
+Hashers de senha com custo configurável (PERFIL_HASH em config/settings.py).
+
+Os parâmetros são lidos das settings a cada uso, não fixados na classe:
+ao mudar o custo, os hashes antigos continuam válidos e o Django os refaz
+com o custo novo no próximo login do usuário (`must_update`).
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+
+
+class PBKDF2Calibrado(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 com HASH_PBKDF2_ITERACOES iterações (padrão do Django se omitido)."""
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'HASH_PBKDF2_ITERACOES', None) or PBKDF2PasswordHasher.iterations
+
+
+class Argon2Calibrado(Argon2PasswordHasher):
+    """Argon2id com time_cost, memory_cost (KiB) e parallelism de HASH_ARGON2. Requer argon2-cffi."""
+
+    def _parametro(self, nome):
+        return getattr(settings, 'HASH_ARGON2', {}).get(nome) or getattr(Argon2PasswordHasher, nome)
+
+    @property
+    def time_cost(self):
+        return self._parametro('time_cost')
+
+    @property
+    def memory_cost(self):
+        return self._parametro('memory_cost')
+
+    @property
+    def parallelism(self):
+        return self._parametro('parallelism')
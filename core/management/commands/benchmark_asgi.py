@@ -0,0 +1,64 @@
+"""
+Compara as implantações WSGI e ASGI sob carga concorrente nas páginas de
+leitura (ranking, conquistas e analise_turma).
+
+Os dois servidores devem usar o mesmo banco deste comando, por exemplo:
+
+    gunicorn config.wsgi:application -w 2 -b 127.0.0.1:8000
+    gunicorn config.asgi:application -w 2 -k uvicorn_worker.UvicornWorker -b 127.0.0.1:8001
+    python manage.py benchmark_asgi --wsgi http://127.0.0.1:8000 --asgi http://127.0.0.1:8001
+
+O comando cria um educador, uma turma e um aluno temporários, abre uma
+sessão para cada um e dispara as requisições com `--concorrencia` clientes
+simultâneos, reportando requisições por segundo e as latências p50/p99.
+"""
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from benchmarks.carga import cookie_sessao, disparar
+from core.models import Partida, Startup, Turma, User
+from core.services.ranking import sincronizar_entrada
+
+
+class Command(BaseCommand):
+    help = 'Compara requisições por segundo e latência entre os servidores WSGI e ASGI nas páginas de leitura.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi', default='http://127.0.0.1:8000', help='URL base do servidor WSGI.')
+        parser.add_argument('--asgi', default='http://127.0.0.1:8001', help='URL base do servidor ASGI.')
+        parser.add_argument('--requisicoes', type=int, default=500, help='Requisições por página e servidor.')
+        parser.add_argument('--concorrencia', type=int, default=50, help='Clientes simultâneos.')
+
+    def handle(self, *args, **options):
+        sufixo = uuid.uuid4().hex[:8]
+        educador = User.objects.create_user(username=f'benchmark-edu-{sufixo}', categoria=User.Categorias.EDUCADOR_NEGOCIOS)
+        turma = Turma.objects.create(codigo=Turma.gerar_codigo_unico(), nome='Benchmark', educador=educador)
+        aluno = User.objects.create_user(
+            username=f'benchmark-aluno-{sufixo}',
+            categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO,
+            codigo_turma=turma.codigo,
+        )
+        partida = Partida.objects.create(usuario=aluno, nome_empresa='Benchmark')
+        Startup.objects.create(partida=partida, saldo_caixa='30000.00')
+        sincronizar_entrada(partida.pk)
+        try:
+            paginas = [
+                ('ranking', reverse('ranking'), cookie_sessao(aluno)),
+                ('conquistas', reverse('conquistas'), cookie_sessao(aluno)),
+                ('analise_turma', reverse('analise_turma', args=[turma.codigo]), cookie_sessao(educador)),
+            ]
+            for nome, caminho, cookie in paginas:
+                for implantacao in ('wsgi', 'asgi'):
+                    url = options[implantacao].rstrip('/') + caminho
+                    metricas = disparar(url, cookie, options['requisicoes'], options['concorrencia'])
+                    self.stdout.write(
+                        f'{nome:<14} {implantacao:<5} {metricas["req_s"]:>8.1f} req/s   '
+                        f'p50 {metricas["p50_ms"]:>7.1f} ms   p99 {metricas["p99_ms"]:>7.1f} ms   '
+                        f'erros {metricas["erros"]}'
+                    )
+        finally:
+            aluno.delete()
+            turma.delete()
+            educador.delete()
@@ -0,0 +1,100 @@
+"""
+Mede logins por segundo por núcleo em cada perfil de hash de senha, para
+dimensionar os workers para o pico de logins no início de uma aula.
+
+    python manage.py benchmark_hash --iteracoes 600000 1000000 --argon2 2,19456,1 3,65536,4 \
+        --alunos 300 --janela 10 --processos 4
+
+Cada configuração verifica a mesma senha repetidamente durante `--segundos`
+em `--processos` processos (um por núcleo). A verificação do hash domina o
+custo de um login; o restante (sessão e consulta do usuário) não entra na
+medida. A última coluna é quantos núcleos dão conta de `--alunos` logins
+em `--janela` segundos.
+"""
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import Argon2PasswordHasher, PBKDF2PasswordHasher
+from django.core.management.base import BaseCommand
+
+SENHA = 'SenhaDeBenchmark123!'
+
+
+def _hasher(algoritmo, parametros):
+    if algoritmo == 'pbkdf2':
+        hasher = PBKDF2PasswordHasher()
+        hasher.iterations = parametros['iterations']
+    else:
+        hasher = Argon2PasswordHasher()
+        hasher.time_cost, hasher.memory_cost, hasher.parallelism = (
+            parametros['time_cost'], parametros['memory_cost'], parametros['parallelism'],
+        )
+    return hasher
+
+
+def verificacoes_por_segundo(algoritmo, parametros, segundos):
+    """Verificações de senha por segundo neste processo, medidas por pelo menos `segundos`."""
+    hasher = _hasher(algoritmo, parametros)
+    codificada = hasher.encode(SENHA, hasher.salt())
+    total = 0
+    inicio = time.perf_counter()
+    while not total or time.perf_counter() - inicio < segundos:
+        hasher.verify(SENHA, codificada)
+        total += 1
+    return total / (time.perf_counter() - inicio)
+
+
+def _argon2(valor):
+    try:
+        time_cost, memory_cost, parallelism = (int(parte) for parte in valor.split(','))
+    except ValueError:
+        raise ValueError(f"Use tempo,memória_KiB,paralelismo (ex.: 2,19456,1), não '{valor}'.")
+    return {'time_cost': time_cost, 'memory_cost': memory_cost, 'parallelism': parallelism}
+
+
+class Command(BaseCommand):
+    help = 'Mede logins por segundo por núcleo em cada perfil de hash de senha (PBKDF2 e Argon2).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iteracoes', type=int, nargs='*', default=[PBKDF2PasswordHasher.iterations],
+                            help='Iterações do PBKDF2 a medir.')
+        parser.add_argument('--argon2', type=_argon2, nargs='*', default=[],
+                            help='Configurações Argon2 a medir, como tempo,memória_KiB,paralelismo.')
+        parser.add_argument('--segundos', type=float, default=3.0, help='Duração da medida de cada configuração.')
+        parser.add_argument('--processos', type=int, default=1, help='Processos simultâneos (um por núcleo).')
+        parser.add_argument('--alunos', type=int, default=300, help='Logins do pico a dimensionar.')
+        parser.add_argument('--janela', type=float, default=10.0, help='Segundos em que o pico acontece.')
+
+    def handle(self, *args, **options):
+        configuracoes = [
+            ('pbkdf2', f'PBKDF2 {iteracoes} iterações', {'iterations': iteracoes})
+            for iteracoes in options['iteracoes']
+        ]
+        if options['argon2']:
+            try:
+                Argon2PasswordHasher()._load_library()
+            except ValueError:
+                self.stderr.write('argon2-cffi não instalado: configurações Argon2 ignoradas.')
+            else:
+                configuracoes += [
+                    ('argon2', f'Argon2 t={p["time_cost"]} m={p["memory_cost"]}KiB p={p["parallelism"]}', p)
+                    for p in options['argon2']
+                ]
+
+        processos, segundos = options['processos'], options['segundos']
+        pico = options['alunos'] / options['janela']
+        self.stdout.write(f'{"perfil":<40} {"logins/s/núcleo":>16} {"ms/login":>9} {"núcleos p/ pico":>16}')
+        for algoritmo, nome, parametros in configuracoes:
+            if processos > 1:
+                with ProcessPoolExecutor(max_workers=processos) as executor:
+                    tarefas = [
+                        executor.submit(verificacoes_por_segundo, algoritmo, parametros, segundos)
+                        for _ in range(processos)
+                    ]
+                    por_nucleo = sum(tarefa.result() for tarefa in tarefas) / processos
+            else:
+                por_nucleo = verificacoes_por_segundo(algoritmo, parametros, segundos)
+            self.stdout.write(
+                f'{nome:<40} {por_nucleo:>16.1f} {1000 / por_nucleo:>9.1f} {math.ceil(pico / por_nucleo):>16}'
+            )
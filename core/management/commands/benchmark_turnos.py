@@ -0,0 +1,134 @@
+"""
+Mede turnos por segundo no banco configurado (SQLite local ou Postgres via
+DATABASE_URL), comparando o fluxo antigo do salvar_jogo em autocommit com o
+TurnEngine transacional, com a view completa e com a simulação em lote.
+
+O fluxo antigo é reproduzido aqui como era antes do TurnEngine: custos
+fixos no código, `save()` da startup inteira e a varredura completa das
+conquistas com um `get_or_create` por conquista alcançada. Ele roda sobre o
+esquema atual, então os receptores de sinais de hoje também entram na
+conta.
+"""
+import time
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from core.models import Conquista, ConquistaDesbloqueada, HistoricoDecisao, Partida, Startup, User
+from core.services.conquistas import CONQUISTAS_SALDO, TITULO_PERSISTENTE, TITULO_PRIMEIRA_SIMULACAO
+from core.services.turno import TurnEngine, simulate_turns
+
+DECISAO = 'Investir em Marketing Agressivo'
+
+# Tabela de custos e efeitos que ficava dentro do salvar_jogo
+CUSTOS_LEGADO = {
+    'Investir em Marketing Agressivo': Decimal('5000.00'),
+    'Contratar Engenheiro Sênior': Decimal('8000.00'),
+    'Não fazer nada (Economizar)': Decimal('0.00'),
+}
+TITULOS_SALDO = [conquista['titulo'] for conquista in CONQUISTAS_SALDO]
+
+
+class Command(BaseCommand):
+    help = 'Compara turnos por segundo entre o fluxo antigo do salvar_jogo, o TurnEngine, a view e a simulação em lote.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--turnos', type=int, default=200, help='Turnos jogados em cada cenário.')
+
+    def handle(self, *args, **options):
+        turnos = options['turnos']
+        usuario = User.objects.create_user(
+            username=f'benchmark-{uuid.uuid4().hex[:8]}',
+            categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO,
+        )
+        try:
+            cenarios = [
+                ('legado (autocommit)', lambda partida: self._turno_legado(partida)),
+                ('TurnEngine', lambda partida: TurnEngine(partida).jogar(DECISAO)),
+                ('view salvar_jogo', self._turno_view(usuario)),
+            ]
+            self.stdout.write(f'Banco: {connection.vendor} ({turnos} turnos por cenário)')
+            for nome, jogar_turno in cenarios:
+                partida = self._nova_partida(usuario)
+                inicio = time.perf_counter()
+                for _ in range(turnos):
+                    jogar_turno(partida)
+                duracao = time.perf_counter() - inicio
+                self.stdout.write(f'{nome:<22} {turnos / duracao:>10.1f} turnos/s')
+
+            # Todos os turnos em uma única chamada
+            partida = self._nova_partida(usuario)
+            inicio = time.perf_counter()
+            simulate_turns(partida, [DECISAO] * turnos)
+            duracao = time.perf_counter() - inicio
+            self.stdout.write(f'{"simulate_turns (lote)":<22} {turnos / duracao:>10.1f} turnos/s')
+        finally:
+            usuario.delete()
+
+    def _nova_partida(self, usuario):
+        partida = Partida.objects.create(usuario=usuario, nome_empresa='Benchmark')
+        Startup.objects.create(partida=partida, saldo_caixa='30000.00')
+        return partida
+
+    def _turno_legado(self, partida):
+        """Reproduz o salvar_jogo anterior: leitura, save() e inserts em autocommit."""
+        partida = Partida.objects.select_related('startup').get(pk=partida.pk)
+        startup = partida.startup
+
+        receita = startup.receita_mensal
+        saldo = startup.saldo_caixa + receita
+        custo = CUSTOS_LEGADO.get(DECISAO, Decimal('0.00'))
+        if saldo < custo:
+            return
+        if DECISAO == 'Investir em Marketing Agressivo':
+            startup.receita_mensal += Decimal('3000.00')
+        elif DECISAO == 'Contratar Engenheiro Sênior':
+            startup.valuation += Decimal('25000.00')
+            startup.receita_mensal += Decimal('2000.00')
+            startup.funcionarios += 1
+        startup.saldo_caixa = saldo - custo
+        startup.turno_atual += 1
+        startup.save()
+
+        HistoricoDecisao.objects.create(partida=partida, decisao_tomada=DECISAO, turno=startup.turno_atual)
+        self._conquistas_partida_legado(partida)
+        self._conquistas_progresso_legado(partida)
+
+    def _conquistas_partida_legado(self, partida):
+        desbloqueadas = ConquistaDesbloqueada.objects.filter(partida=partida).values_list('conquista_id', flat=True)
+        conquista, _ = Conquista.objects.get_or_create(
+            titulo=TITULO_PRIMEIRA_SIMULACAO,
+            defaults={'descricao': 'Você completou a primeira simulação!', 'tipo': 'progresso', 'pontos': 10},
+        )
+        if conquista.id not in desbloqueadas:
+            ConquistaDesbloqueada.objects.create(partida=partida, conquista=conquista, turno=partida.startup.turno_atual)
+
+    def _conquistas_progresso_legado(self, partida):
+        # Verificação de existência, busca do catálogo e um get_or_create por conquista alcançada
+        Conquista.objects.filter(titulo=TITULOS_SALDO[-1]).exists()
+        persistente = Conquista.objects.get(titulo=TITULO_PERSISTENTE)
+        por_valor = {c.valor_objetivo: c for c in Conquista.objects.filter(titulo__in=TITULOS_SALDO)}
+
+        startup = partida.startup
+        if startup.turno_atual >= 5:
+            ConquistaDesbloqueada.objects.get_or_create(
+                partida=partida, conquista=persistente, defaults={'turno': startup.turno_atual},
+            )
+        for valor, conquista in por_valor.items():
+            if startup.saldo_caixa >= valor:
+                ConquistaDesbloqueada.objects.get_or_create(
+                    partida=partida, conquista=conquista, defaults={'turno': startup.turno_atual},
+                )
+
+    def _turno_view(self, usuario):
+        client = Client(SERVER_NAME='localhost')
+        client.force_login(usuario)
+
+        def jogar(partida):
+            client.post(reverse('salvar_jogo', args=[partida.pk]), {'decisao': DECISAO})
+
+        return jogar
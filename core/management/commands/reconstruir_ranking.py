@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services.ranking import reconstruir_ranking
+
+
+class Command(BaseCommand):
+    help = 'Recalcula a tabela do ranking a partir das startups e conquistas.'
+
+    def handle(self, *args, **options):
+        total = reconstruir_ranking()
+        self.stdout.write(self.style.SUCCESS(f'{total} partida(s) no ranking.'))
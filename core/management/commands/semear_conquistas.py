@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from core.services.conquistas import _garantir_conquistas_existem, catalogo_conquistas
+
+
+class Command(BaseCommand):
+    help = 'Cria no banco as conquistas do catálogo que ainda não existem.'
+
+    def handle(self, *args, **options):
+        criadas = _garantir_conquistas_existem()
+        catalogo_conquistas.invalidar()
+        self.stdout.write(self.style.SUCCESS(f'{criadas} conquista(s) criada(s).'))
@@ -0,0 +1,37 @@
+"""
+Middlewares próprios do projeto.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware as _WhiteNoiseMiddleware
+
+
+class WhiteNoiseMiddleware(_WhiteNoiseMiddleware):
+    """
+    WhiteNoise com suporte à pilha assíncrona.
+
+    O middleware original é só síncrono: sob ASGI o Django passaria toda a
+    requisição para uma thread e as views assíncronas perderiam o efeito.
+    Aqui só a entrega do arquivo estático roda em thread; as demais
+    requisições seguem direto para o próximo middleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,157 @@
+# Generated by Django 6.0 on 2026-10-18 00:45
+
+from decimal import Decimal
+
+from django.db import migrations
+
+# Cópia congelada do catálogo de core/services/conquistas.py nesta data:
+# a migração não pode mudar se o catálogo do serviço mudar depois.
+# (valor objetivo, título, descrição, pontos)
+CONQUISTAS = [
+    ('0.00', 'Primeira Simulação', 'Você completou a primeira simulação!', 10),
+    ('5', 'Persistente!', 'Você jogou 5 turnos.', 10),
+    ('100000.00', 'Primeiros R$ 100 mil', 'Você alcançou R$ 100.000 no caixa!', 10),
+    ('200000.00', 'R$ 200 mil no Caixa', 'Você alcançou R$ 200.000 no caixa!', 15),
+    ('300000.00', 'R$ 300 mil no Caixa', 'Você alcançou R$ 300.000 no caixa!', 20),
+    ('400000.00', 'R$ 400 mil no Caixa', 'Você alcançou R$ 400.000 no caixa!', 25),
+    ('500000.00', 'Meio Milhão!', 'Você alcançou R$ 500.000 no caixa!', 30),
+    ('600000.00', 'R$ 600 mil no Caixa', 'Você alcançou R$ 600.000 no caixa!', 35),
+    ('700000.00', 'R$ 700 mil no Caixa', 'Você alcançou R$ 700.000 no caixa!', 40),
+    ('800000.00', 'R$ 800 mil no Caixa', 'Você alcançou R$ 800.000 no caixa!', 45),
+    ('900000.00', 'R$ 900 mil no Caixa', 'Você alcançou R$ 900.000 no caixa!', 50),
+    ('1000000.00', 'Primeiro Milhão!', 'Você alcançou seu primeiro milhão no caixa!', 100),
+    ('10000000.00', 'R$ 10 Milhões!', 'Você alcançou R$ 10 milhões no caixa!', 150),
+    ('20000000.00', 'R$ 20 Milhões!', 'Você alcançou R$ 20 milhões no caixa!', 200),
+    ('30000000.00', 'R$ 30 Milhões!', 'Você alcançou R$ 30 milhões no caixa!', 250),
+    ('40000000.00', 'R$ 40 Milhões!', 'Você alcançou R$ 40 milhões no caixa!', 300),
+    ('50000000.00', 'R$ 50 Milhões!', 'Você alcançou R$ 50 milhões no caixa!', 350),
+    ('60000000.00', 'R$ 60 Milhões!', 'Você alcançou R$ 60 milhões no caixa!', 400),
+    ('70000000.00', 'R$ 70 Milhões!', 'Você alcançou R$ 70 milhões no caixa!', 450),
+    ('80000000.00', 'R$ 80 Milhões!', 'Você alcançou R$ 80 milhões no caixa!', 500),
+    ('90000000.00', 'R$ 90 Milhões!', 'Você alcançou R$ 90 milhões no caixa!', 550),
+    ('100000000.00', 'R$ 100 Milhões!', 'Você alcançou R$ 100 milhões no caixa!', 600),
+    ('110000000.00', 'R$ 110 Milhões!', 'Você alcançou R$ 110 milhões no caixa!', 650),
+    ('120000000.00', 'R$ 120 Milhões!', 'Você alcançou R$ 120 milhões no caixa!', 700),
+    ('130000000.00', 'R$ 130 Milhões!', 'Você alcançou R$ 130 milhões no caixa!', 750),
+    ('140000000.00', 'R$ 140 Milhões!', 'Você alcançou R$ 140 milhões no caixa!', 800),
+    ('150000000.00', 'R$ 150 Milhões!', 'Você alcançou R$ 150 milhões no caixa!', 850),
+    ('160000000.00', 'R$ 160 Milhões!', 'Você alcançou R$ 160 milhões no caixa!', 900),
+    ('170000000.00', 'R$ 170 Milhões!', 'Você alcançou R$ 170 milhões no caixa!', 950),
+    ('180000000.00', 'R$ 180 Milhões!', 'Você alcançou R$ 180 milhões no caixa!', 1000),
+    ('190000000.00', 'R$ 190 Milhões!', 'Você alcançou R$ 190 milhões no caixa!', 1050),
+    ('200000000.00', 'R$ 200 Milhões!', 'Você alcançou R$ 200 milhões no caixa!', 1100),
+    ('210000000.00', 'R$ 210 Milhões!', 'Você alcançou R$ 210 milhões no caixa!', 1150),
+    ('220000000.00', 'R$ 220 Milhões!', 'Você alcançou R$ 220 milhões no caixa!', 1200),
+    ('230000000.00', 'R$ 230 Milhões!', 'Você alcançou R$ 230 milhões no caixa!', 1250),
+    ('240000000.00', 'R$ 240 Milhões!', 'Você alcançou R$ 240 milhões no caixa!', 1300),
+    ('250000000.00', 'R$ 250 Milhões!', 'Você alcançou R$ 250 milhões no caixa!', 1350),
+    ('260000000.00', 'R$ 260 Milhões!', 'Você alcançou R$ 260 milhões no caixa!', 1400),
+    ('270000000.00', 'R$ 270 Milhões!', 'Você alcançou R$ 270 milhões no caixa!', 1450),
+    ('280000000.00', 'R$ 280 Milhões!', 'Você alcançou R$ 280 milhões no caixa!', 1500),
+    ('290000000.00', 'R$ 290 Milhões!', 'Você alcançou R$ 290 milhões no caixa!', 1550),
+    ('300000000.00', 'R$ 300 Milhões!', 'Você alcançou R$ 300 milhões no caixa!', 1600),
+    ('310000000.00', 'R$ 310 Milhões!', 'Você alcançou R$ 310 milhões no caixa!', 1650),
+    ('320000000.00', 'R$ 320 Milhões!', 'Você alcançou R$ 320 milhões no caixa!', 1700),
+    ('330000000.00', 'R$ 330 Milhões!', 'Você alcançou R$ 330 milhões no caixa!', 1750),
+    ('340000000.00', 'R$ 340 Milhões!', 'Você alcançou R$ 340 milhões no caixa!', 1800),
+    ('350000000.00', 'R$ 350 Milhões!', 'Você alcançou R$ 350 milhões no caixa!', 1850),
+    ('360000000.00', 'R$ 360 Milhões!', 'Você alcançou R$ 360 milhões no caixa!', 1900),
+    ('370000000.00', 'R$ 370 Milhões!', 'Você alcançou R$ 370 milhões no caixa!', 1950),
+    ('380000000.00', 'R$ 380 Milhões!', 'Você alcançou R$ 380 milhões no caixa!', 2000),
+    ('390000000.00', 'R$ 390 Milhões!', 'Você alcançou R$ 390 milhões no caixa!', 2050),
+    ('400000000.00', 'R$ 400 Milhões!', 'Você alcançou R$ 400 milhões no caixa!', 2100),
+    ('410000000.00', 'R$ 410 Milhões!', 'Você alcançou R$ 410 milhões no caixa!', 2150),
+    ('420000000.00', 'R$ 420 Milhões!', 'Você alcançou R$ 420 milhões no caixa!', 2200),
+    ('430000000.00', 'R$ 430 Milhões!', 'Você alcançou R$ 430 milhões no caixa!', 2250),
+    ('440000000.00', 'R$ 440 Milhões!', 'Você alcançou R$ 440 milhões no caixa!', 2300),
+    ('450000000.00', 'R$ 450 Milhões!', 'Você alcançou R$ 450 milhões no caixa!', 2350),
+    ('460000000.00', 'R$ 460 Milhões!', 'Você alcançou R$ 460 milhões no caixa!', 2400),
+    ('470000000.00', 'R$ 470 Milhões!', 'Você alcançou R$ 470 milhões no caixa!', 2450),
+    ('480000000.00', 'R$ 480 Milhões!', 'Você alcançou R$ 480 milhões no caixa!', 2500),
+    ('490000000.00', 'R$ 490 Milhões!', 'Você alcançou R$ 490 milhões no caixa!', 2550),
+    ('500000000.00', 'Meio Bilhão!', 'Você alcançou meio bilhão no caixa!', 2600),
+    ('510000000.00', 'R$ 510 Milhões!', 'Você alcançou R$ 510 milhões no caixa!', 2650),
+    ('520000000.00', 'R$ 520 Milhões!', 'Você alcançou R$ 520 milhões no caixa!', 2700),
+    ('530000000.00', 'R$ 530 Milhões!', 'Você alcançou R$ 530 milhões no caixa!', 2750),
+    ('540000000.00', 'R$ 540 Milhões!', 'Você alcançou R$ 540 milhões no caixa!', 2800),
+    ('550000000.00', 'R$ 550 Milhões!', 'Você alcançou R$ 550 milhões no caixa!', 2850),
+    ('560000000.00', 'R$ 560 Milhões!', 'Você alcançou R$ 560 milhões no caixa!', 2900),
+    ('570000000.00', 'R$ 570 Milhões!', 'Você alcançou R$ 570 milhões no caixa!', 2950),
+    ('580000000.00', 'R$ 580 Milhões!', 'Você alcançou R$ 580 milhões no caixa!', 3000),
+    ('590000000.00', 'R$ 590 Milhões!', 'Você alcançou R$ 590 milhões no caixa!', 3050),
+    ('600000000.00', 'R$ 600 Milhões!', 'Você alcançou R$ 600 milhões no caixa!', 3100),
+    ('610000000.00', 'R$ 610 Milhões!', 'Você alcançou R$ 610 milhões no caixa!', 3150),
+    ('620000000.00', 'R$ 620 Milhões!', 'Você alcançou R$ 620 milhões no caixa!', 3200),
+    ('630000000.00', 'R$ 630 Milhões!', 'Você alcançou R$ 630 milhões no caixa!', 3250),
+    ('640000000.00', 'R$ 640 Milhões!', 'Você alcançou R$ 640 milhões no caixa!', 3300),
+    ('650000000.00', 'R$ 650 Milhões!', 'Você alcançou R$ 650 milhões no caixa!', 3350),
+    ('660000000.00', 'R$ 660 Milhões!', 'Você alcançou R$ 660 milhões no caixa!', 3400),
+    ('670000000.00', 'R$ 670 Milhões!', 'Você alcançou R$ 670 milhões no caixa!', 3450),
+    ('680000000.00', 'R$ 680 Milhões!', 'Você alcançou R$ 680 milhões no caixa!', 3500),
+    ('690000000.00', 'R$ 690 Milhões!', 'Você alcançou R$ 690 milhões no caixa!', 3550),
+    ('700000000.00', 'R$ 700 Milhões!', 'Você alcançou R$ 700 milhões no caixa!', 3600),
+    ('710000000.00', 'R$ 710 Milhões!', 'Você alcançou R$ 710 milhões no caixa!', 3650),
+    ('720000000.00', 'R$ 720 Milhões!', 'Você alcançou R$ 720 milhões no caixa!', 3700),
+    ('730000000.00', 'R$ 730 Milhões!', 'Você alcançou R$ 730 milhões no caixa!', 3750),
+    ('740000000.00', 'R$ 740 Milhões!', 'Você alcançou R$ 740 milhões no caixa!', 3800),
+    ('750000000.00', 'R$ 750 Milhões!', 'Você alcançou R$ 750 milhões no caixa!', 3850),
+    ('760000000.00', 'R$ 760 Milhões!', 'Você alcançou R$ 760 milhões no caixa!', 3900),
+    ('770000000.00', 'R$ 770 Milhões!', 'Você alcançou R$ 770 milhões no caixa!', 3950),
+    ('780000000.00', 'R$ 780 Milhões!', 'Você alcançou R$ 780 milhões no caixa!', 4000),
+    ('790000000.00', 'R$ 790 Milhões!', 'Você alcançou R$ 790 milhões no caixa!', 4050),
+    ('800000000.00', 'R$ 800 Milhões!', 'Você alcançou R$ 800 milhões no caixa!', 4100),
+    ('810000000.00', 'R$ 810 Milhões!', 'Você alcançou R$ 810 milhões no caixa!', 4150),
+    ('820000000.00', 'R$ 820 Milhões!', 'Você alcançou R$ 820 milhões no caixa!', 4200),
+    ('830000000.00', 'R$ 830 Milhões!', 'Você alcançou R$ 830 milhões no caixa!', 4250),
+    ('840000000.00', 'R$ 840 Milhões!', 'Você alcançou R$ 840 milhões no caixa!', 4300),
+    ('850000000.00', 'R$ 850 Milhões!', 'Você alcançou R$ 850 milhões no caixa!', 4350),
+    ('860000000.00', 'R$ 860 Milhões!', 'Você alcançou R$ 860 milhões no caixa!', 4400),
+    ('870000000.00', 'R$ 870 Milhões!', 'Você alcançou R$ 870 milhões no caixa!', 4450),
+    ('880000000.00', 'R$ 880 Milhões!', 'Você alcançou R$ 880 milhões no caixa!', 4500),
+    ('890000000.00', 'R$ 890 Milhões!', 'Você alcançou R$ 890 milhões no caixa!', 4550),
+    ('900000000.00', 'R$ 900 Milhões!', 'Você alcançou R$ 900 milhões no caixa!', 4600),
+    ('910000000.00', 'R$ 910 Milhões!', 'Você alcançou R$ 910 milhões no caixa!', 4650),
+    ('920000000.00', 'R$ 920 Milhões!', 'Você alcançou R$ 920 milhões no caixa!', 4700),
+    ('930000000.00', 'R$ 930 Milhões!', 'Você alcançou R$ 930 milhões no caixa!', 4750),
+    ('940000000.00', 'R$ 940 Milhões!', 'Você alcançou R$ 940 milhões no caixa!', 4800),
+    ('950000000.00', 'R$ 950 Milhões!', 'Você alcançou R$ 950 milhões no caixa!', 4850),
+    ('960000000.00', 'R$ 960 Milhões!', 'Você alcançou R$ 960 milhões no caixa!', 4900),
+    ('970000000.00', 'R$ 970 Milhões!', 'Você alcançou R$ 970 milhões no caixa!', 4950),
+    ('980000000.00', 'R$ 980 Milhões!', 'Você alcançou R$ 980 milhões no caixa!', 5000),
+    ('990000000.00', 'R$ 990 Milhões!', 'Você alcançou R$ 990 milhões no caixa!', 5050),
+    ('1000000000.00', 'Bilionário! Você Zerou o Game!', 'Parabéns! Você alcançou R$ 1 bilhão e zerou o VentureGotchi!', 10000),
+]
+
+
+def semear_conquistas(apps, schema_editor):
+    Conquista = apps.get_model('core', 'Conquista')
+    existentes = set(
+        Conquista.objects.filter(titulo__in=[titulo for _, titulo, _, _ in CONQUISTAS])
+        .values_list('titulo', flat=True)
+    )
+    Conquista.objects.bulk_create(
+        [
+            Conquista(
+                titulo=titulo,
+                descricao=descricao,
+                tipo='progresso',
+                valor_objetivo=Decimal(valor),
+                pontos=pontos,
+                ativo=True,
+            )
+            for valor, titulo, descricao, pontos in CONQUISTAS
+            if titulo not in existentes
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_turma'),
+    ]
+
+    operations = [
+        migrations.RunPython(semear_conquistas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-18 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_semear_conquistas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicodecisao',
+            name='chave_idempotencia',
+            field=models.CharField(blank=True, help_text='Identifica o formulário enviado; envios repetidos são descartados.', max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='historicodecisao',
+            constraint=models.UniqueConstraint(fields=('partida', 'chave_idempotencia'), name='unique_chave_idempotencia_partida'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 6.0 on 2026-10-18 01:03
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+DECISOES_INICIAIS = [
+    {
+        'titulo': 'Investir em Marketing Agressivo',
+        'nome_curto': 'Marketing',
+        'descricao': 'Atração de novos clientes e visibilidade de marca.',
+        'icone': '📢',
+        'custo': Decimal('5000.00'),
+        'delta_receita': Decimal('3000.00'),
+        'mensagem': 'Investimento em Marketing concluído. Receita aumentada.',
+        'nivel_mensagem': 'success',
+        'ordem': 1,
+    },
+    {
+        'titulo': 'Contratar Engenheiro Sênior',
+        'nome_curto': 'Engenharia',
+        'descricao': 'Aumento de valuation e robustez técnica do produto.',
+        'icone': '👨‍💻',
+        'custo': Decimal('8000.00'),
+        'delta_receita': Decimal('2000.00'),
+        'delta_valuation': Decimal('25000.00'),
+        'delta_funcionarios': 1,
+        'mensagem': 'Novo Engenheiro Sênior integrado à equipe.',
+        'nivel_mensagem': 'success',
+        'ordem': 2,
+    },
+    {
+        'titulo': 'Não fazer nada (Economizar)',
+        'nome_curto': 'Economizar',
+        'descricao': 'Preservação de capital e segurança financeira.',
+        'icone': '💰',
+        'mensagem': 'Turno finalizado com foco em preservação de capital.',
+        'nivel_mensagem': 'info',
+        'ordem': 3,
+    },
+]
+
+
+def criar_decisoes_iniciais(apps, schema_editor):
+    Decisao = apps.get_model('core', 'Decisao')
+    for dados in DECISOES_INICIAIS:
+        Decisao.objects.get_or_create(titulo=dados['titulo'], defaults=dados)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_historicodecisao_chave_idempotencia'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Decisao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('titulo', models.CharField(help_text='Valor enviado pelo formulário do jogo.', max_length=150, unique=True)),
+                ('nome_curto', models.CharField(max_length=50)),
+                ('descricao', models.CharField(blank=True, max_length=200)),
+                ('icone', models.CharField(blank=True, max_length=8)),
+                ('custo', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('delta_receita', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('delta_valuation', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('delta_funcionarios', models.IntegerField(default=0)),
+                ('turno_minimo', models.PositiveIntegerField(default=1, help_text='Pré-condição: turno atual mínimo.')),
+                ('funcionarios_minimos', models.PositiveIntegerField(default=0, help_text='Pré-condição: tamanho mínimo da equipe.')),
+                ('mensagem', models.CharField(blank=True, max_length=200)),
+                ('nivel_mensagem', models.CharField(choices=[('info', 'Informação'), ('success', 'Sucesso'), ('warning', 'Aviso')], default='info', max_length=10)),
+                ('ordem', models.PositiveIntegerField(default=0)),
+                ('ativa', models.BooleanField(db_index=True, default=True)),
+            ],
+            options={
+                'verbose_name': 'Decisão',
+                'verbose_name_plural': 'Decisões',
+                'ordering': ['ordem', 'titulo'],
+                'constraints': [models.CheckConstraint(condition=models.Q(('custo__gte', 0)), name='decisao_custo_nao_negativo'), models.CheckConstraint(condition=models.Q(('turno_minimo__gte', 1)), name='decisao_turno_minimo_1')],
+            },
+        ),
+        migrations.RunPython(criar_decisoes_iniciais, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 6.0 on 2026-10-18 01:07
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+def preencher_ranking(apps, schema_editor):
+    Startup = apps.get_model('core', 'Startup')
+    ConquistaDesbloqueada = apps.get_model('core', 'ConquistaDesbloqueada')
+    LeaderboardEntry = apps.get_model('core', 'LeaderboardEntry')
+
+    totais = {
+        linha['partida_id']: linha
+        for linha in ConquistaDesbloqueada.objects.values('partida_id').annotate(
+            total=models.Count('id'),
+            pontos=models.Sum('conquista__pontos'),
+        )
+    }
+    entradas = []
+    for startup in Startup.objects.filter(partida__ativa=True).select_related('partida__usuario').iterator():
+        partida = startup.partida
+        usuario = partida.usuario
+        total = totais.get(partida.pk, {})
+        entradas.append(LeaderboardEntry(
+            partida_id=partida.pk,
+            usuario_id=usuario.pk,
+            nome_empresa=partida.nome_empresa or startup.nome,
+            valuation=startup.valuation,
+            saldo_caixa=startup.saldo_caixa,
+            turno_atual=startup.turno_atual,
+            funcionarios=startup.funcionarios,
+            total_conquistas=total.get('total') or 0,
+            pontuacao_conquistas=total.get('pontos') or 0,
+            categoria=usuario.categoria,
+            codigo_turma=usuario.codigo_turma,
+            pais=usuario.pais or '',
+            estado=usuario.estado or '',
+            municipio=usuario.municipio or '',
+        ))
+    LeaderboardEntry.objects.bulk_create(entradas, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_decisao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('partida', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='entrada_ranking', serialize=False, to='core.partida')),
+                ('nome_empresa', models.CharField(max_length=100)),
+                ('valuation', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('saldo_caixa', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('turno_atual', models.PositiveIntegerField(default=1)),
+                ('funcionarios', models.PositiveIntegerField(default=1)),
+                ('total_conquistas', models.PositiveIntegerField(default=0)),
+                ('pontuacao_conquistas', models.PositiveIntegerField(default=0)),
+                ('categoria', models.CharField(choices=[('ESTUDANTE_UNIVERSITARIO', 'Estudante Universitário'), ('ASPIRANTE_EMPREENDEDOR', 'Aspirante a Empreendedor'), ('EDUCADOR_NEGOCIOS', 'Educador de Negócios'), ('PROFISSIONAL_CORPORATIVO', 'Profissional Corporativo')], max_length=30)),
+                ('codigo_turma', models.CharField(blank=True, max_length=100, null=True)),
+                ('pais', models.CharField(blank=True, max_length=100)),
+                ('estado', models.CharField(blank=True, max_length=2)),
+                ('municipio', models.CharField(blank=True, max_length=100)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entradas_ranking', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Entrada do Ranking',
+                'verbose_name_plural': 'Entradas do Ranking',
+                'indexes': [models.Index(fields=['categoria', '-valuation', '-saldo_caixa'], name='idx_ranking_valuation'), models.Index(fields=['categoria', '-saldo_caixa', '-valuation'], name='idx_ranking_saldo'), models.Index(fields=['categoria', '-turno_atual', '-valuation'], name='idx_ranking_turno'), models.Index(fields=['categoria', '-total_conquistas', '-valuation'], name='idx_ranking_conquistas'), models.Index(fields=['codigo_turma', '-valuation'], name='idx_ranking_turma')],
+            },
+        ),
+        migrations.RunPython(preencher_ranking, migrations.RunPython.noop),
+    ]
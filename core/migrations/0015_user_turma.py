@@ -0,0 +1,47 @@
+# Generated by Django 6.0 on 2026-10-18 01:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+def vincular_turmas(apps, schema_editor):
+    Turma = apps.get_model('core', 'Turma')
+    User = apps.get_model('core', 'User')
+    LeaderboardEntry = apps.get_model('core', 'LeaderboardEntry')
+
+    # Códigos normalizados em maiúsculas, como o cadastro passou a gravar
+    User.objects.exclude(codigo_turma__isnull=True).update(codigo_turma=Upper('codigo_turma'))
+    for turma in Turma.objects.all().iterator():
+        codigo = turma.codigo.upper()
+        User.objects.filter(codigo_turma=codigo).update(turma=turma)
+        LeaderboardEntry.objects.filter(usuario__codigo_turma=codigo).update(turma=turma, codigo_turma=codigo)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='leaderboardentry',
+            name='idx_ranking_turma',
+        ),
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='turma',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.turma'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='turma',
+            field=models.ForeignKey(blank=True, help_text='Resolvida a partir do código de turma ao salvar.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='alunos', to='core.turma'),
+        ),
+        migrations.AddIndex(
+            model_name='leaderboardentry',
+            index=models.Index(fields=['turma', '-valuation'], name='idx_ranking_turma'),
+        ),
+        migrations.RunPython(vincular_turmas, migrations.RunPython.noop),
+    ]
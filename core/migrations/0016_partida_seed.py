@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 01:17
+
+import core.rng
+from django.db import migrations, models
+
+
+def sortear_seeds(apps, schema_editor):
+    Partida = apps.get_model('core', 'Partida')
+    # O default do AddField é avaliado uma vez: cada partida existente ganha a sua
+    for partida in Partida.objects.only('pk').iterator():
+        Partida.objects.filter(pk=partida.pk).update(seed=core.rng.gerar_seed())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_user_turma'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partida',
+            name='seed',
+            field=models.BigIntegerField(default=core.rng.gerar_seed, editable=False, help_text='Semente dos sorteios da partida (ver core.rng.PartidaRNG)'),
+        ),
+        migrations.RunPython(sortear_seeds, migrations.RunPython.noop),
+    ]
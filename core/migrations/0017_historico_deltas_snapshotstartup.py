@@ -0,0 +1,54 @@
+# Generated by Django 6.0 on 2026-10-18 01:18
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_partida_seed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicodecisao',
+            name='delta_funcionarios',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='historicodecisao',
+            name='delta_receita',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='historicodecisao',
+            name='delta_saldo',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='historicodecisao',
+            name='delta_valuation',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12),
+        ),
+        migrations.CreateModel(
+            name='SnapshotStartup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('turno', models.PositiveIntegerField()),
+                ('saldo_caixa', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('receita_mensal', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('valuation', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('funcionarios', models.PositiveIntegerField()),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('partida', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='core.partida')),
+            ],
+            options={
+                'verbose_name': 'Snapshot da Startup',
+                'verbose_name_plural': 'Snapshots das Startups',
+                'ordering': ['turno'],
+                'constraints': [models.UniqueConstraint(fields=('partida', 'turno'), name='unique_snapshot_partida_turno')],
+            },
+        ),
+    ]
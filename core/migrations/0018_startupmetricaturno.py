@@ -0,0 +1,53 @@
+# Generated by Django 6.0 on 2026-10-18 01:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def registrar_estado_atual(apps, schema_editor):
+    Startup = apps.get_model('core', 'Startup')
+    StartupMetricaTurno = apps.get_model('core', 'StartupMetricaTurno')
+    # Partidas existentes começam a série pelo turno em que estão
+    StartupMetricaTurno.objects.bulk_create(
+        (
+            StartupMetricaTurno(
+                partida_id=startup.partida_id,
+                turno=startup.turno_atual,
+                saldo_caixa=startup.saldo_caixa,
+                receita_mensal=startup.receita_mensal,
+                valuation=startup.valuation,
+                funcionarios=startup.funcionarios,
+            )
+            for startup in Startup.objects.all().iterator()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_historico_deltas_snapshotstartup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StartupMetricaTurno',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('turno', models.PositiveIntegerField()),
+                ('saldo_caixa', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('receita_mensal', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('valuation', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('funcionarios', models.PositiveIntegerField()),
+                ('partida', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metricas', to='core.partida')),
+            ],
+            options={
+                'verbose_name': 'Métrica por Turno',
+                'verbose_name_plural': 'Métricas por Turno',
+                'ordering': ['turno'],
+                'constraints': [models.UniqueConstraint(fields=('partida', 'turno'), name='unique_metrica_partida_turno')],
+            },
+        ),
+        migrations.RunPython(registrar_estado_atual, migrations.RunPython.noop),
+    ]
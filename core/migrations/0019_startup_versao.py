@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_startupmetricaturno'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaderboardentry',
+            name='versao',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='versao',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incrementada a cada turno ou edição; compõe o ETag das páginas da partida.'),
+        ),
+    ]
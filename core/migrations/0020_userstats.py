@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 01:26
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_startup_versao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserStats',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_partidas', models.PositiveIntegerField(default=0)),
+                ('partidas_ativas', models.PositiveIntegerField(default=0)),
+                ('total_conquistas', models.PositiveIntegerField(default=0)),
+                ('maior_saldo', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('maior_valuation', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('maior_turno', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Estatísticas do Usuário',
+                'verbose_name_plural': 'Estatísticas dos Usuários',
+            },
+        ),
+    ]
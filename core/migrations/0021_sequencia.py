@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 01:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_userstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Sequencia',
+            fields=[
+                ('nome', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('valor', models.PositiveBigIntegerField(default=0)),
+                ('chave', models.CharField(max_length=64)),
+            ],
+            options={
+                'verbose_name': 'Sequência',
+                'verbose_name_plural': 'Sequências',
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0 on 2026-10-18 01:43
+
+import core.models
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def verificar_duplicados(apps, schema_editor):
+    """
+    Antes, a unicidade de usuário e e-mail diferenciava maiúsculas: 'Ana' e
+    'ana' podem já coexistir. Cada par é uma conta de alguém, então nada é
+    alterado automaticamente; a migração para listando o que precisa ser
+    resolvido (renomear ou mesclar) antes de criar os índices.
+    """
+    User = apps.get_model('core', 'User')
+    problemas = []
+    for campo in ('username', 'email'):
+        repetidos = (
+            User.objects.exclude(**{campo: ''})
+            .values(valor=Lower(campo))
+            .annotate(total=Count('pk'))
+            .filter(total__gt=1)
+            .values_list('valor', flat=True)
+        )
+        for valor in repetidos:
+            contas = User.objects.filter(**{f'{campo}__iexact': valor}).order_by('pk').values_list('pk', campo)
+            problemas.append(f'{campo} {valor!r}: ' + ', '.join(f'#{pk} {atual!r}' for pk, atual in contas))
+    if problemas:
+        raise RuntimeError(
+            'Usuários repetidos sem diferenciar maiúsculas; resolva antes de migrar:\n' + '\n'.join(problemas)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0021_sequencia'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_duplicados, migrations.RunPython.noop),
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', core.models.UserManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('username'), name='uniq_user_username_ci', violation_error_message='Este nome de usuário já está em uso.'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='uniq_user_email_ci', violation_error_message='Este e-mail já está registrado.'),
+        ),
+    ]
@@ -1,10 +1,11 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Lower
+from django.contrib.auth.models import AbstractUser, UserManager as DjangoUserManager
 from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
 from decimal import Decimal
 from django.conf import settings
-import random
-import string
+
+from core.rng import gerar_seed
 
 class Turma(models.Model):
     """Modelo para turmas criadas por educadores"""
@@ -35,14 +36,15 @@ class Turma(models.Model):
     
     @staticmethod
     def gerar_codigo_unico():
-        """Gera um código único no formato AAA-999"""
-        while True:
-            letras = ''.join(random.choices(string.ascii_uppercase, k=3))
-            numeros = ''.join(random.choices(string.digits, k=3))
-            codigo = f"{letras}-{numeros}"
-            
-            if not Turma.objects.filter(codigo=codigo).exists():
-                return codigo
+        """Aloca um código único no formato AAA-999 (ver core/services/codigos.py)"""
+        from core.services.codigos import alocar_codigo_turma
+        return alocar_codigo_turma()
+
+class UserManager(DjangoUserManager):
+    def get_by_natural_key(self, username):
+        # Login sem diferenciar maiúsculas, como a unicidade (uniq_user_username_ci)
+        return self.alias(username_min=Lower(self.model.USERNAME_FIELD)).get(username_min=username.lower())
+
 
 class User(AbstractUser):
     class Categorias(models.TextChoices):
@@ -99,9 +101,63 @@ class User(AbstractUser):
     area_atuacao = models.CharField(max_length=100, verbose_name="Área de Atuação", blank=True, null=True)
     cnpj = models.CharField(max_length=18, verbose_name="CNPJ", blank=True, null=True, validators=[RegexValidator(r'^\d{14}$', 'CNPJ deve ter exatamente 14 dígitos.')])
     nome_empresa = models.CharField(max_length=100, verbose_name="Nome da Empresa", blank=True, null=True)
+    turma = models.ForeignKey(
+        Turma,
+        on_delete=models.SET_NULL,
+        related_name='alunos',
+        blank=True,
+        null=True,
+        help_text='Resolvida a partir do código de turma ao salvar.'
+    )
+
+    objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Sem diferenciar maiúsculas: 'Ana' e 'ana' são o mesmo usuário no login (UserManager)
+            models.UniqueConstraint(
+                Lower('username'),
+                name='uniq_user_username_ci',
+                violation_error_message='Este nome de usuário já está em uso.',
+            ),
+            models.UniqueConstraint(
+                Lower('email'),
+                name='uniq_user_email_ci',
+                condition=~models.Q(email=''),
+                violation_error_message='Este e-mail já está registrado.',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.username} - {self.categoria}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._codigo_turma_salvo = instance.__dict__.get('codigo_turma')
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'codigo_turma' in update_fields:
+            self._vincular_turma()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'turma'}
+        super().save(*args, **kwargs)
+        self._codigo_turma_salvo = self.codigo_turma
+
+    def _vincular_turma(self):
+        """Normaliza o código de turma digitado e resolve a FK `turma` a partir dele."""
+        codigo = (self.codigo_turma or '').strip().upper() or None
+        self.codigo_turma = codigo
+        if codigo is None:
+            self.turma = None
+            return
+        if User.turma.is_cached(self) and self.turma is not None and self.turma.codigo == codigo:
+            return
+        if self.turma_id is not None and codigo == getattr(self, '_codigo_turma_salvo', None):
+            return
+        self.turma = Turma.objects.filter(codigo=codigo).first()
     
     # Métodos de Permissões
     def is_estudante(self):
@@ -156,6 +212,11 @@ class Partida(models.Model):
     data_inicio = models.DateTimeField(auto_now_add=True, db_index=True)
     ativa = models.BooleanField(default=True, help_text='Indica se a partida está em andamento')
     data_fim = models.DateTimeField(null=True, blank=True, help_text='Data de conclusão da partida')
+    seed = models.BigIntegerField(
+        default=gerar_seed,
+        editable=False,
+        help_text='Semente dos sorteios da partida (ver core.rng.PartidaRNG)'
+    )
     
     class Meta:
         ordering = ['-data_inicio']
@@ -190,6 +251,11 @@ class Startup(models.Model):
     receita_mensal = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
     valuation = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('00.00'))
     funcionarios = models.PositiveIntegerField(default=1)
+    versao = models.PositiveIntegerField(
+        default=1,
+        editable=False,
+        help_text='Incrementada a cada turno ou edição; compõe o ETag das páginas da partida.'
+    )
     
     class Meta:
         verbose_name = 'Startup'
@@ -217,6 +283,14 @@ class Startup(models.Model):
     def __str__(self):
         return self.nome
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            self.versao += 1
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'versao'}
+        super().save(*args, **kwargs)
+
 
 class HistoricoDecisao(models.Model):
     """Modelo para registrar o histórico de decisões"""
@@ -229,6 +303,17 @@ class HistoricoDecisao(models.Model):
     decisao_tomada = models.TextField()
     turno = models.PositiveIntegerField()
     data_decisao = models.DateTimeField(auto_now_add=True, db_index=True)
+    chave_idempotencia = models.CharField(
+        max_length=64,
+        blank=True,
+        null=True,
+        help_text='Identifica o formulário enviado; envios repetidos são descartados.'
+    )
+    # Variação da startup no turno (decisão, receita e evento), para replay
+    delta_saldo = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    delta_receita = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    delta_valuation = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    delta_funcionarios = models.IntegerField(default=0)
 
     class Meta:
         ordering = ['turno']
@@ -243,11 +328,107 @@ class HistoricoDecisao(models.Model):
                 condition=models.Q(turno__gte=1),
                 name='historico_turno_minimo_1'
             ),
+            models.UniqueConstraint(
+                fields=['partida', 'chave_idempotencia'],
+                name='unique_chave_idempotencia_partida'
+            ),
         ]
 
     def __str__(self):
         return f"Decisão no turno {self.turno}"
 
+
+class StartupMetricaTurno(models.Model):
+    """Série histórica das métricas da startup: uma linha por turno, só inserções."""
+    partida = models.ForeignKey(
+        Partida,
+        on_delete=models.CASCADE,
+        related_name='metricas'
+    )
+    turno = models.PositiveIntegerField()
+    saldo_caixa = models.DecimalField(max_digits=12, decimal_places=2)
+    receita_mensal = models.DecimalField(max_digits=12, decimal_places=2)
+    valuation = models.DecimalField(max_digits=12, decimal_places=2)
+    funcionarios = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['turno']
+        verbose_name = 'Métrica por Turno'
+        verbose_name_plural = 'Métricas por Turno'
+        constraints = [
+            models.UniqueConstraint(fields=['partida', 'turno'], name='unique_metrica_partida_turno'),
+        ]
+
+    def __str__(self):
+        return f"Métricas de {self.partida_id} (T{self.turno})"
+
+
+class SnapshotStartup(models.Model):
+    """Cópia do estado da startup ao fim de um turno, ponto de partida do replay."""
+    partida = models.ForeignKey(
+        Partida,
+        on_delete=models.CASCADE,
+        related_name='snapshots'
+    )
+    turno = models.PositiveIntegerField()
+    saldo_caixa = models.DecimalField(max_digits=12, decimal_places=2)
+    receita_mensal = models.DecimalField(max_digits=12, decimal_places=2)
+    valuation = models.DecimalField(max_digits=12, decimal_places=2)
+    funcionarios = models.PositiveIntegerField()
+    criado_em = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['turno']
+        verbose_name = 'Snapshot da Startup'
+        verbose_name_plural = 'Snapshots das Startups'
+        constraints = [
+            models.UniqueConstraint(fields=['partida', 'turno'], name='unique_snapshot_partida_turno'),
+        ]
+
+    def __str__(self):
+        return f"Snapshot de {self.partida_id} (T{self.turno})"
+
+class Decisao(models.Model):
+    """Catálogo de decisões disponíveis em cada turno e seus efeitos."""
+
+    class NivelMensagem(models.TextChoices):
+        INFO = 'info', 'Informação'
+        SUCESSO = 'success', 'Sucesso'
+        AVISO = 'warning', 'Aviso'
+
+    titulo = models.CharField(max_length=150, unique=True, help_text='Valor enviado pelo formulário do jogo.')
+    nome_curto = models.CharField(max_length=50)
+    descricao = models.CharField(max_length=200, blank=True)
+    icone = models.CharField(max_length=8, blank=True)
+    custo = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    delta_receita = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    delta_valuation = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    delta_funcionarios = models.IntegerField(default=0)
+    turno_minimo = models.PositiveIntegerField(default=1, help_text='Pré-condição: turno atual mínimo.')
+    funcionarios_minimos = models.PositiveIntegerField(default=0, help_text='Pré-condição: tamanho mínimo da equipe.')
+    mensagem = models.CharField(max_length=200, blank=True)
+    nivel_mensagem = models.CharField(max_length=10, choices=NivelMensagem.choices, default=NivelMensagem.INFO)
+    ordem = models.PositiveIntegerField(default=0)
+    ativa = models.BooleanField(default=True, db_index=True)
+
+    class Meta:
+        ordering = ['ordem', 'titulo']
+        verbose_name = 'Decisão'
+        verbose_name_plural = 'Decisões'
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(custo__gte=0),
+                name='decisao_custo_nao_negativo'
+            ),
+            models.CheckConstraint(
+                condition=models.Q(turno_minimo__gte=1),
+                name='decisao_turno_minimo_1'
+            ),
+        ]
+
+    def __str__(self):
+        return self.titulo
+
 class Fundador(models.Model):
     """Perfil do fundador vinculado a uma partida."""
     class Experiencia(models.TextChoices):
@@ -453,4 +634,107 @@ class ConquistaDesbloqueada(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.conquista.titulo} - {self.partida.nome_empresa}"
\ No newline at end of file
+        return f"{self.conquista.titulo} - {self.partida.nome_empresa}"
+
+class LeaderboardEntry(models.Model):
+    """
+    Linha desnormalizada do ranking: uma por partida ativa.
+
+    Mantida pelo TurnEngine dentro da transação do turno e pelos sinais dos
+    modelos de origem nas demais escritas via ORM.
+    """
+    partida = models.OneToOneField(
+        Partida,
+        on_delete=models.CASCADE,
+        related_name='entrada_ranking',
+        primary_key=True
+    )
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='entradas_ranking'
+    )
+    nome_empresa = models.CharField(max_length=100)
+    valuation = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    saldo_caixa = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    turno_atual = models.PositiveIntegerField(default=1)
+    funcionarios = models.PositiveIntegerField(default=1)
+    total_conquistas = models.PositiveIntegerField(default=0)
+    pontuacao_conquistas = models.PositiveIntegerField(default=0)
+    versao = models.PositiveIntegerField(default=1)
+    categoria = models.CharField(max_length=30, choices=User.Categorias.choices)
+    codigo_turma = models.CharField(max_length=100, blank=True, null=True)
+    turma = models.ForeignKey(
+        Turma,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True
+    )
+    pais = models.CharField(max_length=100, blank=True)
+    estado = models.CharField(max_length=2, blank=True)
+    municipio = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        verbose_name = 'Entrada do Ranking'
+        verbose_name_plural = 'Entradas do Ranking'
+        # Um índice por critério de ordenação, já filtrado pela categoria
+        indexes = [
+            models.Index(fields=['categoria', '-valuation', '-saldo_caixa'], name='idx_ranking_valuation'),
+            models.Index(fields=['categoria', '-saldo_caixa', '-valuation'], name='idx_ranking_saldo'),
+            models.Index(fields=['categoria', '-turno_atual', '-valuation'], name='idx_ranking_turno'),
+            models.Index(fields=['categoria', '-total_conquistas', '-valuation'], name='idx_ranking_conquistas'),
+            models.Index(fields=['turma', '-valuation'], name='idx_ranking_turma'),
+        ]
+
+    def __str__(self):
+        return f"{self.nome_empresa} ({self.valuation})"
+
+
+class UserStats(models.Model):
+    """
+    Resumo das partidas de um usuário para a página de perfil.
+
+    Mantido de forma incremental pelo TurnEngine e pelos sinais; os
+    recordes (maior saldo, valuation e turno) nunca diminuem.
+    """
+    usuario = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        primary_key=True
+    )
+    total_partidas = models.PositiveIntegerField(default=0)
+    partidas_ativas = models.PositiveIntegerField(default=0)
+    total_conquistas = models.PositiveIntegerField(default=0)
+    maior_saldo = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    maior_valuation = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    maior_turno = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Estatísticas do Usuário'
+        verbose_name_plural = 'Estatísticas dos Usuários'
+
+    def __str__(self):
+        return f"Estatísticas de {self.usuario_id}"
+
+    @property
+    def partidas_finalizadas(self):
+        return self.total_partidas - self.partidas_ativas
+
+
+class Sequencia(models.Model):
+    """
+    Contador nomeado incrementado no banco, com a chave secreta usada para
+    embaralhar os valores (ver core/services/codigos.py).
+    """
+    nome = models.CharField(max_length=50, primary_key=True)
+    valor = models.PositiveBigIntegerField(default=0)
+    chave = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = 'Sequência'
+        verbose_name_plural = 'Sequências'
+
+    def __str__(self):
+        return f"{self.nome} ({self.valor})"
@@ -1,11 +1,22 @@
 """
 Sistema de permissões e decoradores para controle de acesso
 """
+from asgiref.sync import iscoroutinefunction
 from django.shortcuts import redirect
 from django.contrib import messages
 from functools import wraps
 
 
+async def usuario_async(request):
+    """
+    Carrega o usuário da sessão sem bloquear o event loop e o guarda em
+    `request.user`, para que templates e código síncrono não o consultem
+    de novo.
+    """
+    request.user = await request.auser()
+    return request.user
+
+
 def estudante_required(view_func):
     """
     Decorator que permite acesso para Estudantes/Aspirantes/Profissionais Corporativos
@@ -92,8 +103,7 @@ def pode_acessar_ranking(view_func):
     """
     Decorator que verifica se o usuário pode acessar ranking
     """
-    @wraps(view_func)
-    def wrapper(request, *args, **kwargs):
+    def negado(request):
         if not request.user.is_authenticated:
             return redirect('login')
         
@@ -103,6 +113,16 @@ def pode_acessar_ranking(view_func):
                 'Acesso negado. Apenas Educadores podem acessar o ranking.'
             )
             return redirect('dashboard')
-        
-        return view_func(request, *args, **kwargs)
+        return None
+    
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def async_wrapper(request, *args, **kwargs):
+            await usuario_async(request)
+            return negado(request) or await view_func(request, *args, **kwargs)
+        return async_wrapper
+    
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        return negado(request) or view_func(request, *args, **kwargs)
     return wrapper
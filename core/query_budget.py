@@ -0,0 +1,180 @@
+"""
+Orçamento de consultas SQL por view.
+
+`QueryBudgetMiddleware` mede, para cada requisição, o número de consultas,
+o tempo total no banco e as consultas repetidas (mesmo SQL executado mais
+de uma vez, sintoma típico de N+1), agregando os números pelo nome da URL.
+Em DEBUG a medição sai no cabeçalho `Server-Timing`.
+
+Views declaram o limite com `@query_budget(n)`. Acima dele a requisição
+gera um aviso no log ou, com `QUERY_BUDGET_ESTRITO = True` (ativado pelo
+`QueryBudgetTestMixin` nos testes), a exceção `OrcamentoConsultasExcedido`.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+class OrcamentoConsultasExcedido(AssertionError):
+    """A view executou mais consultas do que o orçamento declarado."""
+
+
+def query_budget(limite):
+    """Declara o número máximo de consultas SQL de uma view, incluindo sessão e usuário."""
+    def decorator(view_func):
+        view_func.query_budget = limite
+        return view_func
+    return decorator
+
+
+@dataclass
+class RelatorioConsultas:
+    """Consultas de uma requisição."""
+    consultas: int = 0
+    tempo_ms: float = 0.0
+    sql: Counter = field(default_factory=Counter)
+
+    @property
+    def duplicadas(self):
+        return sum(total - 1 for total in self.sql.values() if total > 1)
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tempo_ms += (time.perf_counter() - inicio) * 1000
+            self.consultas += 1
+            self.sql[sql] += 1
+
+
+@dataclass
+class TotaisView:
+    """Acumulado das requisições de uma URL."""
+    requisicoes: int = 0
+    consultas: int = 0
+    tempo_ms: float = 0.0
+    duplicadas: int = 0
+    max_consultas: int = 0
+    acima_do_orcamento: int = 0
+
+
+_totais = {}
+_lock = threading.Lock()
+
+
+def relatorio():
+    """Cópia dos totais por nome de URL desde o início do processo."""
+    with _lock:
+        return {nome: TotaisView(**vars(totais)) for nome, totais in _totais.items()}
+
+
+def limpar_relatorio():
+    with _lock:
+        _totais.clear()
+
+
+def _instalar_medicao(medicao):
+    # `connection` é resolvida na thread que chama, a mesma das consultas da requisição
+    connection.execute_wrappers.append(medicao)
+
+
+def _remover_medicao(medicao):
+    connection.execute_wrappers.remove(medicao)
+
+
+class QueryBudgetMiddleware:
+    """
+    Funciona nas pilhas WSGI e ASGI. Nas requisições assíncronas as
+    consultas rodam na thread da requisição (sync_to_async com
+    thread_sensitive), onde o wrapper de medição é instalado.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medicao = RelatorioConsultas()
+        with connection.execute_wrapper(medicao):
+            response = self.get_response(request)
+        return self._registrar(request, response, medicao)
+
+    async def __acall__(self, request):
+        medicao = RelatorioConsultas()
+        await sync_to_async(_instalar_medicao)(medicao)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remover_medicao)(medicao)
+        return self._registrar(request, response, medicao)
+
+    def _registrar(self, request, response, medicao):
+        match = getattr(request, 'resolver_match', None)
+        nome = match.url_name if match and match.url_name else request.path
+        limite = getattr(match.func, 'query_budget', None) if match else None
+        excedeu = limite is not None and medicao.consultas > limite
+
+        with _lock:
+            totais = _totais.setdefault(nome, TotaisView())
+            totais.requisicoes += 1
+            totais.consultas += medicao.consultas
+            totais.tempo_ms += medicao.tempo_ms
+            totais.duplicadas += medicao.duplicadas
+            totais.max_consultas = max(totais.max_consultas, medicao.consultas)
+            totais.acima_do_orcamento += excedeu
+
+        response.relatorio_consultas = medicao
+        if settings.DEBUG:
+            response['Server-Timing'] = (
+                f'db;dur={medicao.tempo_ms:.1f};desc="{medicao.consultas} consultas, '
+                f'{medicao.duplicadas} repetidas"'
+            )
+
+        if excedeu:
+            mensagem = (
+                f'{nome}: {medicao.consultas} consultas, orçamento de {limite} '
+                f'({medicao.duplicadas} repetidas)'
+            )
+            if getattr(settings, 'QUERY_BUDGET_ESTRITO', False):
+                raise OrcamentoConsultasExcedido(mensagem)
+            logger.warning(mensagem)
+        return response
+
+
+class QueryBudgetTestMixin:
+    """
+    Ativa o modo estrito nos testes: uma view acima do seu `@query_budget`
+    faz a requisição do Client falhar com `OrcamentoConsultasExcedido`.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        from django.test.utils import override_settings
+
+        super().setUpClass()
+        cls._orcamento_estrito = override_settings(QUERY_BUDGET_ESTRITO=True)
+        cls._orcamento_estrito.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._orcamento_estrito.disable()
+        super().tearDownClass()
+
+    def assertSemConsultasRepetidas(self, response):
+        relatorio = response.relatorio_consultas
+        repetidas = [sql for sql, total in relatorio.sql.items() if total > 1]
+        self.assertFalse(repetidas, f'Consultas repetidas: {repetidas}')
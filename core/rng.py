@@ -0,0 +1,45 @@
+"""
+Geradores de números aleatórios sem estado global.
+
+Cada partida guarda uma `seed`; `PartidaRNG` deriva dela fluxos
+independentes por finalidade e turno (eventos, mercado, ...). O mesmo
+fluxo sempre produz a mesma sequência, então replays, testes de carga e
+relatos de bugs são reproduzíveis, e nenhuma requisição disputa o estado
+do módulo `random` com as outras threads do worker.
+
+Códigos de turma vêm do alocador em core/services/codigos.py.
+"""
+import hashlib
+import random
+import secrets
+
+
+def gerar_seed():
+    """Seed nova para uma partida (63 bits, cabe em um BigIntegerField)."""
+    return secrets.randbits(63)
+
+
+class PartidaRNG:
+    """Fluxos determinísticos derivados da seed de uma partida."""
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    @classmethod
+    def da_partida(cls, partida):
+        return cls(partida.seed)
+
+    def fluxo(self, nome, *chaves):
+        """
+        Gerador independente para `nome` e `chaves`. Fluxos diferentes não
+        compartilham estado: consumir números de um não altera os outros.
+        """
+        material = ':'.join(str(parte) for parte in (self.seed, nome, *chaves))
+        digest = hashlib.blake2b(material.encode(), digest_size=16).digest()
+        return random.Random(int.from_bytes(digest, 'big'))
+
+    def eventos(self, turno):
+        return self.fluxo('eventos', turno)
+
+    def mercado(self, turno):
+        return self.fluxo('mercado', turno)
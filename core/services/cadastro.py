@@ -0,0 +1,61 @@
+"""
+Verificação de unicidade do cadastro em uma única consulta.
+
+Nome de usuário e e-mail são únicos sem diferenciar maiúsculas (índices
+funcionais em `Lower`), o documento é único como está. `conflitos` busca
+de uma vez todos os usuários que colidem em qualquer um dos três campos;
+os índices continuam sendo a garantia final contra cadastros simultâneos.
+"""
+from dataclasses import dataclass, field
+
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from core.models import User
+
+
+@dataclass
+class Conflitos:
+    """Valores já em uso; usernames e e-mails em minúsculas."""
+    usernames: set = field(default_factory=set)
+    emails: set = field(default_factory=set)
+    documentos: set = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.usernames or self.emails or self.documentos)
+
+
+def _minusculas(valores):
+    return {valor.lower() for valor in valores if valor}
+
+
+def conflitos(usernames=(), emails=(), documentos=()):
+    """Quais dos valores informados já pertencem a algum usuário."""
+    usernames, emails = _minusculas(usernames), _minusculas(emails)
+    documentos = {documento for documento in documentos if documento}
+
+    filtros = Q()
+    if usernames:
+        filtros |= Q(username_min__in=usernames)
+    if emails:
+        filtros |= Q(email_min__in=emails)
+    if documentos:
+        filtros |= Q(documento__in=documentos)
+    encontrados = Conflitos()
+    if not filtros:
+        return encontrados
+
+    linhas = (
+        User.objects
+        .annotate(username_min=Lower('username'), email_min=Lower('email'))
+        .filter(filtros)
+        .values_list('username_min', 'email_min', 'documento')
+    )
+    for username, email, documento in linhas:
+        if username in usernames:
+            encontrados.usernames.add(username)
+        if email in emails:
+            encontrados.emails.add(email)
+        if documento in documentos:
+            encontrados.documentos.add(documento)
+    return encontrados
@@ -0,0 +1,66 @@
+"""
+Cache local ao processo para catálogos raramente alterados.
+
+Cada processo guarda a sua cópia compilada, mas a versão do catálogo fica
+no cache padrão: com Redis ela é compartilhada entre os workers e as
+instâncias, então uma edição no admin vale em todos eles na leitura
+seguinte. Sem cache compartilhado, a cópia local é refeita no máximo a
+cada CATALOGO_VALIDADE segundos.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VALIDADE_PADRAO = 60
+
+
+class CatalogoEmMemoria:
+    """
+    Mantém em memória o resultado de `construir()`, carregado sob demanda.
+    Cada invalidação incrementa `versao` no cache compartilhado e força a
+    reconstrução na próxima leitura de todos os processos.
+    """
+
+    def __init__(self, nome, construir):
+        self._chave = f'catalogo:{nome}:versao'
+        self._construir = construir
+        self._dados = None
+        self._versao_dados = None
+        self._expira = 0
+        self._lock = threading.Lock()
+
+    @property
+    def versao(self):
+        versao = cache.get(self._chave)
+        if versao is None:
+            cache.add(self._chave, 0, None)
+            versao = cache.get(self._chave, 0)
+        return versao
+
+    def _vencido(self, versao, agora):
+        return self._dados is None or self._versao_dados != versao or agora >= self._expira
+
+    def obter(self):
+        versao = self.versao
+        agora = time.monotonic()
+        dados = self._dados
+        if self._vencido(versao, agora):
+            with self._lock:
+                if self._vencido(versao, agora):
+                    self._dados = self._construir()
+                    self._versao_dados = versao
+                    self._expira = agora + getattr(settings, 'CATALOGO_VALIDADE', VALIDADE_PADRAO)
+                dados = self._dados
+        return dados
+
+    def invalidar(self):
+        cache.add(self._chave, 0, None)
+        try:
+            cache.incr(self._chave)
+        except ValueError:
+            # A chave saiu do cache entre o add e o incr
+            cache.set(self._chave, 1, None)
+        with self._lock:
+            self._dados = None
@@ -0,0 +1,102 @@
+"""
+Alocação de códigos de turma (AAA-999) sem colisões.
+
+Cada código vem de um contador no banco (`Sequencia`), passado por uma
+permutação com chave sobre o espaço de 26³ × 1000 códigos: uma rede de
+Feistel que alterna somas modulares entre a parte das letras e a dos
+números. Como a permutação é bijetiva, valores distintos do contador geram
+códigos distintos: não há consulta de existência nem laço de nova
+tentativa, e o UPDATE do contador serializa educadores concorrentes. A
+chave fica na própria linha do contador, então os códigos parecem
+aleatórios e não mudam com o SECRET_KEY.
+"""
+import hashlib
+import secrets
+from string import ascii_uppercase
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from core.models import Sequencia, Turma
+
+SEQUENCIA_TURMA = 'codigo_turma'
+
+ESPACO_LETRAS = 26 ** 3
+ESPACO_NUMEROS = 1000
+TOTAL_CODIGOS = ESPACO_LETRAS * ESPACO_NUMEROS
+
+RODADAS = 8
+
+# Tentativas de criação da turma (códigos sorteados antes do alocador podem coincidir)
+TENTATIVAS = 5
+
+
+class CodigosEsgotados(Exception):
+    """Todos os códigos AAA-999 já foram alocados."""
+
+
+def _rodada(chave, rodada, valor):
+    material = f'{rodada}:{valor}'.encode()
+    return int.from_bytes(hashlib.blake2b(material, key=chave, digest_size=8).digest(), 'big')
+
+
+def permutar(indice, chave):
+    """Posição de `indice` (0 <= indice < TOTAL_CODIGOS) na permutação definida por `chave`."""
+    letras, numeros = divmod(indice, ESPACO_NUMEROS)
+    for rodada in range(RODADAS):
+        if rodada % 2 == 0:
+            letras = (letras + _rodada(chave, rodada, numeros)) % ESPACO_LETRAS
+        else:
+            numeros = (numeros + _rodada(chave, rodada, letras)) % ESPACO_NUMEROS
+    return letras * ESPACO_NUMEROS + numeros
+
+
+def despermutar(posicao, chave):
+    """Inversa de `permutar`."""
+    letras, numeros = divmod(posicao, ESPACO_NUMEROS)
+    for rodada in reversed(range(RODADAS)):
+        if rodada % 2 == 0:
+            letras = (letras - _rodada(chave, rodada, numeros)) % ESPACO_LETRAS
+        else:
+            numeros = (numeros - _rodada(chave, rodada, letras)) % ESPACO_NUMEROS
+    return letras * ESPACO_NUMEROS + numeros
+
+
+def formatar(posicao):
+    """Código AAA-999 da posição no espaço de códigos."""
+    letras, numeros = divmod(posicao, ESPACO_NUMEROS)
+    prefixo = ''.join(ascii_uppercase[(letras // 26 ** casa) % 26] for casa in (2, 1, 0))
+    return f'{prefixo}-{numeros:03d}'
+
+
+def proximo_valor(nome):
+    """Incrementa o contador `nome` e devolve (valor, chave). Cria o contador no primeiro uso."""
+    with transaction.atomic():
+        if not Sequencia.objects.filter(nome=nome).update(valor=F('valor') + 1):
+            Sequencia.objects.get_or_create(nome=nome, defaults={'chave': secrets.token_hex(32)})
+            Sequencia.objects.filter(nome=nome).update(valor=F('valor') + 1)
+        return Sequencia.objects.filter(nome=nome).values_list('valor', 'chave').get()
+
+
+def alocar_codigo_turma():
+    """Próximo código de turma, nunca alocado antes."""
+    valor, chave = proximo_valor(SEQUENCIA_TURMA)
+    if valor > TOTAL_CODIGOS:
+        raise CodigosEsgotados(f'Os {TOTAL_CODIGOS} códigos de turma já foram alocados.')
+    return formatar(permutar(valor - 1, bytes.fromhex(chave)))
+
+
+def criar_turma(**campos):
+    """
+    Cria a turma com um código alocado. Só repete a alocação se o código
+    coincidir com um sorteado antes do alocador existir.
+    """
+    for tentativa in range(TENTATIVAS):
+        # Fora do savepoint: um código recusado não volta para o contador
+        codigo = alocar_codigo_turma()
+        try:
+            with transaction.atomic():
+                return Turma.objects.create(codigo=codigo, **campos)
+        except IntegrityError:
+            if tentativa == TENTATIVAS - 1:
+                raise
@@ -1,5 +1,17 @@
 from core.models import Conquista, ConquistaDesbloqueada, Partida
+from core.services.catalogo import CatalogoEmMemoria
+from bisect import bisect_right
 from decimal import Decimal
+from types import MappingProxyType
+
+TITULO_PRIMEIRA_SIMULACAO = 'Primeira Simulação'
+TITULO_PERSISTENTE = 'Persistente!'
+
+# Conquistas fixas do jogo (não dependem do saldo)
+CONQUISTAS_BASE = [
+    {'valor': Decimal('0.00'), 'titulo': TITULO_PRIMEIRA_SIMULACAO, 'descricao': 'Você completou a primeira simulação!', 'pontos': 10},
+    {'valor': Decimal('5'), 'titulo': TITULO_PERSISTENTE, 'descricao': 'Você jogou 5 turnos.', 'pontos': 10},
+]
 
 # Definição das conquistas de saldo
 CONQUISTAS_SALDO = [
@@ -120,21 +132,57 @@ CONQUISTAS_SALDO = [
     {'valor': Decimal('1000000000.00'), 'titulo': 'Bilionário! Você Zerou o Game!', 'descricao': 'Parabéns! Você alcançou R$ 1 bilhão e zerou o VentureGotchi!', 'pontos': 10000},
 ]
 
+_TITULOS_SALDO = frozenset(info['titulo'] for info in CONQUISTAS_SALDO)
+_TITULOS_CATALOGO = frozenset(info['titulo'] for info in CONQUISTAS_BASE) | _TITULOS_SALDO
+
+
+class IndiceConquistas:
+    """
+    Catálogo imutável de conquistas, indexado por título e, para as
+    conquistas de saldo, por limiar ordenado (consultado com bisect).
+    """
+
+    def __init__(self, conquistas):
+        self.por_titulo = MappingProxyType({c.titulo: c for c in conquistas})
+        conquistas_saldo = sorted(
+            (c for c in conquistas if c.titulo in _TITULOS_SALDO),
+            key=lambda c: c.valor_objetivo,
+        )
+        self.conquistas_saldo = tuple(conquistas_saldo)
+        self.limiares = tuple(c.valor_objetivo for c in conquistas_saldo)
+        self.completo = _TITULOS_CATALOGO <= self.por_titulo.keys()
+
+    def saldo_cruzadas(self, saldo_anterior, saldo_atual):
+        """
+        Retorna as conquistas de saldo cujo limiar está no intervalo
+        (saldo_anterior, saldo_atual]. Sem saldo anterior, considera todos
+        os limiares até o saldo atual.
+        """
+        inicio = 0 if saldo_anterior is None else bisect_right(self.limiares, saldo_anterior)
+        fim = bisect_right(self.limiares, saldo_atual)
+        return self.conquistas_saldo[inicio:fim]
+
+
+catalogo_conquistas = CatalogoEmMemoria('conquistas', lambda: IndiceConquistas(list(Conquista.objects.all())))
+
+
+def obter_catalogo_conquistas():
+    """
+    Retorna o catálogo de conquistas em memória. Só consulta o banco na
+    primeira carga, após uma invalidação ou se o catálogo não foi semeado.
+    """
+    indice = catalogo_conquistas.obter()
+    if not indice.completo:
+        _garantir_conquistas_existem()
+        catalogo_conquistas.invalidar()
+        indice = catalogo_conquistas.obter()
+    return indice
+
+
 def verificar_conquistas_partida(partida):
-    conquistas_desbloqueadas = ConquistaDesbloqueada.objects.filter(partida=partida).values_list('conquista_id', flat=True)
-
-    conquista, _ = Conquista.objects.get_or_create(
-        titulo='Primeira Simulação',
-        defaults={
-            'descricao': 'Você completou a primeira simulação!',
-            'tipo': 'progresso',
-            'valor_objetivo': Decimal('0.00'),
-            'pontos': 10,
-            'ativo': True,
-        }
-    )
+    conquista = obter_catalogo_conquistas().por_titulo[TITULO_PRIMEIRA_SIMULACAO]
 
-    if conquista.id not in conquistas_desbloqueadas:
+    if not ConquistaDesbloqueada.objects.filter(partida=partida, conquista=conquista).exists():
         turno_atual = 1
         if hasattr(partida, 'startup') and partida.startup is not None:
             turno_atual = getattr(partida.startup, 'turno_atual', 1)
@@ -143,32 +191,20 @@ def verificar_conquistas_partida(partida):
 def _garantir_conquistas_existem():
     """
     Garante que todas as conquistas do sistema existem no banco.
-    Usa bulk_create para otimização.
+    Usada pela migração de dados e pelo comando `semear_conquistas`; no
+    fluxo do jogo só roda se o catálogo em memória estiver incompleto.
+    Retorna quantas conquistas foram criadas.
     """
-    # Verificar se já existem conquistas criadas
-    if Conquista.objects.filter(titulo='Bilionário! Você Zerou o Game!').exists():
-        return  # Conquistas já criadas
-    
-    # Criar conquista de persistência
-    Conquista.objects.get_or_create(
-        titulo='Persistente!',
-        defaults={
-            'descricao': 'Você jogou 5 turnos.',
-            'tipo': 'progresso',
-            'valor_objetivo': Decimal('5'),
-            'pontos': 10,
-            'ativo': True,
-        }
-    )
-    
+    definicoes = CONQUISTAS_BASE + CONQUISTAS_SALDO
+
     # Coletar títulos existentes
     titulos_existentes = set(Conquista.objects.filter(
-        titulo__in=[info['titulo'] for info in CONQUISTAS_SALDO]
+        titulo__in=[info['titulo'] for info in definicoes]
     ).values_list('titulo', flat=True))
     
     # Criar apenas conquistas que não existem
     conquistas_para_criar = []
-    for conquista_info in CONQUISTAS_SALDO:
+    for conquista_info in definicoes:
         if conquista_info['titulo'] not in titulos_existentes:
             conquistas_para_criar.append(Conquista(
                 titulo=conquista_info['titulo'],
@@ -183,58 +219,66 @@ def _garantir_conquistas_existem():
     if conquistas_para_criar:
         Conquista.objects.bulk_create(conquistas_para_criar, ignore_conflicts=True)
 
+    return len(conquistas_para_criar)
+
 
-def verificar_conquistas_progesso(usuario, partida_especifica=None):
+def verificar_conquistas_progesso(usuario, partida_especifica=None, saldo_anterior=None, saldo_maximo=None):
     """
     Verifica e desbloqueia conquistas de progresso.
     Retorna lista de novas conquistas desbloqueadas.
+
+    Quando `saldo_anterior` é informado (apenas junto de `partida_especifica`),
+    só os limiares cruzados desde esse saldo são avaliados. O catálogo vem da
+    memória e o número de consultas é constante, independente de quantos
+    limiares foram cruzados. `saldo_maximo` substitui o saldo atual como
+    limite superior quando vários turnos são verificados de uma só vez.
     """
-    novas_conquistas = []
-    
-    # Garantir que conquistas existem (otimizado)
-    _garantir_conquistas_existem()
-    
-    # Buscar conquistas necessárias
-    conquista_persistente = Conquista.objects.get(titulo='Persistente!')
-    conquistas_saldo_map = {
-        c.valor_objetivo: c 
-        for c in Conquista.objects.filter(
-            titulo__in=[info['titulo'] for info in CONQUISTAS_SALDO]
-        )
-    }
+    catalogo = obter_catalogo_conquistas()
+    conquista_persistente = catalogo.por_titulo[TITULO_PERSISTENTE]
 
     # Se uma partida específica foi passada, verificar apenas ela
     if partida_especifica:
         partidas = [partida_especifica]
     else:
         partidas = Partida.objects.filter(usuario=usuario).select_related('startup')
-    
+        saldo_anterior = None
+        saldo_maximo = None
+
+    # Candidatas a desbloqueio: (partida, conquista, turno)
+    candidatas = []
     for partida in partidas:
-        turno_atual = 0
-        if hasattr(partida, 'startup') and partida.startup is not None:
-            turno_atual = getattr(partida.startup, 'turno_atual', 0)
+        startup = getattr(partida, 'startup', None)
+        if startup is None:
+            continue
+
+        turno_atual = startup.turno_atual
         if turno_atual >= 5:
-            obj, created = ConquistaDesbloqueada.objects.get_or_create(
-                partida=partida,
-                conquista=conquista_persistente,
-                defaults={'turno': turno_atual}
-            )
-            if created:
-                novas_conquistas.append(conquista_persistente)
-        
-        # Verificar conquistas de saldo
-        if hasattr(partida, 'startup') and partida.startup is not None:
-            saldo_caixa = getattr(partida.startup, 'saldo_caixa', Decimal('0.00'))
-            
-            # Desbloquear todas as conquistas alcançadas
-            for valor, conquista_obj in conquistas_saldo_map.items():
-                if saldo_caixa >= valor:
-                    obj, created = ConquistaDesbloqueada.objects.get_or_create(
-                        partida=partida,
-                        conquista=conquista_obj,
-                        defaults={'turno': turno_atual}
-                    )
-                    if created:
-                        novas_conquistas.append(conquista_obj)
-    
-    return novas_conquistas
\ No newline at end of file
+            candidatas.append((partida, conquista_persistente, turno_atual))
+
+        saldo_limite = startup.saldo_caixa if saldo_maximo is None else saldo_maximo
+        for conquista in catalogo.saldo_cruzadas(saldo_anterior, saldo_limite):
+            candidatas.append((partida, conquista, turno_atual))
+
+    if not candidatas:
+        return []
+
+    ja_desbloqueadas = set(
+        ConquistaDesbloqueada.objects.filter(
+            partida__in={partida.pk for partida, _, _ in candidatas},
+            conquista__in={conquista.pk for _, conquista, _ in candidatas},
+        ).values_list('partida_id', 'conquista_id')
+    )
+
+    novas_conquistas = []
+    registros = []
+    for partida, conquista, turno_atual in candidatas:
+        if (partida.pk, conquista.pk) in ja_desbloqueadas:
+            continue
+        registros.append(ConquistaDesbloqueada(partida=partida, conquista=conquista, turno=turno_atual))
+        novas_conquistas.append(conquista)
+
+    # Um único INSERT para todas as conquistas novas
+    if registros:
+        ConquistaDesbloqueada.objects.bulk_create(registros, ignore_conflicts=True)
+
+    return novas_conquistas
@@ -0,0 +1,89 @@
+"""
+Catálogo de decisões do jogo, compilado em uma tabela imutável em memória.
+
+A tabela é montada na primeira leitura a partir do modelo Decisao e
+descartada pelos sinais do modelo. A versão fica no cache compartilhado
+(`core.services.catalogo`), então edições no admin valem em todos os
+workers sem reiniciar o servidor.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+
+from django.contrib import messages
+
+from core.models import Decisao
+from core.services.catalogo import CatalogoEmMemoria
+
+_NIVEIS_MENSAGEM = {
+    Decisao.NivelMensagem.INFO: messages.INFO,
+    Decisao.NivelMensagem.SUCESSO: messages.SUCCESS,
+    Decisao.NivelMensagem.AVISO: messages.WARNING,
+}
+
+
+@dataclass(frozen=True)
+class EfeitoDecisao:
+    """Custo, variações e pré-condições de uma decisão, prontos para o turno."""
+    titulo: str = ''
+    nome_curto: str = ''
+    descricao: str = ''
+    icone: str = ''
+    custo: Decimal = Decimal('0.00')
+    receita: Decimal = Decimal('0.00')
+    valuation: Decimal = Decimal('0.00')
+    funcionarios: int = 0
+    turno_minimo: int = 1
+    funcionarios_minimos: int = 0
+    mensagem: str = ''
+    nivel: int = messages.INFO
+
+    @classmethod
+    def de_modelo(cls, decisao):
+        return cls(
+            titulo=decisao.titulo,
+            nome_curto=decisao.nome_curto,
+            descricao=decisao.descricao,
+            icone=decisao.icone,
+            custo=decisao.custo,
+            receita=decisao.delta_receita,
+            valuation=decisao.delta_valuation,
+            funcionarios=decisao.delta_funcionarios,
+            turno_minimo=decisao.turno_minimo,
+            funcionarios_minimos=decisao.funcionarios_minimos,
+            mensagem=decisao.mensagem,
+            nivel=_NIVEIS_MENSAGEM.get(decisao.nivel_mensagem, messages.INFO),
+        )
+
+    def disponivel_para(self, startup):
+        """Verifica as pré-condições da decisão para o estado atual da startup."""
+        return (
+            startup.turno_atual >= self.turno_minimo
+            and startup.funcionarios >= self.funcionarios_minimos
+        )
+
+
+# Decisões desconhecidas apenas avançam o turno
+EFEITO_NEUTRO = EfeitoDecisao()
+
+
+class TabelaDecisoes:
+    """Decisões ativas na ordem de exibição, indexadas pelo título."""
+
+    def __init__(self, decisoes):
+        self.ordenadas = tuple(EfeitoDecisao.de_modelo(d) for d in decisoes)
+        self.por_titulo = MappingProxyType({efeito.titulo: efeito for efeito in self.ordenadas})
+
+    def efeito(self, titulo):
+        return self.por_titulo.get(titulo, EFEITO_NEUTRO)
+
+    def disponiveis_para(self, startup):
+        return [efeito for efeito in self.ordenadas if efeito.disponivel_para(startup)]
+
+
+tabela_decisoes = CatalogoEmMemoria('decisoes', lambda: TabelaDecisoes(Decisao.objects.filter(ativa=True)))
+
+
+def obter_tabela_decisoes():
+    """Retorna a tabela de decisões compilada, carregando-a se necessário."""
+    return tabela_decisoes.obter()
@@ -0,0 +1,95 @@
+"""
+Estatísticas de perfil por usuário (UserStats).
+
+A criação de partidas pelo jogo (`iniciar_partida`) e o TurnEngine
+atualizam contagens, recordes e conquistas com um único UPDATE; as demais
+escritas via ORM chegam pelos sinais em core/signals.py. Mudanças raras (fim de partida, exclusões)
+recalculam a linha a partir das tabelas de origem com `recalcular_stats`.
+"""
+from django.db.models import Count, F, Max, Q, Value
+from django.db.models.functions import Greatest
+
+from core.models import ConquistaDesbloqueada, Partida, Startup, UserStats
+
+
+def recalcular_stats(usuario_id, criar=True):
+    """
+    Recalcula contagens e recordes do usuário. Os recordes nunca diminuem.
+    Com `criar=False` só atualiza uma linha existente (exclusões em cascata).
+    """
+    partidas = Partida.objects.filter(usuario_id=usuario_id).aggregate(
+        total=Count('id'),
+        ativas=Count('id', filter=Q(ativa=True)),
+    )
+    recordes = Startup.objects.filter(partida__usuario_id=usuario_id).aggregate(
+        maior_saldo=Max('saldo_caixa'),
+        maior_valuation=Max('valuation'),
+        maior_turno=Max('turno_atual'),
+    )
+    valores = {
+        'total_partidas': partidas['total'],
+        'partidas_ativas': partidas['ativas'],
+        'total_conquistas': ConquistaDesbloqueada.objects.filter(partida__usuario_id=usuario_id).count(),
+    }
+
+    if not criar:
+        UserStats.objects.filter(pk=usuario_id).update(**valores)
+        return None
+
+    stats = UserStats.objects.filter(pk=usuario_id).first() or UserStats(usuario_id=usuario_id)
+    for campo, valor in valores.items():
+        setattr(stats, campo, valor)
+    for campo, valor in recordes.items():
+        setattr(stats, campo, max(getattr(stats, campo), valor or 0))
+    stats.save()
+    return stats
+
+
+def obter_stats(usuario):
+    """Linha de estatísticas do usuário, com a turma; recalculada se ainda não existe."""
+    stats = UserStats.objects.select_related('usuario__turma').filter(pk=usuario.pk).first()
+    return stats or recalcular_stats(usuario.pk)
+
+
+def registrar_partida(partida, startup=None, conquistas=()):
+    """
+    Conta uma partida nova. Com a `startup` (criação pelo `iniciar_partida`,
+    sem sinais) o mesmo UPDATE aplica os recordes e soma as `conquistas`.
+    """
+    valores = {
+        'total_partidas': F('total_partidas') + 1,
+        'partidas_ativas': F('partidas_ativas') + int(partida.ativa),
+    }
+    if startup is not None:
+        valores.update(
+            maior_saldo=Greatest('maior_saldo', Value(startup.saldo_caixa)),
+            maior_valuation=Greatest('maior_valuation', Value(startup.valuation)),
+            maior_turno=Greatest('maior_turno', Value(startup.turno_atual)),
+            total_conquistas=F('total_conquistas') + len(conquistas),
+        )
+    if not UserStats.objects.filter(pk=partida.usuario_id).update(**valores):
+        recalcular_stats(partida.usuario_id)
+
+
+def registrar_conquista(usuario_id):
+    if not UserStats.objects.filter(pk=usuario_id).update(total_conquistas=F('total_conquistas') + 1):
+        recalcular_stats(usuario_id)
+
+
+def atualizar_recordes(usuario_id, startup, novas_conquistas=(), saldo_maximo=None):
+    """
+    Aplica o estado da startup aos recordes com um único UPDATE.
+
+    `novas_conquistas` são as gravadas por bulk_create, que não disparam
+    sinais; as criadas com save() já foram contadas pelo sinal.
+    `saldo_maximo` é o maior saldo de uma simulação em lote.
+    """
+    saldo = max(startup.saldo_caixa, saldo_maximo or startup.saldo_caixa)
+    atualizadas = UserStats.objects.filter(pk=usuario_id).update(
+        maior_saldo=Greatest('maior_saldo', Value(saldo)),
+        maior_valuation=Greatest('maior_valuation', Value(startup.valuation)),
+        maior_turno=Greatest('maior_turno', Value(startup.turno_atual)),
+        total_conquistas=F('total_conquistas') + len(novas_conquistas),
+    )
+    if not atualizadas:
+        recalcular_stats(usuario_id)
@@ -0,0 +1,119 @@
+"""
+GET condicional (ETag) para as páginas de leitura do jogador.
+
+Cada página tem uma função que calcula o ETag com uma consulta leve sobre
+os contadores de versão (`Startup.versao` e `LeaderboardEntry.versao`),
+sem renderizar template nem calcular agregados pesados. Se o navegador
+enviar o mesmo ETag, a resposta é `304 Not Modified`.
+
+O ETag também leva os dados do usuário exibidos na navegação, as versões
+dos catálogos em memória e o segredo CSRF: as páginas têm formulários, e
+um novo login troca o token, que uma cópia em cache reenviaria vencido.
+Com mensagens pendentes na sessão a página é sempre renderizada, senão os
+avisos do turno se perderiam em um 304.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib import messages
+from django.middleware.csrf import get_token
+from django.db.models import Count, Max, Sum
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+
+from core.models import Partida, Startup
+from core.permissions import usuario_async
+from core.services.conquistas import catalogo_conquistas
+from core.services.decisoes import tabela_decisoes
+from core.services.ranking import entradas_visiveis
+
+CAMPOS_ASSINATURA = (
+    'pk', 'username', 'first_name', 'last_name', 'categoria', 'turma_id', 'pais', 'estado', 'municipio',
+)
+
+
+def pagina_condicional(etag_func):
+    """
+    Responde 304 quando o ETag não mudou. As respostas são privadas e o
+    navegador revalida a cada acesso.
+
+    Em views assíncronas o ETag (que consulta o banco) é calculado em uma
+    thread com sync_to_async antes do `condition`, que o chama de forma
+    síncrona.
+    """
+    def decorator(view_func):
+        if not iscoroutinefunction(view_func):
+            return cache_control(private=True, no_cache=True)(condition(etag_func=etag_func)(view_func))
+
+        condicional = cache_control(private=True, no_cache=True)(
+            condition(etag_func=lambda request, *args, **kwargs: request.etag_calculado)(view_func)
+        )
+
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            await usuario_async(request)
+            request.etag_calculado = await sync_to_async(etag_func)(request, *args, **kwargs)
+            return await condicional(request, *args, **kwargs)
+        return _wrapped_view
+    return decorator
+
+
+def _etag(request, *partes):
+    if len(messages.get_messages(request)):
+        return None
+    usuario = request.user
+    assinatura = [getattr(usuario, campo) for campo in CAMPOS_ASSINATURA]
+    # Garante o segredo em META['CSRF_COOKIE'] (o template chamaria get_token de qualquer forma)
+    get_token(request)
+    conteudo = ':'.join(str(parte) for parte in (*assinatura, request.META['CSRF_COOKIE'], *partes))
+    return hashlib.md5(conteudo.encode()).hexdigest()
+
+
+def etag_jogo(request, partida_id):
+    """Versão da startup, estado da partida e catálogo de decisões."""
+    estado = (
+        Startup.objects
+        .filter(pk=partida_id, partida__usuario=request.user)
+        .values_list('versao', 'partida__ativa')
+        .first()
+    )
+    if estado is None:
+        return None
+    return _etag(request, 'jogo', partida_id, *estado, tabela_decisoes.versao)
+
+
+def etag_jogador(request):
+    """Partidas do usuário e a soma das versões das suas startups (e a página pedida)."""
+    if request.user.is_educador():
+        return None
+    totais = Partida.objects.filter(usuario=request.user).aggregate(
+        total=Count('id'),
+        ultima=Max('id'),
+        versoes=Sum('startup__versao'),
+    )
+    return _etag(
+        request,
+        request.resolver_match.url_name,
+        request.GET.urlencode(),
+        totais['total'],
+        totais['ultima'],
+        totais['versoes'],
+        catalogo_conquistas.versao,
+    )
+
+
+def etag_ranking(request):
+    """Linhas visíveis do ranking e a soma das suas versões."""
+    # Guardadas na requisição para a view não repetir a consulta das turmas
+    request.entradas_ranking = entradas, audiencia = entradas_visiveis(request.user)
+    totais = entradas.aggregate(total=Count('pk'), ultima=Max('pk'), versoes=Sum('versao'))
+    return _etag(
+        request,
+        'ranking',
+        audiencia,
+        request.GET.urlencode(),
+        totais['total'],
+        totais['ultima'],
+        totais['versoes'],
+    )
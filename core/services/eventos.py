@@ -0,0 +1,89 @@
+"""
+Sorteio de eventos aleatórios no turno.
+
+Os eventos ativos são compilados em memória em uma tabela por faixa de
+turno: para cada `turno_minimo` distinto guardamos os eventos já
+liberados e as probabilidades acumuladas. O sorteio de um turno é uma
+busca binária na faixa e outra nas probabilidades, sem consultar o banco.
+
+Cada turno dispara no máximo um evento: `chance_base` é a probabilidade
+do evento naquele turno e, se a soma das chances da faixa passar de 1,
+elas são normalizadas.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import accumulate
+
+from core.models import Evento
+from core.services.catalogo import CatalogoEmMemoria
+
+
+@dataclass(frozen=True)
+class EfeitoEvento:
+    """Impactos de um evento, prontos para aplicar na startup."""
+    id: int
+    titulo: str
+    descricao: str = ''
+    saldo: Decimal = Decimal('0.00')
+    receita: Decimal = Decimal('0.00')
+    valuation: Decimal = Decimal('0.00')
+    funcionarios: int = 0
+
+    @classmethod
+    def de_modelo(cls, evento):
+        return cls(
+            id=evento.pk,
+            titulo=evento.titulo,
+            descricao=evento.descricao,
+            saldo=evento.impacto_saldo,
+            receita=evento.impacto_receita,
+            valuation=evento.impacto_valuation,
+            funcionarios=evento.impacto_funcionarios,
+        )
+
+    def aplicar(self, startup):
+        """Aplica os impactos em memória, sem deixar receita, valuation ou equipe negativos."""
+        startup.saldo_caixa += self.saldo
+        startup.receita_mensal = max(startup.receita_mensal + self.receita, Decimal('0.00'))
+        startup.valuation = max(startup.valuation + self.valuation, Decimal('0.00'))
+        startup.funcionarios = max(startup.funcionarios + self.funcionarios, 0)
+
+
+class TabelaEventos:
+    """Eventos ativos agrupados pelo turno a partir do qual podem ocorrer."""
+
+    def __init__(self, eventos):
+        eventos = sorted(eventos, key=lambda evento: (evento.turno_minimo, evento.pk))
+        self.limites = tuple(sorted({evento.turno_minimo for evento in eventos}))
+
+        faixas = []
+        for limite in self.limites:
+            elegiveis = tuple(EfeitoEvento.de_modelo(e) for e in eventos if e.turno_minimo <= limite)
+            acumuladas = list(accumulate(float(e.chance_base) for e in eventos if e.turno_minimo <= limite))
+            if acumuladas[-1] > 1:
+                total = acumuladas[-1]
+                acumuladas = [valor / total for valor in acumuladas]
+            faixas.append((elegiveis, tuple(acumuladas)))
+        self.faixas = tuple(faixas)
+
+    def sortear(self, turno, rng):
+        """
+        Retorna o evento do turno ou None. Consome um número do `rng`,
+        normalmente `PartidaRNG.eventos(turno)`.
+        """
+        sorteio = rng.random()
+        faixa = bisect_right(self.limites, turno) - 1
+        if faixa < 0:
+            return None
+        elegiveis, acumuladas = self.faixas[faixa]
+        posicao = bisect_right(acumuladas, sorteio)
+        return elegiveis[posicao] if posicao < len(elegiveis) else None
+
+
+tabela_eventos = CatalogoEmMemoria('eventos', lambda: TabelaEventos(list(Evento.objects.filter(ativo=True))))
+
+
+def obter_tabela_eventos():
+    """Retorna a tabela de eventos compilada, carregando-a se necessário."""
+    return tabela_eventos.obter()
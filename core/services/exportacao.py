@@ -0,0 +1,193 @@
+"""
+Exportação dos dados das turmas para o educador.
+
+Cada tabela exportável (startups, decisões e conquistas) é lida com
+`values_list().iterator(chunk_size=...)` e escrita por um gerador: a
+resposta é enviada em blocos conforme as linhas chegam do banco e a
+memória usada não depende do tamanho da turma.
+
+CSV é sempre suportado. Parquet e Arrow (formato IPC de streaming) usam o
+pyarrow, que é opcional; sem ele, `FormatoIndisponivel` é lançada.
+"""
+import csv
+
+from core.models import ConquistaDesbloqueada, HistoricoDecisao, Startup
+
+# Linhas lidas do banco (e escritas em Parquet/Arrow) por bloco
+TAMANHO_BLOCO = 2000
+
+# Colunas comuns: turma, aluno e empresa da partida
+_COLUNAS_PARTIDA = (
+    ('turma', 'partida__usuario__turma__codigo', 'texto'),
+    ('aluno', 'partida__usuario__username', 'texto'),
+    ('empresa', 'partida__nome_empresa', 'texto'),
+)
+
+# Tabela -> (modelo, ordenação, colunas (nome, campo, tipo))
+TABELAS = {
+    'startups': (Startup, ('partida_id',), _COLUNAS_PARTIDA + (
+        ('partida_ativa', 'partida__ativa', 'booleano'),
+        ('turno', 'turno_atual', 'inteiro'),
+        ('saldo_caixa', 'saldo_caixa', 'decimal'),
+        ('receita_mensal', 'receita_mensal', 'decimal'),
+        ('valuation', 'valuation', 'decimal'),
+        ('funcionarios', 'funcionarios', 'inteiro'),
+    )),
+    'decisoes': (HistoricoDecisao, ('partida_id', 'turno'), _COLUNAS_PARTIDA + (
+        ('turno', 'turno', 'inteiro'),
+        ('decisao', 'decisao_tomada', 'texto'),
+        ('data', 'data_decisao', 'data'),
+        ('delta_saldo', 'delta_saldo', 'decimal'),
+        ('delta_receita', 'delta_receita', 'decimal'),
+        ('delta_valuation', 'delta_valuation', 'decimal'),
+        ('delta_funcionarios', 'delta_funcionarios', 'inteiro'),
+    )),
+    'conquistas': (ConquistaDesbloqueada, ('partida_id', 'turno'), _COLUNAS_PARTIDA + (
+        ('conquista', 'conquista__titulo', 'texto'),
+        ('pontos', 'conquista__pontos', 'inteiro'),
+        ('turno', 'turno', 'inteiro'),
+        ('data', 'desbloqueada_em', 'data'),
+    )),
+}
+
+# Formato -> (content type, extensão)
+FORMATOS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+
+class FormatoIndisponivel(Exception):
+    """O formato pedido depende do pyarrow, que não está instalado."""
+
+
+class _Eco:
+    """Buffer do csv.writer que devolve a linha escrita em vez de guardá-la."""
+    def write(self, valor):
+        return valor
+
+
+class _Coletor:
+    """Destino de escrita do pyarrow que acumula os bytes até serem enviados."""
+    def __init__(self):
+        self.partes = []
+        self.posicao = 0
+        self.closed = False
+
+    def write(self, dados):
+        dados = bytes(dados)
+        self.partes.append(dados)
+        self.posicao += len(dados)
+        return len(dados)
+
+    def tell(self):
+        # O escritor de Parquet usa a posição para os offsets do rodapé
+        return self.posicao
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def esvaziar(self):
+        dados = b''.join(self.partes)
+        self.partes.clear()
+        return dados
+
+
+# Início de célula que o Excel e afins interpretam como fórmula
+_INICIO_FORMULA = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _celula(valor):
+    # Texto do usuário (decisão, nome, empresa) não pode virar fórmula na planilha
+    if isinstance(valor, str) and valor.startswith(_INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def linhas_csv(cabecalho, linhas):
+    """
+    Gera o CSV linha a linha, começando pelo cabeçalho. Textos que começam
+    como uma fórmula ganham um apóstrofo na frente; números não mudam.
+    """
+    escritor = csv.writer(_Eco())
+    yield escritor.writerow(cabecalho)
+    for linha in linhas:
+        yield escritor.writerow([_celula(valor) for valor in linha])
+
+
+def _linhas(tabela, partidas):
+    modelo, ordem, colunas = TABELAS[tabela]
+    return (
+        modelo.objects
+        .filter(partida__in=partidas)
+        .order_by(*ordem)
+        .values_list(*(campo for _, campo, _ in colunas))
+        .iterator(chunk_size=TAMANHO_BLOCO)
+    )
+
+
+def _blocos(linhas):
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) == TAMANHO_BLOCO:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise FormatoIndisponivel('Exportação em Parquet e Arrow requer o pacote pyarrow.')
+    return pyarrow
+
+
+def _linhas_arrow(formato, colunas, linhas):
+    pa = _pyarrow()
+    tipos = {
+        'texto': pa.string(),
+        'inteiro': pa.int64(),
+        'booleano': pa.bool_(),
+        'decimal': pa.decimal128(12, 2),
+        'data': pa.timestamp('us', tz='UTC'),
+    }
+    esquema = pa.schema([(nome, tipos[tipo]) for nome, _, tipo in colunas])
+    destino = _Coletor()
+    if formato == 'parquet':
+        escritor = pa.parquet.ParquetWriter(destino, esquema)
+        escrever = escritor.write_table
+    else:
+        escritor = pa.ipc.new_stream(destino, esquema)
+        escrever = escritor.write
+
+    for bloco in _blocos(linhas):
+        # Cada bloco vira um row group (Parquet) ou um record batch (Arrow)
+        escrever(pa.Table.from_pylist([dict(zip(esquema.names, linha)) for linha in bloco], schema=esquema))
+        yield destino.esvaziar()
+    escritor.close()
+    yield destino.esvaziar()
+
+
+def exportar(tabela, partidas, formato='csv'):
+    """
+    Gerador com o conteúdo de `tabela` para as `partidas` no `formato` pedido.
+
+    Lança KeyError para tabela ou formato desconhecidos e
+    FormatoIndisponivel se o formato requer o pyarrow e ele não está
+    instalado. As duas verificações acontecem antes da primeira consulta.
+    """
+    _, _, colunas = TABELAS[tabela]
+    FORMATOS[formato]
+    if formato != 'csv':
+        _pyarrow()
+        return _linhas_arrow(formato, colunas, _linhas(tabela, partidas))
+    return linhas_csv([nome for nome, _, _ in colunas], _linhas(tabela, partidas))
@@ -0,0 +1,197 @@
+"""
+Importação da lista de alunos de uma turma (CSV com nome, e-mail e matrícula).
+
+Todas as linhas são validadas juntas: formato linha a linha, repetições
+dentro do arquivo e uma única consulta de conflitos com usuários já
+cadastrados (`core.services.cadastro`). Se alguma linha falhar nada é
+criado; caso contrário os alunos entram com um `bulk_create`.
+
+Nenhuma senha é calculada na importação: os alunos nascem com senha
+inutilizável e recebem um convite de uso único para definir a própria
+senha. O hash caro acontece uma vez, no primeiro acesso de cada aluno.
+Os convites valem por PRAZO_CONVITE segundos e podem ser gerados de novo
+para quem ainda não definiu a senha (`convites_pendentes`).
+"""
+import csv
+import io
+import re
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password
+from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from django.db import IntegrityError, transaction
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from core.models import User
+from core.services.cadastro import conflitos
+
+COLUNAS = ('nome', 'email', 'matricula')
+
+# Cabeçalhos aceitos para cada coluna
+SINONIMOS = {
+    'nome': 'nome',
+    'email': 'email',
+    'e-mail': 'email',
+    'matricula': 'matricula',
+    'matrícula': 'matricula',
+}
+
+TAMANHO_LOTE = 500
+
+# Validade padrão do convite, se PRAZO_CONVITE não estiver nas settings
+PRAZO_CONVITE_PADRAO = 60 * 60 * 24 * 30
+
+EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+MATRICULA_REGEX = re.compile(r'^\d{1,10}$')
+
+# O nome vai para first_name e o e-mail também vira o username
+TAMANHO_NOME = User._meta.get_field('first_name').max_length
+TAMANHO_EMAIL = min(User._meta.get_field('email').max_length, User._meta.get_field('username').max_length)
+
+
+class TokenConvite(PasswordResetTokenGenerator):
+    """
+    Token do convite. Inclui o hash da senha, então deixa de valer assim
+    que o aluno define a sua; o sal próprio impede que sirva como token de
+    redefinição de senha (e vice-versa). Vale por `prazo` segundos
+    (PRAZO_CONVITE), não pelo PASSWORD_RESET_TIMEOUT.
+    """
+    key_salt = 'core.services.matriculas.TokenConvite'
+
+    def __init__(self):
+        super().__init__()
+        self.prazo = getattr(settings, 'PRAZO_CONVITE', PRAZO_CONVITE_PADRAO)
+        self._ajuste = ContextVar('ajuste_prazo_convite', default=0)
+
+    def check_token(self, user, token):
+        # A assinatura (algoritmo e chaves antigas) fica com o Django, que
+        # compara a idade do token com PASSWORD_RESET_TIMEOUT; o relógio da
+        # verificação é ajustado para que o limite efetivo seja `prazo`
+        ajuste = self._ajuste.set(settings.PASSWORD_RESET_TIMEOUT - self.prazo)
+        try:
+            return super().check_token(user, token)
+        finally:
+            self._ajuste.reset(ajuste)
+
+    def _num_seconds(self, dt):
+        return super()._num_seconds(dt) + self._ajuste.get()
+
+
+token_convite = TokenConvite()
+
+
+@dataclass
+class LinhaAluno:
+    numero: int
+    nome: str
+    email: str
+    matricula: str
+
+
+@dataclass
+class Importacao:
+    """Resultado da importação: alunos criados ou (linha, mensagem) dos erros."""
+    alunos: list = field(default_factory=list)
+    erros: list = field(default_factory=list)
+
+
+def ler_csv(arquivo):
+    """Linhas do CSV enviado (UTF-8, com ou sem BOM, separado por vírgula ou ponto e vírgula)."""
+    texto = arquivo.read()
+    if isinstance(texto, bytes):
+        texto = texto.decode('utf-8-sig')
+    primeira = texto.split('\n', 1)[0]
+    leitor = csv.reader(io.StringIO(texto), delimiter=';' if primeira.count(';') > primeira.count(',') else ',')
+    cabecalho = [SINONIMOS.get(coluna.strip().lower(), coluna) for coluna in next(leitor, [])]
+    faltando = [coluna for coluna in COLUNAS if coluna not in cabecalho]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes no CSV: {', '.join(faltando)}.")
+    posicoes = [cabecalho.index(coluna) for coluna in COLUNAS]
+
+    linhas = []
+    # Linha 1 é o cabeçalho
+    for numero, valores in enumerate(leitor, start=2):
+        if not any(valor.strip() for valor in valores):
+            continue
+        valores += [''] * (len(cabecalho) - len(valores))
+        nome, email, matricula = (valores[posicao].strip() for posicao in posicoes)
+        linhas.append(LinhaAluno(numero, nome, email, matricula))
+    return linhas
+
+
+def validar(linhas):
+    """Erros (linha, mensagem) de todas as linhas, com uma consulta ao banco."""
+    erros = []
+    vistos = {}
+    for linha in linhas:
+        if not linha.nome:
+            erros.append((linha.numero, 'Nome é obrigatório.'))
+        elif len(linha.nome) > TAMANHO_NOME:
+            erros.append((linha.numero, f'Nome muito longo ({len(linha.nome)} caracteres, máximo é {TAMANHO_NOME}).'))
+        if len(linha.email) > TAMANHO_EMAIL:
+            erros.append((linha.numero, f'E-mail muito longo ({len(linha.email)} caracteres, máximo é {TAMANHO_EMAIL}).'))
+        elif not EMAIL_REGEX.match(linha.email):
+            erros.append((linha.numero, f"E-mail inválido: '{linha.email}'."))
+        elif linha.email.lower() in vistos:
+            erros.append((linha.numero, f"E-mail repetido no arquivo (linha {vistos[linha.email.lower()]})."))
+        else:
+            vistos[linha.email.lower()] = linha.numero
+        if not MATRICULA_REGEX.match(linha.matricula):
+            erros.append((linha.numero, f"Matrícula inválida: '{linha.matricula}'. Use até 10 dígitos."))
+
+    # O e-mail também é o nome de usuário do aluno
+    encontrados = conflitos(vistos, vistos)
+    em_uso = encontrados.usernames | encontrados.emails
+    for linha in linhas:
+        if vistos.get(linha.email.lower()) == linha.numero and linha.email.lower() in em_uso:
+            erros.append((linha.numero, f"O e-mail '{linha.email}' já está cadastrado."))
+    return sorted(erros)
+
+
+def _aluno(turma, linha):
+    return User(
+        username=linha.email.lower(),
+        email=linha.email,
+        first_name=linha.nome,
+        password=make_password(None),
+        categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO,
+        codigo_turma=turma.codigo,
+        turma=turma,
+        matricula_aluno=linha.matricula,
+        municipio='Nao informado',
+        estado='SP',
+        pais='Brasil',
+    )
+
+
+def importar_alunos(turma, linhas):
+    """Cria os alunos de `linhas` na `turma`, todos ou nenhum."""
+    erros = validar(linhas)
+    if erros:
+        return Importacao(erros=erros)
+    try:
+        with transaction.atomic():
+            alunos = User.objects.bulk_create(
+                [_aluno(turma, linha) for linha in linhas], batch_size=TAMANHO_LOTE,
+            )
+    except IntegrityError:
+        # Alguém se cadastrou com um dos e-mails depois da validação
+        return Importacao(erros=validar(linhas) or [(0, 'Não foi possível importar. Tente novamente.')])
+    return Importacao(alunos=alunos)
+
+
+def convites_pendentes(turma):
+    """Alunos da turma que ainda não definiram a senha pelo convite."""
+    return (
+        turma.alunos
+        .filter(categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO, password__startswith=UNUSABLE_PASSWORD_PREFIX)
+        .order_by('first_name', 'pk')
+    )
+
+
+def convite(aluno):
+    """(uidb64, token) do convite de `aluno`."""
+    return urlsafe_base64_encode(force_bytes(aluno.pk)), token_convite.make_token(aluno)
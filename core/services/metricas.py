@@ -0,0 +1,91 @@
+"""
+Série histórica das métricas da startup para os gráficos.
+
+O TurnEngine grava uma linha de `StartupMetricaTurno` por turno, na mesma
+transação. `serie_metricas` lê a série de uma partida em colunas (uma
+lista por métrica, alinhadas pelo turno) e, para partidas longas, reduz o
+número de pontos com LTTB (Largest-Triangle-Three-Buckets) mantendo picos
+e vales da métrica escolhida.
+"""
+from core.models import StartupMetricaTurno
+
+CAMPOS_SERIE = ('saldo_caixa', 'receita_mensal', 'valuation', 'funcionarios')
+
+# Pontos enviados por padrão e no máximo para o gráfico
+PONTOS_PADRAO = 300
+PONTOS_MAXIMO = 1000
+
+
+def metrica_de(startup):
+    """Linha da série com o estado atual da startup (não salva)."""
+    return StartupMetricaTurno(
+        partida_id=startup.pk,
+        turno=startup.turno_atual,
+        **{campo: getattr(startup, campo) for campo in CAMPOS_SERIE}
+    )
+
+
+def lttb(xs, ys, limite):
+    """
+    Índices dos pontos escolhidos pelo LTTB para desenhar `ys` x `xs` com
+    no máximo `limite` pontos. O primeiro e o último ponto são mantidos.
+    """
+    total = len(xs)
+    if limite >= total or limite < 3:
+        return list(range(total))
+
+    largura = (total - 2) / (limite - 2)
+    indices = [0]
+    anterior = 0
+    for balde in range(limite - 2):
+        inicio = int(balde * largura) + 1
+        fim = int((balde + 1) * largura) + 1
+
+        # Média do próximo balde (no último, o ponto final)
+        prox_fim = min(int((balde + 2) * largura) + 1, total)
+        quantidade = prox_fim - fim
+        media_x = sum(xs[fim:prox_fim]) / quantidade
+        media_y = sum(ys[fim:prox_fim]) / quantidade
+
+        ax, ay = xs[anterior], ys[anterior]
+        escolhido, maior_area = inicio, -1.0
+        for indice in range(inicio, fim):
+            area = abs((ax - media_x) * (ys[indice] - ay) - (ax - xs[indice]) * (media_y - ay))
+            if area > maior_area:
+                escolhido, maior_area = indice, area
+        indices.append(escolhido)
+        anterior = escolhido
+
+    indices.append(total - 1)
+    return indices
+
+
+def serie_metricas(partida_id, pontos=PONTOS_PADRAO, referencia='valuation'):
+    """
+    Série da partida em colunas: {'turno': [...], 'saldo_caixa': [...], ...}.
+
+    Com mais de `pontos` turnos, os turnos mantidos são os escolhidos pelo
+    LTTB sobre a métrica `referencia`; as demais colunas usam os mesmos
+    turnos para continuarem alinhadas.
+    """
+    if referencia not in CAMPOS_SERIE:
+        raise ValueError(f'Métrica desconhecida: {referencia}')
+    pontos = max(3, min(pontos, PONTOS_MAXIMO))
+
+    linhas = list(
+        StartupMetricaTurno.objects
+        .filter(partida_id=partida_id)
+        .order_by('turno')
+        .values_list('turno', *CAMPOS_SERIE)
+    )
+    colunas = {
+        campo: [float(linha[posicao]) for linha in linhas]
+        for posicao, campo in enumerate(('turno',) + CAMPOS_SERIE)
+    }
+    colunas['turno'] = [int(turno) for turno in colunas['turno']]
+
+    if len(linhas) > pontos:
+        indices = lttb(colunas['turno'], colunas[referencia], pontos)
+        colunas = {campo: [valores[i] for i in indices] for campo, valores in colunas.items()}
+    colunas['funcionarios'] = [int(valor) for valor in colunas['funcionarios']]
+    return colunas
@@ -0,0 +1,215 @@
+"""
+Manutenção da tabela desnormalizada do ranking (LeaderboardEntry).
+
+O TurnEngine atualiza a linha da partida dentro da transação do turno;
+as demais escritas via ORM (admin, criação de partidas, edição de perfil)
+chegam pelos sinais em core/signals.py. `sincronizar_entrada` recalcula uma
+linha inteira a partir das tabelas de origem. Toda alteração incrementa
+`versao`, usada no ETag da página do ranking.
+
+As listas de países e estados dos filtros ficam no cache do Django, por
+audiência, e são descartadas quando uma partida entra ou sai do ranking
+ou quando a região de um jogador muda.
+"""
+import hashlib
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from core.models import ConquistaDesbloqueada, LeaderboardEntry, Startup, User
+
+# Campos do usuário copiados para o ranking
+CAMPOS_USUARIO = ('categoria', 'codigo_turma', 'turma', 'pais', 'estado', 'municipio')
+
+CHAVE_VERSAO_FILTROS = 'ranking:filtros:versao'
+TEMPO_CACHE_FILTROS = 60 * 60
+
+
+def _valores_usuario(usuario):
+    return {
+        'categoria': usuario.categoria,
+        'codigo_turma': usuario.codigo_turma,
+        'turma_id': usuario.turma_id,
+        'pais': usuario.pais or '',
+        'estado': usuario.estado or '',
+        'municipio': usuario.municipio or '',
+    }
+
+
+def _totais_conquistas(partida_id):
+    totais = ConquistaDesbloqueada.objects.filter(partida_id=partida_id).aggregate(
+        total=Count('id'),
+        pontos=Sum('conquista__pontos'),
+    )
+    return {
+        'total_conquistas': totais['total'] or 0,
+        'pontuacao_conquistas': totais['pontos'] or 0,
+    }
+
+
+def sincronizar_entrada(partida_id):
+    """
+    Recalcula a linha do ranking de uma partida. Partidas encerradas ou sem
+    startup saem do ranking. Retorna a entrada ou None.
+    """
+    startup = (
+        Startup.objects
+        .select_related('partida__usuario')
+        .filter(partida_id=partida_id, partida__ativa=True)
+        .first()
+    )
+    if startup is None:
+        removidas, _ = LeaderboardEntry.objects.filter(partida_id=partida_id).delete()
+        if removidas:
+            invalidar_filtros()
+        return None
+
+    partida = startup.partida
+    entrada, criada = LeaderboardEntry.objects.update_or_create(
+        partida_id=partida_id,
+        defaults={
+            'usuario_id': partida.usuario_id,
+            'nome_empresa': partida.nome_empresa or startup.nome,
+            'valuation': startup.valuation,
+            'saldo_caixa': startup.saldo_caixa,
+            'turno_atual': startup.turno_atual,
+            'funcionarios': startup.funcionarios,
+            **_totais_conquistas(partida_id),
+            **_valores_usuario(partida.usuario),
+        },
+    )
+    if criada:
+        invalidar_filtros()
+    else:
+        LeaderboardEntry.objects.filter(pk=partida_id).update(versao=F('versao') + 1)
+    return entrada
+
+
+def criar_entrada(startup, conquistas=()):
+    """
+    Insere a linha do ranking de uma partida recém-criada com os valores já
+    conhecidos, sem reler a startup e as conquistas.
+    """
+    partida = startup.partida
+    LeaderboardEntry.objects.bulk_create([LeaderboardEntry(
+        partida_id=partida.pk,
+        usuario_id=partida.usuario_id,
+        nome_empresa=partida.nome_empresa or startup.nome,
+        valuation=startup.valuation,
+        saldo_caixa=startup.saldo_caixa,
+        turno_atual=startup.turno_atual,
+        funcionarios=startup.funcionarios,
+        total_conquistas=len(conquistas),
+        pontuacao_conquistas=sum(c.pontos for c in conquistas),
+        **_valores_usuario(partida.usuario),
+    )])
+    invalidar_filtros()
+
+
+def registrar_turno(startup, novas_conquistas=()):
+    """
+    Aplica o resultado de um turno à linha do ranking com um único UPDATE.
+
+    `novas_conquistas` são as conquistas gravadas por bulk_create, que não
+    disparam sinais; as criadas com save() já foram contadas pelo sinal.
+    """
+    if not startup.partida.ativa:
+        return
+    atualizadas = LeaderboardEntry.objects.filter(partida_id=startup.pk).update(
+        valuation=startup.valuation,
+        saldo_caixa=startup.saldo_caixa,
+        turno_atual=startup.turno_atual,
+        funcionarios=startup.funcionarios,
+        versao=F('versao') + 1,
+        total_conquistas=F('total_conquistas') + len(novas_conquistas),
+        pontuacao_conquistas=F('pontuacao_conquistas') + sum(c.pontos for c in novas_conquistas),
+    )
+    if not atualizadas:
+        sincronizar_entrada(startup.pk)
+
+
+def recontar_conquistas(partida_id):
+    """Atualiza total e pontuação de conquistas de uma partida no ranking."""
+    LeaderboardEntry.objects.filter(partida_id=partida_id).update(
+        versao=F('versao') + 1,
+        **_totais_conquistas(partida_id)
+    )
+
+
+def atualizar_usuario(usuario):
+    """Propaga categoria, turma e região do usuário para as suas linhas."""
+    atualizadas = LeaderboardEntry.objects.filter(usuario_id=usuario.pk).update(
+        versao=F('versao') + 1,
+        **_valores_usuario(usuario)
+    )
+    if atualizadas:
+        invalidar_filtros()
+
+
+def reconstruir_ranking():
+    """Recalcula todas as linhas do ranking. Retorna quantas partidas estão nele."""
+    LeaderboardEntry.objects.exclude(partida__ativa=True).delete()
+    total = 0
+    for partida_id in Startup.objects.filter(partida__ativa=True).values_list('partida_id', flat=True).iterator():
+        sincronizar_entrada(partida_id)
+        total += 1
+    return total
+
+
+def entradas_visiveis(usuario):
+    """
+    Linhas do ranking que o `usuario` pode ver e a audiência dos filtros:
+    jogadores veem a própria categoria; educadores, os alunos das suas
+    turmas ativas.
+    """
+    entradas = LeaderboardEntry.objects.all()
+    if usuario.categoria == User.Categorias.EDUCADOR_NEGOCIOS:
+        turmas_ids = list(usuario.turmas_criadas.filter(ativa=True).values_list('id', flat=True))
+        return entradas.filter(turma_id__in=turmas_ids), audiencia_filtros(turmas_ids=turmas_ids)
+    if usuario.categoria in User.Categorias.values:
+        return entradas.filter(categoria=usuario.categoria), audiencia_filtros(categoria=usuario.categoria)
+    return entradas, audiencia_filtros()
+
+
+def audiencia_filtros(categoria=None, turmas_ids=None):
+    """
+    Chave de cache da audiência do ranking: a categoria do jogador ou o
+    conjunto de turmas do educador. Sem nenhum dos dois, todas as partidas.
+    """
+    if turmas_ids is not None:
+        ids = ','.join(str(turma_id) for turma_id in sorted(turmas_ids))
+        return 'turmas:' + hashlib.md5(ids.encode()).hexdigest()
+    return f'categoria:{categoria or "todas"}'
+
+
+def _nova_versao_filtros():
+    try:
+        cache.incr(CHAVE_VERSAO_FILTROS)
+    except ValueError:
+        cache.set(CHAVE_VERSAO_FILTROS, 1, None)
+
+
+def invalidar_filtros():
+    """Descarta as listas de filtros de todas as audiências."""
+    _nova_versao_filtros()
+    # Outra requisição pode ter lido o estado anterior ao commit
+    transaction.on_commit(_nova_versao_filtros)
+
+
+def opcoes_filtros(audiencia, entradas):
+    """
+    Retorna (países, estados) presentes nas `entradas` visíveis para a
+    audiência, ordenados e sem valores vazios.
+    """
+    versao = cache.get_or_set(CHAVE_VERSAO_FILTROS, 1, None)
+    chave = f'ranking:filtros:{versao}:{audiencia}'
+    opcoes = cache.get(chave)
+    if opcoes is None:
+        regioes = entradas.order_by().values_list('pais', 'estado').distinct()
+        opcoes = (
+            sorted({pais for pais, _ in regioes if pais}),
+            sorted({estado for _, estado in regioes if estado}),
+        )
+        cache.set(chave, opcoes, TEMPO_CACHE_FILTROS)
+    return opcoes
@@ -0,0 +1,110 @@
+"""
+Reconstrução do estado da startup em qualquer turno.
+
+Cada `HistoricoDecisao` guarda a variação que o turno causou na startup
+(caixa, receita, valuation e equipe) e o TurnEngine grava um
+`SnapshotStartup` a cada `INTERVALO_SNAPSHOT` turnos. `replay` parte do
+snapshot mais próximo antes do turno pedido e soma as variações seguintes;
+sem snapshot anterior, parte do estado atual e desfaz as variações dos
+turnos posteriores. O custo não depende do número de turnos: duas consultas
+a partir de um snapshot, três a partir do estado atual.
+
+Turnos jogados antes da criação das variações têm delta zero e não podem
+ser reconstruídos com exatidão.
+"""
+from dataclasses import dataclass, replace
+from decimal import Decimal
+
+from django.db.models import Max, Sum
+
+from core.models import HistoricoDecisao, SnapshotStartup, Startup
+
+# Turnos entre dois snapshots
+INTERVALO_SNAPSHOT = 10
+
+CAMPOS_ESTADO = ('saldo_caixa', 'receita_mensal', 'valuation', 'funcionarios')
+CAMPOS_DELTA = {
+    'saldo_caixa': 'delta_saldo',
+    'receita_mensal': 'delta_receita',
+    'valuation': 'delta_valuation',
+    'funcionarios': 'delta_funcionarios',
+}
+
+
+@dataclass(frozen=True)
+class EstadoTurno:
+    """Estado da startup ao fim de um turno."""
+    turno: int
+    saldo_caixa: Decimal
+    receita_mensal: Decimal
+    valuation: Decimal
+    funcionarios: int
+
+    @classmethod
+    def de_startup(cls, startup):
+        return cls(turno=startup.turno_atual, **{campo: getattr(startup, campo) for campo in CAMPOS_ESTADO})
+
+    def deltas_ate(self, startup):
+        """Variação entre este estado e o estado atual da `startup`, nos campos do histórico."""
+        return {
+            delta: getattr(startup, campo) - getattr(self, campo)
+            for campo, delta in CAMPOS_DELTA.items()
+        }
+
+    def snapshot(self, partida):
+        return SnapshotStartup(
+            partida=partida,
+            turno=self.turno,
+            **{campo: getattr(self, campo) for campo in CAMPOS_ESTADO}
+        )
+
+
+def precisa_snapshot(turno):
+    return turno % INTERVALO_SNAPSHOT == 0
+
+
+def _somar_deltas(partida_id, **filtro_turno):
+    totais = HistoricoDecisao.objects.filter(partida_id=partida_id, **filtro_turno).aggregate(
+        ultimo_turno=Max('turno'),
+        **{campo: Sum(delta) for campo, delta in CAMPOS_DELTA.items()}
+    )
+    return {campo: total or 0 for campo, total in totais.items()}
+
+
+def replay(partida, until_turno):
+    """
+    Estado da startup da `partida` ao fim do turno `until_turno`.
+
+    Lança ValueError para turnos fora da partida e `Startup.DoesNotExist`
+    se a partida não tem startup.
+    """
+    partida_id = getattr(partida, 'pk', partida)
+    if until_turno < 1:
+        raise ValueError('O turno deve ser maior ou igual a 1.')
+
+    snapshot = (
+        SnapshotStartup.objects
+        .filter(partida_id=partida_id, turno__lte=until_turno)
+        .order_by('-turno')
+        .first()
+    )
+    if snapshot is not None:
+        base = EstadoTurno(turno=snapshot.turno, **{campo: getattr(snapshot, campo) for campo in CAMPOS_ESTADO})
+        if base.turno == until_turno:
+            return base
+        deltas = _somar_deltas(partida_id, turno__gt=base.turno, turno__lte=until_turno)
+        if deltas['ultimo_turno'] != until_turno:
+            raise ValueError(f'A partida não chegou ao turno {until_turno}.')
+        sinal = 1
+    else:
+        base = EstadoTurno.de_startup(Startup.objects.get(pk=partida_id))
+        if until_turno > base.turno:
+            raise ValueError(f'A partida está no turno {base.turno}.')
+        deltas = _somar_deltas(partida_id, turno__gt=until_turno)
+        sinal = -1
+
+    return replace(
+        base,
+        turno=until_turno,
+        **{campo: getattr(base, campo) + sinal * deltas[campo] for campo in CAMPOS_ESTADO}
+    )
@@ -0,0 +1,63 @@
+"""
+Indicadores agregados das turmas de um educador.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db.models import Avg, Count, Max, Q
+
+from core.models import User
+
+
+@dataclass(frozen=True)
+class TurmaStats:
+    """Alunos, startups ativas, valuation e caixa de uma turma."""
+    turma: object
+    total_alunos: int = 0
+    startups_ativas: int = 0
+    media_valuation: Decimal = Decimal('0')
+    maior_valuation: Decimal = Decimal('0')
+    media_caixa: Decimal = Decimal('0')
+
+    @classmethod
+    def para_turmas(cls, turmas):
+        """
+        Calcula os indicadores de todas as `turmas` com uma única consulta
+        agrupada pela turma dos usuários. Retorna a lista na ordem recebida.
+        """
+        turmas = list(turmas)
+        if not turmas:
+            return []
+
+        partida_ativa = Q(partidas__ativa=True)
+        linhas = (
+            User.objects
+            .filter(turma__in=[turma.pk for turma in turmas])
+            .values('turma')
+            .annotate(
+                total_alunos=Count(
+                    'id',
+                    filter=Q(categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO),
+                    distinct=True,
+                ),
+                startups_ativas=Count('partidas__startup', filter=partida_ativa),
+                media_valuation=Avg('partidas__startup__valuation', filter=partida_ativa),
+                maior_valuation=Max('partidas__startup__valuation', filter=partida_ativa),
+                media_caixa=Avg('partidas__startup__saldo_caixa', filter=partida_ativa),
+            )
+            .order_by()
+        )
+        por_turma = {linha.pop('turma'): linha for linha in linhas}
+
+        estatisticas = []
+        for turma in turmas:
+            linha = por_turma.get(turma.pk, {})
+            estatisticas.append(cls(
+                turma=turma,
+                total_alunos=linha.get('total_alunos') or 0,
+                startups_ativas=linha.get('startups_ativas') or 0,
+                media_valuation=linha.get('media_valuation') or 0,
+                maior_valuation=linha.get('maior_valuation') or 0,
+                media_caixa=linha.get('media_caixa') or 0,
+            ))
+        return estatisticas
@@ -0,0 +1,353 @@
+"""
+Motor de turnos do jogo.
+
+Cada turno roda em uma única transação: a startup é travada com
+select_for_update, os efeitos da decisão são gravados com expressões F(),
+o evento aleatório do turno (se houver) é sorteado e aplicado no mesmo UPDATE,
+o histórico é registrado com as variações do turno (e um snapshot periódico
+para o replay), a linha da série de métricas é gravada, as conquistas são
+verificadas e a linha do ranking e as estatísticas do jogador são
+atualizadas antes do commit.
+
+`simulate_turns` aplica uma lista de decisões na mesma transação, para
+jogadores automáticos e testes de carga que não precisam de uma página
+renderizada a cada turno. `iniciar_partida` cria o turno 1 de uma partida
+nova, também em uma transação e sem os sinais de cada modelo.
+"""
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from core.models import (
+    ConquistaDesbloqueada, EventoPartida, HistoricoDecisao, Partida, SnapshotStartup, Startup, StartupMetricaTurno,
+)
+from core.rng import PartidaRNG
+from core.services.conquistas import (
+    TITULO_PRIMEIRA_SIMULACAO, obter_catalogo_conquistas, verificar_conquistas_partida, verificar_conquistas_progesso,
+)
+from core.services.decisoes import EFEITO_NEUTRO, EfeitoDecisao, obter_tabela_decisoes
+from core.services.estatisticas import atualizar_recordes, registrar_partida
+from core.services.eventos import obter_tabela_eventos
+from core.services.metricas import metrica_de
+from core.services.ranking import criar_entrada, registrar_turno
+from core.services.replay import EstadoTurno, precisa_snapshot
+
+# Valuation que encerra a partida com vitória
+META_VITORIA = Decimal('1000000.00')
+
+# Caixa de uma partida nova
+SALDO_INICIAL = Decimal('30000.00')
+
+# Máximo de decisões aceitas em uma simulação em lote
+LIMITE_TURNOS_SIMULACAO = 500
+
+
+class TurnoInvalido(Exception):
+    """Regra de negócio impediu a aplicação do turno."""
+
+
+class PartidaEncerrada(TurnoInvalido):
+    """A partida já terminou (Game Over ou Vitória)."""
+
+
+class DecisaoIndisponivel(TurnoInvalido):
+    """As pré-condições da decisão não são atendidas neste turno."""
+
+
+class SaldoInsuficiente(TurnoInvalido):
+    """O caixa disponível não cobre o custo da decisão."""
+
+    def __init__(self, disponivel, necessario):
+        self.disponivel = disponivel
+        self.necessario = necessario
+        super().__init__(f'Saldo insuficiente: {disponivel} < {necessario}')
+
+
+@dataclass
+class ResultadoTurno:
+    startup: Startup
+    efeito: EfeitoDecisao
+    novas_conquistas: list = field(default_factory=list)
+    duplicado: bool = False
+    evento: object = None
+
+
+@dataclass
+class ResultadoSimulacao:
+    startup: Startup
+    turnos_aplicados: int
+    partida_ativa: bool
+    novas_conquistas: list = field(default_factory=list)
+    eventos: list = field(default_factory=list)
+
+
+def partida_terminou(startup):
+    """Game Over (caixa zerado) ou Vitória (valuation na meta)."""
+    return startup.saldo_caixa <= 0 or startup.valuation >= META_VITORIA
+
+
+def simulate_turns(partida, decisoes):
+    """Atalho para `TurnEngine(partida).simular(decisoes)`."""
+    return TurnEngine(partida).simular(decisoes)
+
+
+class TurnEngine:
+    """Aplica decisões de uma partida, um turno por chamada."""
+
+    def __init__(self, partida):
+        self.partida = partida
+
+    def jogar(self, decisao, chave_idempotencia=None):
+        """
+        Executa um turno com a decisão informada.
+
+        Envios com uma `chave_idempotencia` já registrada nesta partida são
+        descartados e retornam `duplicado=True` sem alterar nada. Lança
+        `PartidaEncerrada`, `DecisaoIndisponivel`, `SaldoInsuficiente` ou
+        `Startup.DoesNotExist`.
+        """
+        try:
+            with transaction.atomic():
+                return self._jogar(decisao, chave_idempotencia)
+        except IntegrityError:
+            # Envio concorrente com a mesma chave venceu a corrida
+            if chave_idempotencia and self._ja_registrado(chave_idempotencia):
+                startup = Startup.objects.get(pk=self.partida.pk)
+                return ResultadoTurno(startup=startup, efeito=EFEITO_NEUTRO, duplicado=True)
+            raise
+
+    def _ja_registrado(self, chave_idempotencia):
+        return HistoricoDecisao.objects.filter(
+            partida_id=self.partida.pk,
+            chave_idempotencia=chave_idempotencia,
+        ).exists()
+
+    def _jogar(self, decisao, chave_idempotencia):
+        startup = (
+            Startup.objects
+            .select_for_update()
+            .select_related('partida')
+            .get(pk=self.partida.pk)
+        )
+        partida = startup.partida
+
+        if not partida.ativa:
+            raise PartidaEncerrada()
+
+        if chave_idempotencia and self._ja_registrado(chave_idempotencia):
+            return ResultadoTurno(startup=startup, efeito=EFEITO_NEUTRO, duplicado=True)
+
+        saldo_anterior = startup.saldo_caixa
+        antes = EstadoTurno.de_startup(startup)
+        efeito = obter_tabela_decisoes().efeito(decisao)
+        self._validar(startup, efeito)
+
+        turno = startup.turno_atual + 1
+        evento = obter_tabela_eventos().sortear(turno, PartidaRNG.da_partida(partida).eventos(turno))
+
+        # Efeito aplicado como um único delta, sem ramificar por decisão
+        valores = {
+            'saldo_caixa': F('saldo_caixa') + F('receita_mensal') - efeito.custo,
+            'receita_mensal': F('receita_mensal') + efeito.receita,
+            'valuation': F('valuation') + efeito.valuation,
+            'funcionarios': F('funcionarios') + efeito.funcionarios,
+            'turno_atual': F('turno_atual') + 1,
+            'versao': F('versao') + 1,
+        }
+        if evento:
+            valores['saldo_caixa'] += evento.saldo
+            valores['receita_mensal'] = Greatest(valores['receita_mensal'] + evento.receita, Value(Decimal('0.00')))
+            valores['valuation'] = Greatest(valores['valuation'] + evento.valuation, Value(Decimal('0.00')))
+            valores['funcionarios'] = Greatest(valores['funcionarios'] + evento.funcionarios, Value(0))
+        Startup.objects.filter(pk=startup.pk).update(**valores)
+
+        # A linha está travada: os valores gravados são conhecidos
+        self._aplicar(startup, efeito)
+        if evento:
+            evento.aplicar(startup)
+            EventoPartida.objects.bulk_create([self._ocorrencia(partida, evento, turno)])
+
+        HistoricoDecisao.objects.create(
+            partida=partida,
+            decisao_tomada=decisao,
+            turno=startup.turno_atual,
+            chave_idempotencia=chave_idempotencia or None,
+            **antes.deltas_ate(startup)
+        )
+        metrica_de(startup).save()
+        if precisa_snapshot(startup.turno_atual):
+            EstadoTurno.de_startup(startup).snapshot(partida).save()
+
+        verificar_conquistas_partida(partida)
+        novas_conquistas = verificar_conquistas_progesso(
+            partida.usuario_id,
+            partida_especifica=partida,
+            saldo_anterior=saldo_anterior,
+        )
+        registrar_turno(startup, novas_conquistas)
+        atualizar_recordes(partida.usuario_id, startup, novas_conquistas)
+
+        return ResultadoTurno(
+            startup=startup,
+            efeito=efeito,
+            novas_conquistas=novas_conquistas,
+            evento=evento,
+        )
+
+    def simular(self, decisoes):
+        """
+        Aplica várias decisões em sequência numa única transação.
+
+        O estado é calculado em memória, gravado com um UPDATE e o histórico
+        e os eventos sorteados com bulk_create; as conquistas são verificadas
+        uma vez no final.
+        A simulação para quando a partida termina. Se alguma decisão for
+        inválida nada é gravado e a exceção traz o atributo `indice`.
+        """
+        decisoes = list(decisoes)
+        if len(decisoes) > LIMITE_TURNOS_SIMULACAO:
+            raise ValueError(f'No máximo {LIMITE_TURNOS_SIMULACAO} decisões por simulação.')
+
+        with transaction.atomic():
+            startup = (
+                Startup.objects
+                .select_for_update()
+                .select_related('partida')
+                .get(pk=self.partida.pk)
+            )
+            partida = startup.partida
+
+            if not partida.ativa:
+                raise PartidaEncerrada()
+
+            tabela = obter_tabela_decisoes()
+            eventos = obter_tabela_eventos()
+            rng = PartidaRNG.da_partida(partida)
+            saldo_inicial = saldo_maximo = startup.saldo_caixa
+            historicos = []
+            ocorrencias = []
+            sorteados = []
+            snapshots = []
+            metricas = []
+            for indice, decisao in enumerate(decisoes):
+                if partida_terminou(startup):
+                    break
+                efeito = tabela.efeito(decisao)
+                try:
+                    self._validar(startup, efeito)
+                except TurnoInvalido as erro:
+                    erro.indice = indice
+                    raise
+                antes = EstadoTurno.de_startup(startup)
+                self._aplicar(startup, efeito)
+                evento = eventos.sortear(startup.turno_atual, rng.eventos(startup.turno_atual))
+                if evento:
+                    evento.aplicar(startup)
+                    ocorrencias.append(self._ocorrencia(partida, evento, startup.turno_atual))
+                    sorteados.append(evento)
+                saldo_maximo = max(saldo_maximo, startup.saldo_caixa)
+                historicos.append(HistoricoDecisao(
+                    partida=partida,
+                    decisao_tomada=decisao,
+                    turno=startup.turno_atual,
+                    **antes.deltas_ate(startup)
+                ))
+                metricas.append(metrica_de(startup))
+                if precisa_snapshot(startup.turno_atual):
+                    snapshots.append(EstadoTurno.de_startup(startup).snapshot(partida))
+
+            if not historicos:
+                return ResultadoSimulacao(startup=startup, turnos_aplicados=0, partida_ativa=partida.ativa)
+
+            Startup.objects.filter(pk=startup.pk).update(
+                saldo_caixa=startup.saldo_caixa,
+                receita_mensal=startup.receita_mensal,
+                valuation=startup.valuation,
+                funcionarios=startup.funcionarios,
+                turno_atual=startup.turno_atual,
+                versao=startup.versao,
+            )
+            HistoricoDecisao.objects.bulk_create(historicos)
+            StartupMetricaTurno.objects.bulk_create(metricas)
+            if ocorrencias:
+                EventoPartida.objects.bulk_create(ocorrencias)
+            if snapshots:
+                SnapshotStartup.objects.bulk_create(snapshots)
+
+            if partida_terminou(startup):
+                partida.ativa = False
+                partida.save(update_fields=['ativa'])
+
+            verificar_conquistas_partida(partida)
+            novas_conquistas = verificar_conquistas_progesso(
+                partida.usuario_id,
+                partida_especifica=partida,
+                saldo_anterior=saldo_inicial,
+                saldo_maximo=saldo_maximo,
+            )
+            registrar_turno(startup, novas_conquistas)
+            atualizar_recordes(partida.usuario_id, startup, novas_conquistas, saldo_maximo=saldo_maximo)
+
+        return ResultadoSimulacao(
+            startup=startup,
+            turnos_aplicados=len(historicos),
+            partida_ativa=partida.ativa,
+            novas_conquistas=novas_conquistas,
+            eventos=sorteados,
+        )
+
+    @staticmethod
+    def _ocorrencia(partida, evento, turno):
+        # Os impactos já entram no turno em que o evento ocorre
+        return EventoPartida(partida=partida, evento_id=evento.id, turno=turno, resolvido=True)
+
+    @staticmethod
+    def _validar(startup, efeito):
+        if not efeito.disponivel_para(startup):
+            raise DecisaoIndisponivel()
+        # Decisões que cortam receita, equipe ou valuation não podem deixá-los
+        # negativos (restrições da Startup); sem margem, a decisão não está disponível
+        if (
+            startup.receita_mensal + efeito.receita < 0
+            or startup.funcionarios + efeito.funcionarios < 0
+            or startup.valuation + efeito.valuation < 0
+        ):
+            raise DecisaoIndisponivel('A decisão deixaria receita, equipe ou valuation negativos.')
+        # Fluxo de caixa: saldo anterior + receita do turno
+        disponivel = startup.saldo_caixa + startup.receita_mensal
+        if disponivel < efeito.custo:
+            raise SaldoInsuficiente(disponivel, efeito.custo)
+
+    @staticmethod
+    def _aplicar(startup, efeito):
+        startup.saldo_caixa = startup.saldo_caixa + startup.receita_mensal - efeito.custo
+        startup.receita_mensal += efeito.receita
+        startup.valuation += efeito.valuation
+        startup.funcionarios += efeito.funcionarios
+        startup.turno_atual += 1
+        startup.versao += 1
+
+
+def iniciar_partida(usuario, nome_empresa, saldo_caixa=SALDO_INICIAL):
+    """
+    Cria uma partida no turno 1: startup, primeiro ponto da série de
+    métricas e a conquista da primeira simulação, em uma transação.
+
+    Tudo é gravado com bulk_create, então os sinais de cada modelo não
+    rodam: a linha do ranking e as estatísticas do jogador são escritas uma
+    vez cada, já com os valores finais.
+    """
+    conquista = obter_catalogo_conquistas().por_titulo[TITULO_PRIMEIRA_SIMULACAO]
+    with transaction.atomic():
+        [partida] = Partida.objects.bulk_create([Partida(usuario=usuario, nome_empresa=nome_empresa)])
+        [startup] = Startup.objects.bulk_create([Startup(partida=partida, saldo_caixa=saldo_caixa)])
+        StartupMetricaTurno.objects.bulk_create([metrica_de(startup)])
+        ConquistaDesbloqueada.objects.bulk_create([
+            ConquistaDesbloqueada(partida=partida, conquista=conquista, turno=startup.turno_atual),
+        ])
+        criar_entrada(startup, [conquista])
+        registrar_partida(partida, startup, [conquista])
+    return partida
@@ -0,0 +1,123 @@
+"""
+Receptores de sinais do app core.
+"""
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Conquista, ConquistaDesbloqueada, Decisao, Evento, LeaderboardEntry, Partida, Startup, Turma, User
+from core.services import estatisticas, ranking
+from core.services.conquistas import catalogo_conquistas
+from core.services.decisoes import tabela_decisoes
+from core.services.eventos import tabela_eventos
+
+
+def _invalidar(catalogo, using):
+    catalogo.invalidar()
+    # Outra thread pode ter recarregado o catálogo antes do commit
+    transaction.on_commit(catalogo.invalidar, using=using)
+
+
+def _nova_versao_startup(partida_id):
+    # Muda o ETag das páginas da partida e do jogador
+    Startup.objects.filter(pk=partida_id).update(versao=F('versao') + 1)
+
+
+@receiver(post_save, sender=Conquista)
+@receiver(post_delete, sender=Conquista)
+def invalidar_catalogo_conquistas(sender, using, **kwargs):
+    """Descarta o catálogo de conquistas em memória quando uma conquista muda."""
+    _invalidar(catalogo_conquistas, using)
+
+
+@receiver(post_save, sender=Decisao)
+@receiver(post_delete, sender=Decisao)
+def invalidar_tabela_decisoes(sender, using, **kwargs):
+    """Descarta a tabela de decisões compilada quando o catálogo é editado."""
+    _invalidar(tabela_decisoes, using)
+
+
+@receiver(post_save, sender=Evento)
+@receiver(post_delete, sender=Evento)
+def invalidar_tabela_eventos(sender, using, **kwargs):
+    """Descarta a tabela de probabilidades quando um evento é editado."""
+    _invalidar(tabela_eventos, using)
+
+
+@receiver(post_save, sender=Startup)
+def sincronizar_ranking_startup(sender, instance, raw=False, **kwargs):
+    """Escritas via ORM na startup (fora do TurnEngine) refletem no ranking."""
+    if not raw:
+        ranking.sincronizar_entrada(instance.pk)
+
+
+@receiver(post_delete, sender=Startup)
+def remover_ranking_startup(sender, instance, **kwargs):
+    LeaderboardEntry.objects.filter(partida_id=instance.pk).delete()
+
+
+@receiver(post_save, sender=Partida)
+def sincronizar_ranking_partida(sender, instance, created, raw=False, **kwargs):
+    """Partidas encerradas saem do ranking; a criação espera pela startup."""
+    if not created and not raw:
+        _nova_versao_startup(instance.pk)
+        ranking.sincronizar_entrada(instance.pk)
+
+
+@receiver(post_save, sender=ConquistaDesbloqueada)
+@receiver(post_delete, sender=ConquistaDesbloqueada)
+def recontar_conquistas_ranking(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _nova_versao_startup(instance.partida_id)
+        ranking.recontar_conquistas(instance.partida_id)
+
+
+@receiver(post_save, sender=Partida)
+@receiver(post_delete, sender=Partida)
+def atualizar_stats_partida(sender, instance, created=False, raw=False, signal=None, **kwargs):
+    """Partidas novas somam um; encerramentos e exclusões recalculam o resumo."""
+    if raw:
+        return
+    if created:
+        estatisticas.registrar_partida(instance)
+    else:
+        estatisticas.recalcular_stats(instance.usuario_id, criar=signal is post_save)
+
+
+@receiver(post_save, sender=Startup)
+def atualizar_stats_startup(sender, instance, raw=False, **kwargs):
+    if not raw:
+        estatisticas.atualizar_recordes(instance.partida.usuario_id, instance)
+
+
+@receiver(post_save, sender=ConquistaDesbloqueada)
+@receiver(post_delete, sender=ConquistaDesbloqueada)
+def atualizar_stats_conquista(sender, instance, created=False, raw=False, signal=None, **kwargs):
+    if raw:
+        return
+    usuario_id = instance.partida.usuario_id
+    if created:
+        estatisticas.registrar_conquista(usuario_id)
+    elif signal is post_delete:
+        estatisticas.recalcular_stats(usuario_id, criar=False)
+
+
+@receiver(post_save, sender=User)
+def atualizar_usuario_ranking(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Mudanças de categoria, turma ou região do usuário."""
+    if created or raw:
+        return
+    # O login só grava last_login
+    if update_fields is not None and not set(update_fields) & set(ranking.CAMPOS_USUARIO):
+        return
+    ranking.atualizar_usuario(instance)
+
+
+@receiver(post_save, sender=Turma)
+def vincular_alunos_turma(sender, instance, created, raw=False, **kwargs):
+    """Usuários que já informaram o código de uma turma nova passam a apontar para ela."""
+    if not created or raw:
+        return
+    User.objects.filter(codigo_turma=instance.codigo, turma__isnull=True).update(turma=instance)
+    LeaderboardEntry.objects.filter(codigo_turma=instance.codigo, turma__isnull=True).update(turma=instance)
@@ -12,9 +12,12 @@ urlpatterns = [
     path('nova/', views.nova_partida, name='nova_partida'), 
     path('salvar/<int:partida_id>/', views.salvar_jogo, name='salvar_jogo'), 
     path('carregar/<int:partida_id>/', views.carregar_jogo, name='carregar_jogo'),
+    path('simular/<int:partida_id>/', views.simular_turnos, name='simular_turnos'),
     path('perfil/', views.perfil, name='perfil'),
     path('historico/', views.historico, name='historico'),
+    path('historico/exportar/', views.exportar_historico, name='exportar_historico'),
     path('metricas/<int:partida_id>/', views.metricas, name='metricas'),
+    path('metricas/<int:partida_id>/serie/', views.metricas_serie, name='metricas_serie'),
     path('conquistas/', views.conquistas, name='conquistas'),
     path('ranking/', views.ranking, name='ranking'),
     path('perfil/editar/', views.editar_perfil, name='editar_perfil'),
@@ -23,7 +26,12 @@ urlpatterns = [
     path('educador/perfil/editar/', views.educador_editar_perfil, name='educador_editar_perfil'),
     path('criar-turma/', views.criar_turma, name='criar_turma'),
     path('turma/<str:codigo_turma>/', views.analise_turma, name='analise_turma'),
+    path('turma/<str:codigo_turma>/exportar/', views.exportar_turma, name='exportar_turma'),
+    path('turma/<str:codigo_turma>/importar/', views.importar_alunos, name='importar_alunos'),
+    path('turma/<str:codigo_turma>/convites/', views.reenviar_convites, name='reenviar_convites'),
+    path('convite/<uidb64>/<token>/', views.AceitarConviteView.as_view(), name='aceitar_convite'),
     path('ranking-turmas/', views.ranking_turmas, name='ranking_turmas'),
     path('metricas-turmas/', views.metricas_turmas, name='metricas_turmas'),
+    path('metricas-turmas/exportar/', views.exportar_turmas, name='exportar_turmas'),
     path('gerar-codigo-turma/', views.gerar_codigo_turma, name='gerar_codigo_turma'),
 ]
\ No newline at end of file
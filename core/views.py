@@ -1,18 +1,40 @@
 from .forms import CadastroUsuarioForm
-from .permissions import estudante_required, educador_required, pode_salvar_partida, pode_acessar_relatorios, pode_acessar_ranking
-from django.shortcuts import render, redirect, get_object_or_404
+from .permissions import estudante_required, educador_required, pode_salvar_partida, pode_acessar_relatorios, pode_acessar_ranking, usuario_async
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.utils import timezone
-from django.contrib.auth.views import LoginView
+from django.contrib.auth.views import LoginView, PasswordResetConfirmView
 from django.contrib.auth import login
 from django.contrib import messages
 from django.contrib.messages import get_messages
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse, reverse_lazy
+from django.views.decorators.http import require_POST
 from decimal import Decimal, InvalidOperation
-from core.services.conquistas import verificar_conquistas_partida, verificar_conquistas_progesso
-from .models import User, Partida, Startup, HistoricoDecisao, Turma
+from functools import wraps
+import json
+import uuid
+from core.query_budget import query_budget
+from core.services.codigos import alocar_codigo_turma, criar_turma as criar_turma_com_codigo
+from core.services.decisoes import obter_tabela_decisoes
+from core.services.estatisticas import obter_stats
+from core.services.etags import etag_jogador, etag_jogo, etag_ranking, pagina_condicional
+from core.services.exportacao import FORMATOS, FormatoIndisponivel, exportar, linhas_csv
+from core.services.matriculas import (
+    convite, convites_pendentes, importar_alunos as importar_alunos_da_lista, ler_csv, token_convite,
+)
+from core.services.metricas import PONTOS_PADRAO, serie_metricas
+from core.services.ranking import entradas_visiveis, opcoes_filtros
+from core.services.turmas import TurmaStats
+from core.services.turno import (
+    TurnEngine, TurnoInvalido, PartidaEncerrada, DecisaoIndisponivel, SaldoInsuficiente,
+    META_VITORIA, iniciar_partida, simulate_turns,
+)
+from .models import User, Partida, Startup, HistoricoDecisao, Turma, LeaderboardEntry
+from django.db import IntegrityError, transaction
 from django.db.models import Prefetch
 from .forms import EditarPerfilForm
-from django.db.models import Avg, Max, Count, Sum
+from django.db.models import Avg, Max, Count, Q, Sum
 from django.core.exceptions import PermissionDenied
 
 def formatar_moeda_br(valor):
@@ -53,11 +75,19 @@ def registro_view(request):
     if request.method == 'POST':
         form = CadastroUsuarioForm(request.POST)
         if form.is_valid():
-            user = form.save()
-            login(request, user)
-            messages.success(request, 'Conta criada com sucesso!')
-            
-            return redirect('redirect_handler') 
+            try:
+                with transaction.atomic():
+                    user = form.save()
+            except IntegrityError:
+                # Outro cadastro com os mesmos dados entrou entre a validação e o INSERT
+                form.verificar_conflitos()
+                if not form.errors:
+                    form.add_error(None, 'Não foi possível concluir o cadastro. Tente novamente.')
+            else:
+                login(request, user)
+                messages.success(request, 'Conta criada com sucesso!')
+
+                return redirect('redirect_handler') 
     else:
         form = CadastroUsuarioForm()
     
@@ -67,6 +97,7 @@ from .models import ConquistaDesbloqueada, Partida, Startup, HistoricoDecisao
 from django.db.models import Prefetch
 
 @login_required 
+@query_budget(3)
 def dashboard(request):
     """
     Lista as partidas existentes do usuário, ordenadas da mais recente.
@@ -96,123 +127,127 @@ def dashboard(request):
 
 @login_required
 @pode_salvar_partida
+@query_budget(10)
 def nova_partida(request):
     """
     Processa o formulário de criação de nova partida e inicializa a startup.
     """
     if request.method == 'POST':
         nome_empresa = request.POST.get('nome_empresa', 'Nova Startup')
-        # Saldo inicial fixo: R$ 30.000,00
-        saldo_inicial = Decimal('30000.00')
-        
-        partida = Partida.objects.create(
-            usuario=request.user,
-            nome_empresa=nome_empresa,
-            data_inicio=timezone.now(),
-        )
-        
-        Startup.objects.create(partida=partida, saldo_caixa=saldo_inicial)
-        
-        # Verifica e registra conquistas que dependem da criação da partida
-        verificar_conquistas_partida(partida)
-
+        # Saldo inicial fixo (R$ 30.000,00), primeiro ponto das métricas e conquista inicial
+        partida = iniciar_partida(request.user, nome_empresa)
         return redirect('carregar_jogo', partida_id=partida.id)
     
     return render(request, 'nova_partida.html')
 @login_required
 @pode_salvar_partida
+@query_budget(18)
 def salvar_jogo(request, partida_id):
     """
     Lógica crítica: Recebe os dados do jogo (POST) e persiste no BDR.
-    Valida decisões e aplica efeitos no caixa e métricas.
+    O turno é aplicado pelo TurnEngine em uma única transação; envios
+    repetidos do mesmo formulário são descartados.
     """
     if request.method == 'POST':
-        partida = get_object_or_404(
-            Partida.objects.select_related('startup'),
-            id=partida_id,
-            usuario=request.user
-        )
+        partida = get_object_or_404(Partida, id=partida_id, usuario=request.user)
+        
+        decisao_tomada = request.POST.get('decisao', 'Decisão não especificada.')
+        chave_turno = request.POST.get('chave_turno') or None
         
         try:
-            startup = partida.startup
-            
-            # Impede novos envios se a partida já foi finalizada (Game Over ou Vitória)
-            if not partida.ativa:
-                messages.error(request, 'Partida encerrada. Não é possível realizar novas ações.')
-                return redirect('carregar_jogo', partida_id=partida.id)
-            
-            decisao_tomada = request.POST.get('decisao', 'Decisão não especificada.')
-            
-            # Cálculo de Fluxo de Caixa (Saldo anterior + Receita do turno)
-            receita_atual = Decimal(str(startup.receita_mensal))
-            saldo_atual = Decimal(str(startup.saldo_caixa)) + receita_atual
-            
-            # Dicionário de Custos
-            custos_decisoes = {
-                'Investir em Marketing Agressivo': Decimal('5000.00'),
-                'Contratar Engenheiro Sênior': Decimal('8000.00'),
-                'Não fazer nada (Economizar)': Decimal('0.00'),
-            }
-            
-            custo = custos_decisoes.get(decisao_tomada, Decimal('0.00'))
-            
-            # Validar se tem saldo suficiente antes de processar
-            if saldo_atual < custo:
-                messages.error(
-                    request, 
-                    f'Saldo insuficiente. Disponível: {formatar_moeda_br(saldo_atual)} | Necessário: {formatar_moeda_br(custo)}'
-                )
-                return redirect('carregar_jogo', partida_id=partida.id)
-            
-            # Aplicar custos
-            novo_saldo = saldo_atual - custo
-            
-            # Efeitos das Decisões
-            if decisao_tomada == 'Investir em Marketing Agressivo':
-                startup.receita_mensal += Decimal('3000.00')
-                messages.success(request, 'Investimento em Marketing concluído. Receita aumentada.')
-                
-            elif decisao_tomada == 'Contratar Engenheiro Sênior':
-                startup.valuation += Decimal('25000.00')
-                startup.receita_mensal += Decimal('2000.00')
-                startup.funcionarios += 1
-                messages.success(request, 'Novo Engenheiro Sênior integrado à equipe.')
-                
-            elif decisao_tomada == 'Não fazer nada (Economizar)':
-                messages.info(request, 'Turno finalizado com foco em preservação de capital.')
-            
-            # Persistência de Dados
-            startup.saldo_caixa = novo_saldo
-            startup.turno_atual += 1 
-            startup.save()
-            
-            # Registrar no Histórico
-            HistoricoDecisao.objects.create(
-                partida=partida,
-                decisao_tomada=decisao_tomada,
-                turno=startup.turno_atual
-            )
-
-            # Sistema de Conquistas
-            verificar_conquistas_partida(partida)
-            novas_conquistas = verificar_conquistas_progesso(request.user, partida_especifica=partida)
-            
-            # Adicionar conquistas desbloqueadas às mensagens
-            for conquista in novas_conquistas:
-                messages.success(
-                    request, 
-                    f'🏆 Conquista Desbloqueada: {conquista.titulo}! +{conquista.pontos} pontos',
-                    extra_tags='conquista'
-                )
-            
+            resultado = TurnEngine(partida).jogar(decisao_tomada, chave_idempotencia=chave_turno)
         except Startup.DoesNotExist:
             messages.error(request, 'Erro técnico: Startup não vinculada a esta partida.')
             return redirect('dashboard')
+        except PartidaEncerrada:
+            # Impede novos envios se a partida já foi finalizada (Game Over ou Vitória)
+            messages.error(request, 'Partida encerrada. Não é possível realizar novas ações.')
+            return redirect('carregar_jogo', partida_id=partida.id)
+        except DecisaoIndisponivel:
+            messages.error(request, 'Esta decisão ainda não está disponível para a sua startup.')
+            return redirect('carregar_jogo', partida_id=partida.id)
+        except SaldoInsuficiente as erro:
+            messages.error(
+                request, 
+                f'Saldo insuficiente. Disponível: {formatar_moeda_br(erro.disponivel)} | Necessário: {formatar_moeda_br(erro.necessario)}'
+            )
+            return redirect('carregar_jogo', partida_id=partida.id)
+        
+        if resultado.efeito.mensagem:
+            messages.add_message(request, resultado.efeito.nivel, resultado.efeito.mensagem)
+
+        if resultado.evento:
+            messages.info(
+                request,
+                f'⚡ Evento: {resultado.evento.titulo}. {resultado.evento.descricao}',
+                extra_tags='evento'
+            )
+        
+        # Adicionar conquistas desbloqueadas às mensagens
+        for conquista in resultado.novas_conquistas:
+            messages.success(
+                request, 
+                f'🏆 Conquista Desbloqueada: {conquista.titulo}! +{conquista.pontos} pontos',
+                extra_tags='conquista'
+            )
     
     return redirect('carregar_jogo', partida_id=partida_id)
 
+@login_required
+@pode_salvar_partida
+@require_POST
+@query_budget(15)
+def simular_turnos(request, partida_id):
+    """
+    Aplica uma lista de decisões em uma única requisição, para jogadores
+    automáticos e testes de carga.
+
+    Corpo JSON: {"decisoes": ["Título da decisão", ...]}. Responde com o
+    estado final da startup, as conquistas desbloqueadas e os eventos
+    sorteados.
+    """
+    partida = get_object_or_404(Partida, id=partida_id, usuario=request.user)
+
+    try:
+        decisoes = json.loads(request.body).get('decisoes')
+    except (ValueError, AttributeError):
+        decisoes = None
+    if not isinstance(decisoes, list) or not all(isinstance(d, str) for d in decisoes):
+        return JsonResponse({'erro': 'Envie {"decisoes": [...]} com os títulos das decisões.'}, status=400)
+
+    try:
+        resultado = simulate_turns(partida, decisoes)
+    except Startup.DoesNotExist:
+        return JsonResponse({'erro': 'Startup não vinculada a esta partida.'}, status=404)
+    except PartidaEncerrada:
+        return JsonResponse({'erro': 'Partida encerrada.'}, status=409)
+    except TurnoInvalido as erro:
+        return JsonResponse({'erro': str(erro) or 'Decisão indisponível.', 'indice': erro.indice}, status=400)
+    except ValueError as erro:
+        return JsonResponse({'erro': str(erro)}, status=400)
+
+    startup = resultado.startup
+    return JsonResponse({
+        'turnos_aplicados': resultado.turnos_aplicados,
+        'partida_ativa': resultado.partida_ativa,
+        'startup': {
+            'saldo_caixa': str(startup.saldo_caixa),
+            'receita_mensal': str(startup.receita_mensal),
+            'valuation': str(startup.valuation),
+            'funcionarios': startup.funcionarios,
+            'turno_atual': startup.turno_atual,
+        },
+        'conquistas': [
+            {'titulo': conquista.titulo, 'pontos': conquista.pontos}
+            for conquista in resultado.novas_conquistas
+        ],
+        'eventos': [evento.titulo for evento in resultado.eventos],
+    })
+
 @login_required
 @estudante_required
+@query_budget(9)
+@pagina_condicional(etag_jogo)
 def carregar_jogo(request, partida_id):
     partida = get_object_or_404(
         Partida.objects.select_related('startup').prefetch_related(
@@ -228,8 +263,7 @@ def carregar_jogo(request, partida_id):
   
     game_over = startup_estado.saldo_caixa <= 0
     
-    meta_vitoria = Decimal('1000000.00')
-    vitoria = startup_estado.valuation >= meta_vitoria
+    vitoria = startup_estado.valuation >= META_VITORIA
 
     
     if (game_over or vitoria) and partida.ativa:
@@ -242,11 +276,16 @@ def carregar_jogo(request, partida_id):
         'historico_decisoes': historico_decisoes,
         'game_over': game_over, 
         'vitoria': vitoria,     
+        'decisoes': obter_tabela_decisoes().disponiveis_para(startup_estado),
+        # Chave de idempotência do formulário do próximo turno
+        'chave_turno': uuid.uuid4().hex,
     }
     
     return render(request, 'jogo.html', context)
 
 @login_required
+@query_budget(4)
+@pagina_condicional(etag_jogador)
 def perfil(request):
     """
     Exibe o perfil do usuário com estatísticas.
@@ -260,41 +299,24 @@ def perfil(request):
         )
         return redirect('dashboard')
     
-    from django.db.models import Count, Sum, Max
-    
-    partidas = Partida.objects.filter(usuario=request.user)
-    partidas_count = partidas.count()
-    partidas_ativas = partidas.filter(ativa=True).count()
-    partidas_finalizadas = partidas.filter(ativa=False).count()
-    
-    # Conquistas totais
-    conquistas_count = ConquistaDesbloqueada.objects.filter(partida__usuario=request.user).count()
-    
-    # Estatísticas das startups
-    stats = Startup.objects.filter(partida__usuario=request.user).aggregate(
-        maior_saldo=Max('saldo_caixa'),
-        maior_valuation=Max('valuation'),
-        maior_turno=Max('turno_atual')
-    )
-    
-    # Turma do estudante (se houver código vinculado)
-    turma = None
-    if request.user.codigo_turma:
-        turma = Turma.objects.filter(codigo__iexact=request.user.codigo_turma).first()
+    # Resumo mantido pelo TurnEngine e pelos sinais, com a turma
+    stats = obter_stats(request.user)
 
     return render(request, 'perfil.html',{
         'usuario': request.user,
-        'total_partidas': partidas_count,
-        'partidas_ativas': partidas_ativas,
-        'partidas_finalizadas': partidas_finalizadas,
-        'total_conquistas': conquistas_count,
-        'maior_saldo': stats['maior_saldo'] or 0,
-        'maior_valuation': stats['maior_valuation'] or 0,
-        'maior_turno': stats['maior_turno'] or 0,
-        'turma': turma,
+        'total_partidas': stats.total_partidas,
+        'partidas_ativas': stats.partidas_ativas,
+        'partidas_finalizadas': stats.partidas_finalizadas,
+        'total_conquistas': stats.total_conquistas,
+        'maior_saldo': stats.maior_saldo,
+        'maior_valuation': stats.maior_valuation,
+        'maior_turno': stats.maior_turno,
+        'turma': stats.usuario.turma,
     })
 
 @login_required
+@query_budget(5)
+@pagina_condicional(etag_jogador)
 def historico(request):
     """
     Lista o histórico de decisões do usuário, agrupadas por empresa.
@@ -310,31 +332,97 @@ def historico(request):
     
     from itertools import groupby
     
+    # Paginação por chave (partida_id, turno): cada página lê só as suas linhas
     decisoes = (
         HistoricoDecisao.objects
-        .select_related('partida')
         .filter(partida__usuario=request.user)
-        .order_by('partida__nome_empresa', '-turno')
+        .order_by('partida_id', '-turno')
+        .only('partida_id', 'turno', 'decisao_tomada', 'data_decisao')
     )
+    cursor = _cursor_historico(request.GET.get('apos', ''))
+    if cursor:
+        partida_id, turno = cursor
+        decisoes = decisoes.filter(Q(partida_id__gt=partida_id) | Q(partida_id=partida_id, turno__lt=turno))
+    
+    pagina = list(decisoes[:TAMANHO_PAGINA_HISTORICO + 1])
+    proxima = None
+    if len(pagina) > TAMANHO_PAGINA_HISTORICO:
+        pagina = pagina[:TAMANHO_PAGINA_HISTORICO]
+        proxima = f'{pagina[-1].partida_id}-{pagina[-1].turno}'
+    
+    # Cabeçalho de cada empresa da página, com o total de decisões da partida
+    resumos = {
+        partida.id: partida
+        for partida in Partida.objects
+        .filter(id__in={decisao.partida_id for decisao in pagina})
+        .annotate(total_decisoes=Count('decisoes'))
+        .only('id', 'nome_empresa')
+    }
     
-    # Agrupar por empresa
+    # Agrupar por empresa (as linhas da página já vêm agrupadas por partida)
     decisoes_por_empresa = []
-    decisoes_list = list(decisoes)
-    
-    for empresa_nome, grupo in groupby(decisoes_list, key=lambda x: x.partida.nome_empresa):
-        grupo_list = list(grupo)
+    for partida_id, grupo in groupby(pagina, key=lambda x: x.partida_id):
+        resumo = resumos[partida_id]
         decisoes_por_empresa.append({
-            'empresa': empresa_nome,
-            'decisoes': grupo_list,
-            'total_decisoes': len(grupo_list)
+            'empresa': resumo.nome_empresa,
+            'decisoes': list(grupo),
+            'total_decisoes': resumo.total_decisoes,
         })
     
     return render(request, 'historico.html',{
-        'decisoes_por_empresa': decisoes_por_empresa
+        'decisoes_por_empresa': decisoes_por_empresa,
+        'proxima_pagina': proxima,
+        'primeira_pagina': cursor is None,
     })
 
+TAMANHO_PAGINA_HISTORICO = 50
+
+def _cursor_historico(valor):
+    """Converte `?apos=<partida_id>-<turno>`; valores inválidos voltam à primeira página."""
+    try:
+        partida_id, turno = (int(parte) for parte in valor.split('-'))
+    except ValueError:
+        return None
+    return partida_id, turno
+
+@login_required
+def exportar_historico(request):
+    """
+    Exporta todo o histórico do usuário em CSV, gerado em streaming: as
+    linhas são lidas do banco em blocos e escritas conforme são enviadas.
+    """
+    if request.user.is_educador():
+        messages.error(
+            request, 
+            'Acesso negado. Esta funcionalidade não está disponível para Educadores.'
+        )
+        return redirect('dashboard')
+    
+    linhas = (
+        HistoricoDecisao.objects
+        .filter(partida__usuario=request.user)
+        .order_by('partida_id', 'turno')
+        .values_list(
+            'partida__nome_empresa', 'turno', 'decisao_tomada', 'data_decisao',
+            'delta_saldo', 'delta_receita', 'delta_valuation', 'delta_funcionarios',
+        )
+        .iterator(chunk_size=2000)
+    )
+    cabecalho = [
+        'empresa', 'turno', 'decisao', 'data',
+        'delta_saldo', 'delta_receita', 'delta_valuation', 'delta_funcionarios',
+    ]
+    csv_linhas = linhas_csv(cabecalho, (
+        (empresa, turno, decisao, data.isoformat(), *deltas)
+        for empresa, turno, decisao, data, *deltas in linhas
+    ))
+    response = StreamingHttpResponse(csv_linhas, content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = 'attachment; filename="historico.csv"'
+    return response
+
 @estudante_required
 @login_required
+@query_budget(3)
 def metricas(request, partida_id):
     partida = get_object_or_404(
         Partida.objects.select_related('startup'),
@@ -348,37 +436,56 @@ def metricas(request, partida_id):
         'partida': partida,
         'startup': startup
     })
+
+@estudante_required
+@login_required
+@query_budget(4)
+def metricas_serie(request, partida_id):
+    """
+    Série das métricas da partida em colunas, para os gráficos de
+    metricas.html. `?pontos=` limita o número de turnos (LTTB) e
+    `?referencia=` escolhe a métrica que guia a redução.
+    """
+    partida = get_object_or_404(Partida, id=partida_id, usuario=request.user)
+
+    try:
+        pontos = int(request.GET.get('pontos', PONTOS_PADRAO))
+        serie = serie_metricas(partida.id, pontos=pontos, referencia=request.GET.get('referencia', 'valuation'))
+    except ValueError as erro:
+        return JsonResponse({'erro': str(erro)}, status=400)
+
+    return JsonResponse(serie)
 @login_required
-def conquistas(request):
+@query_budget(4)
+@pagina_condicional(etag_jogador)
+async def conquistas(request):
     """
     Lista as conquistas desbloqueadas do usuário, agrupadas por empresa.
     Todos os usuários podem acessar, exceto educadores.
     """
+    usuario = await usuario_async(request)
+    
     # Bloquear acesso de educadores
-    if request.user.is_educador():
+    if usuario.is_educador():
         messages.error(
             request, 
             'Acesso negado. Esta funcionalidade não está disponível para Educadores.'
         )
         return redirect('dashboard')
     
-    from core.services.conquistas import _garantir_conquistas_existem
     from itertools import groupby
     
-    # Apenas garante que as conquistas base existem no sistema
-    _garantir_conquistas_existem()
-    
     # Busca as conquistas já desbloqueadas
     conquistas = (
         ConquistaDesbloqueada.objects
         .select_related('conquista', 'partida', 'partida__startup')
-        .filter(partida__usuario=request.user)
+        .filter(partida__usuario=usuario)
         .order_by('partida__nome_empresa', '-desbloqueada_em')
     )
     
     # Agrupar por empresa e calcular pontos
     conquistas_por_empresa = []
-    conquistas_list = list(conquistas)
+    conquistas_list = [conquista async for conquista in conquistas]
     
     for empresa_nome, grupo in groupby(conquistas_list, key=lambda x: x.partida.nome_empresa):
         grupo_list = list(grupo)
@@ -393,11 +500,13 @@ def conquistas(request):
 
 @login_required
 @pode_acessar_ranking
-def ranking(request):
+@query_budget(6)
+@pagina_condicional(etag_ranking)
+async def ranking(request):
     """
     Exibe ranking das startups com filtro de turma para Educadores e filtros regionais.
     """
-    from django.db.models import Max, Count, Q, Sum
+    usuario = await usuario_async(request)
     
     # 1. Captura parâmetros
     criterio = request.GET.get('criterio', 'valuation')
@@ -406,52 +515,36 @@ def ranking(request):
     filtro_estado = request.GET.get('estado', '').strip()
     filtro_municipio = request.GET.get('municipio', '').strip()
     
-    # 2. Queryset Base (Apenas startups ativas)
-    startups = (
-        Startup.objects
-        .select_related('partida', 'partida__usuario')
-        .filter(partida__ativa=True)
+    # 2. Queryset Base: tabela desnormalizada (uma linha por partida ativa),
+    # já filtrada pela categoria do usuário
+    # Estudantes, aspirantes e profissionais veem apenas startups da própria categoria
+    # Educadores veem apenas startups de alunos das turmas criadas por eles
+    startups, audiencia = (
+        getattr(request, 'entradas_ranking', None)
+        or await sync_to_async(entradas_visiveis)(usuario)
     )
+    startups = startups.select_related('usuario')
     
-    # 3. Filtro por categoria do usuário
-    # Estudantes veem apenas startups de outros estudantes
-    # Aspirantes veem apenas startups de outros aspirantes
-    # Profissionais Corporativos veem apenas startups de outros corporativos
-    # Educadores veem apenas startups de alunos das turmas criadas por eles
-    if request.user.categoria == User.Categorias.ESTUDANTE_UNIVERSITARIO:
-        startups = startups.filter(partida__usuario__categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO)
-    elif request.user.categoria == User.Categorias.ASPIRANTE_EMPREENDEDOR:
-        startups = startups.filter(partida__usuario__categoria=User.Categorias.ASPIRANTE_EMPREENDEDOR)
-    elif request.user.categoria == User.Categorias.PROFISSIONAL_CORPORATIVO:
-        startups = startups.filter(partida__usuario__categoria=User.Categorias.PROFISSIONAL_CORPORATIVO)
-    elif request.user.categoria == User.Categorias.EDUCADOR_NEGOCIOS:
-        # Educadores veem apenas alunos das turmas que criaram
-        codigos_turmas = request.user.turmas_criadas.filter(ativa=True).values_list('codigo', flat=True)
-        startups = startups.filter(partida__usuario__codigo_turma__in=codigos_turmas)
+    # Listas de filtros da audiência, antes dos filtros escolhidos na página
+    paises_disponiveis, estados_disponiveis = await sync_to_async(opcoes_filtros)(audiencia, startups)
     
     # 4. Lógica de Filtro por Turma (Exclusivo Educador/Admin)
     # Verifica se é educador para permitir o filtro
-    is_educador = request.user.categoria == User.Categorias.EDUCADOR_NEGOCIOS or request.user.is_superuser
+    is_educador = usuario.categoria == User.Categorias.EDUCADOR_NEGOCIOS or usuario.is_superuser
     
     if is_educador and codigo_turma:
-        # Filtra pelo campo codigo_turma do Usuário dono da partida
-        startups = startups.filter(partida__usuario__codigo_turma__iexact=codigo_turma)
+        # Filtra pela turma do dono da partida (códigos são gravados em maiúsculas)
+        startups = startups.filter(turma__codigo=codigo_turma.upper())
     
     # 4.5. Filtros Regionais
     if filtro_pais:
-        startups = startups.filter(partida__usuario__pais__iexact=filtro_pais)
+        startups = startups.filter(pais__iexact=filtro_pais)
     if filtro_estado:
-        startups = startups.filter(partida__usuario__estado__iexact=filtro_estado)
+        startups = startups.filter(estado__iexact=filtro_estado)
     if filtro_municipio:
-        startups = startups.filter(partida__usuario__municipio__icontains=filtro_municipio)
+        startups = startups.filter(municipio__icontains=filtro_municipio)
 
-    # 5. Anotações
-    startups = startups.annotate(
-        total_conquistas=Count('partida__conquistas'),
-        pontuacao_conquistas=Sum('partida__conquistas__conquista__pontos')
-    )
-    
-    # 6. Ordenação
+    # 5. Ordenação (cada critério tem um índice em LeaderboardEntry)
     if criterio == 'valuation':
         startups = startups.order_by('-valuation', '-saldo_caixa')
         titulo = 'Ranking por Valuation'
@@ -468,12 +561,8 @@ def ranking(request):
         startups = startups.order_by('-valuation')
         titulo = 'Ranking Geral'
     
-    # Limitar aos top 50
-    startups = startups[:50]
-    
-    # Obter listas únicas para os filtros
-    paises_disponiveis = User.objects.filter(partidas__ativa=True).values_list('pais', flat=True).distinct().order_by('pais')
-    estados_disponiveis = User.objects.filter(partidas__ativa=True).values_list('estado', flat=True).distinct().order_by('estado')
+    # Limitar aos top 50 (lidos aqui: o template não pode consultar o banco no event loop)
+    startups = [entrada async for entrada in startups[:50]]
     
     context = {
         'startups': startups,
@@ -484,8 +573,8 @@ def ranking(request):
         'filtro_pais': filtro_pais,
         'filtro_estado': filtro_estado,
         'filtro_municipio': filtro_municipio,
-        'paises_disponiveis': [p for p in paises_disponiveis if p],
-        'estados_disponiveis': [e for e in estados_disponiveis if e],
+        'paises_disponiveis': paises_disponiveis,
+        'estados_disponiveis': estados_disponiveis,
     }
     
     return render(request, 'ranking.html', context)
@@ -525,6 +614,16 @@ def editar_perfil(request):
 
 def educador_only(view_func):
     """Decorator para garantir que apenas Educadores acessem"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_wrapped_view(request, *args, **kwargs):
+            usuario = await usuario_async(request)
+            if usuario.categoria != User.Categorias.EDUCADOR_NEGOCIOS and not usuario.is_superuser:
+                return redirect('dashboard')
+            return await view_func(request, *args, **kwargs)
+        return _async_wrapped_view
+    
+    @wraps(view_func)
     def _wrapped_view(request, *args, **kwargs):
         if request.user.categoria != User.Categorias.EDUCADOR_NEGOCIOS and not request.user.is_superuser:
             return redirect('dashboard')
@@ -533,6 +632,7 @@ def educador_only(view_func):
 
 @login_required
 @educador_only
+@query_budget(3)
 def educador_dashboard(request):
     # Buscar todas as turmas do educador
     turmas_educador = Turma.objects.filter(educador=request.user, ativa=True)
@@ -545,6 +645,7 @@ def educador_dashboard(request):
 
 @login_required
 @educador_required
+@query_budget(7)
 def educador_perfil(request):
     """
     Exibe o perfil do educador com estatísticas de suas turmas e alunos.
@@ -557,7 +658,7 @@ def educador_perfil(request):
     # Contar alunos únicos em todas as turmas
     alunos = User.objects.filter(
         categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO,
-        codigo_turma__in=turmas.values('codigo')
+        turma__in=turmas
     ).distinct()
     total_alunos = alunos.count()
     
@@ -621,18 +722,14 @@ def criar_turma(request):
             messages.error(request, 'O nome da turma é obrigatório.')
             return redirect('educador_dashboard')
         
-        # Gerar código único
-        codigo = Turma.gerar_codigo_unico()
-        
-        # Criar turma
-        turma = Turma.objects.create(
-            codigo=codigo,
+        # Criar turma com código alocado (único sem consultas de existência)
+        turma = criar_turma_com_codigo(
             nome=nome_turma,
             descricao=descricao_turma,
             educador=request.user
         )
         
-        messages.success(request, f'Turma "{nome_turma}" criada com sucesso! Código: {codigo}')
+        messages.success(request, f'Turma "{nome_turma}" criada com sucesso! Código: {turma.codigo}')
         return redirect('educador_dashboard')
     
     return redirect('educador_dashboard')
@@ -641,22 +738,24 @@ def criar_turma(request):
 @educador_only
 @login_required
 @educador_only
-def analise_turma(request, codigo_turma):
+@query_budget(7)
+async def analise_turma(request, codigo_turma):
     """
     Exibe análise detalhada de uma turma específica.
     """
-    turma = get_object_or_404(Turma, codigo__iexact=codigo_turma)
+    usuario = await usuario_async(request)
+    turma = await aget_object_or_404(Turma, codigo=codigo_turma.upper())
     
     # Verificar se o educador logado é o dono da turma (ou se é superuser)
-    if not request.user.is_superuser and turma.educador != request.user:
+    if not usuario.is_superuser and turma.educador_id != usuario.pk:
         raise PermissionDenied("Você não tem permissão para acessar esta turma.")
     
-    # Buscar partidas e alunos dessa turma (case-insensitive)
-    partidas = Partida.objects.filter(ativa=True, usuario__codigo_turma__iexact=turma.codigo)
-    users_alunos = User.objects.filter(categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO, codigo_turma__iexact=turma.codigo)
+    # Buscar partidas e alunos dessa turma
+    partidas = Partida.objects.filter(ativa=True, usuario__turma=turma)
+    users_alunos = turma.alunos.filter(categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO)
     
     # Calcular KPIs
-    kpis = Startup.objects.filter(partida__in=partidas).aggregate(
+    kpis = await Startup.objects.filter(partida__in=partidas).aaggregate(
         media_valuation=Avg('valuation'),
         media_caixa=Avg('saldo_caixa'),
         maior_valuation=Max('valuation'),
@@ -665,25 +764,28 @@ def analise_turma(request, codigo_turma):
     )
     
     # Ranking da turma
-    ranking = (
+    ranking = [
+        startup async for startup in
         Startup.objects
         .select_related('partida', 'partida__usuario')
         .filter(partida__in=partidas)
         .order_by('-valuation')[:20]
-    )
+    ]
     
     context = {
         'turma': turma,
         'kpis': kpis,
         'ranking': ranking,
-        'total_alunos': users_alunos.count(),
+        'total_alunos': await users_alunos.acount(),
         'turno_medio': int(kpis.get('media_turno') or 0),
+        'tabelas_exportacao': TABELAS_EXPORTACAO,
     }
     
     return render(request, 'analise_turma.html', context)
 
 @login_required
 @educador_only
+@query_budget(4)
 def ranking_turmas(request):
     """
     Exibe ranking com dados agregados das turmas criadas pelo educador logado.
@@ -691,24 +793,8 @@ def ranking_turmas(request):
     # Buscar apenas as turmas criadas pelo educador logado
     turmas = Turma.objects.filter(ativa=True, educador=request.user).order_by('-data_criacao')
     
-    turmas_dados = []
-    for turma in turmas:
-        partidas = Partida.objects.filter(ativa=True, usuario__codigo_turma__iexact=turma.codigo)
-        users_alunos = User.objects.filter(categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO, codigo_turma__iexact=turma.codigo)
-        
-        kpis = Startup.objects.filter(partida__in=partidas).aggregate(
-            media_valuation=Avg('valuation'),
-            maior_valuation=Max('valuation'),
-            total_startups=Count('partida')
-        )
-        
-        turmas_dados.append({
-            'turma': turma,
-            'total_alunos': users_alunos.count(),
-            'startups_ativas': kpis.get('total_startups') or 0,
-            'media_valuation': kpis.get('media_valuation') or 0,
-            'maior_valuation': kpis.get('maior_valuation') or 0,
-        })
+    # Indicadores de todas as turmas em uma consulta agrupada
+    turmas_dados = TurmaStats.para_turmas(turmas)
     
     context = {
         'turmas_dados': turmas_dados,
@@ -718,6 +804,7 @@ def ranking_turmas(request):
 
 @login_required
 @educador_only
+@query_budget(4)
 def metricas_turmas(request):
     """
     Exibe análise geral agregada das turmas criadas pelo educador logado.
@@ -725,62 +812,162 @@ def metricas_turmas(request):
     # Buscar apenas as turmas criadas pelo educador logado
     turmas = Turma.objects.filter(ativa=True, educador=request.user).order_by('-data_criacao')
     
-    # Buscar todos os dados das turmas
-    turmas_dados = []
-    total_alunos = 0
-    total_startups = 0
-    total_valuation = 0
-    max_valuation = 0
-    
-    for turma in turmas:
-        partidas = Partida.objects.filter(ativa=True, usuario__codigo_turma__iexact=turma.codigo)
-        users_alunos = User.objects.filter(categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO, codigo_turma__iexact=turma.codigo)
-        
-        kpis = Startup.objects.filter(partida__in=partidas).aggregate(
-            media_valuation=Avg('valuation'),
-            maior_valuation=Max('valuation'),
-            total_startups=Count('partida'),
-            media_caixa=Avg('saldo_caixa')
-        )
-        
-        alunos_count = users_alunos.count()
-        startups_count = kpis.get('total_startups') or 0
-        media_val = kpis.get('media_valuation') or 0
-        maior_val = kpis.get('maior_valuation') or 0
-        
-        total_alunos += alunos_count
-        total_startups += startups_count
-        total_valuation += media_val
-        
-        if maior_val > max_valuation:
-            max_valuation = maior_val
-        
-        turmas_dados.append({
-            'turma': turma,
-            'total_alunos': alunos_count,
-            'startups_ativas': startups_count,
-            'media_valuation': media_val,
-            'maior_valuation': maior_val,
-            'media_caixa': kpis.get('media_caixa') or 0,
-        })
+    # Indicadores de todas as turmas em uma consulta agrupada
+    turmas_dados = TurmaStats.para_turmas(turmas)
+    total_turmas = len(turmas_dados)
     
     # Calcular médias gerais
-    media_valuation_geral = total_valuation / len(turmas) if turmas.count() > 0 else 0
+    media_valuation_geral = sum(t.media_valuation for t in turmas_dados) / total_turmas if total_turmas else 0
     
     context = {
         'turmas_dados': turmas_dados,
-        'total_turmas': turmas.count(),
-        'total_alunos': total_alunos,
-        'total_startups': total_startups,
+        'total_turmas': total_turmas,
+        'total_alunos': sum(t.total_alunos for t in turmas_dados),
+        'total_startups': sum(t.startups_ativas for t in turmas_dados),
         'media_valuation': media_valuation_geral,
-        'media_caixa': sum(t['media_caixa'] for t in turmas_dados) / len(turmas_dados) if turmas_dados else 0,
-        'maior_valuation': max_valuation,
+        'media_caixa': sum(t.media_caixa for t in turmas_dados) / total_turmas if total_turmas else 0,
+        'maior_valuation': max((t.maior_valuation for t in turmas_dados), default=0),
+        'tabelas_exportacao': TABELAS_EXPORTACAO,
     }
     
     return render(request, 'metricas_turmas.html', context)
 
-import random
-import string
+TABELAS_EXPORTACAO = (
+    ('startups', 'Startups'),
+    ('decisoes', 'Decisões'),
+    ('conquistas', 'Conquistas'),
+)
+
+def _exportar_partidas(request, partidas, nome, voltar):
+    """
+    Resposta em streaming com a tabela `?tabela=` das `partidas` no
+    formato `?formato=` (csv, parquet ou arrow).
+    """
+    tabela = request.GET.get('tabela', 'startups')
+    formato = request.GET.get('formato', 'csv')
+    try:
+        conteudo = exportar(tabela, partidas, formato)
+    except KeyError:
+        messages.error(request, 'Tabela ou formato de exportação inválido.')
+        return redirect(*voltar)
+    except FormatoIndisponivel as erro:
+        messages.error(request, str(erro))
+        return redirect(*voltar)
+    
+    content_type, extensao = FORMATOS[formato]
+    response = StreamingHttpResponse(conteudo, content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{nome}-{tabela}.{extensao}"'
+    return response
+
+@login_required
+@educador_only
+def exportar_turma(request, codigo_turma):
+    """
+    Exporta startups, decisões ou conquistas dos alunos de uma turma.
+    """
+    turma = get_object_or_404(Turma, codigo=codigo_turma.upper())
+    if not request.user.is_superuser and turma.educador_id != request.user.pk:
+        raise PermissionDenied("Você não tem permissão para acessar esta turma.")
+    
+    partidas = Partida.objects.filter(
+        usuario__turma=turma,
+        usuario__categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO,
+    )
+    return _exportar_partidas(request, partidas, turma.codigo, ('analise_turma', turma.codigo))
+
+@login_required
+@educador_only
+def exportar_turmas(request):
+    """
+    Exporta os dados dos alunos de todas as turmas ativas do educador.
+    """
+    partidas = Partida.objects.filter(
+        usuario__turma__educador=request.user,
+        usuario__turma__ativa=True,
+        usuario__categoria=User.Categorias.ESTUDANTE_UNIVERSITARIO,
+    )
+    return _exportar_partidas(request, partidas, 'turmas', ('metricas_turmas',))
+
+@login_required
+@educador_only
+@require_POST
+def importar_alunos(request, codigo_turma):
+    """
+    Cadastra os alunos de um CSV (nome, email, matricula) na turma e devolve
+    outro CSV com o link de convite de cada um.
+    """
+    turma = get_object_or_404(Turma, codigo=codigo_turma.upper())
+    if not request.user.is_superuser and turma.educador_id != request.user.pk:
+        raise PermissionDenied("Você não tem permissão para acessar esta turma.")
+    
+    arquivo = request.FILES.get('arquivo')
+    if not arquivo:
+        messages.error(request, 'Envie um arquivo CSV com as colunas nome, email e matricula.')
+        return redirect('analise_turma', turma.codigo)
+    try:
+        linhas = ler_csv(arquivo)
+    except UnicodeDecodeError:
+        messages.error(request, 'O arquivo precisa estar em UTF-8.')
+        return redirect('analise_turma', turma.codigo)
+    except ValueError as erro:
+        messages.error(request, str(erro))
+        return redirect('analise_turma', turma.codigo)
+    
+    importacao = importar_alunos_da_lista(turma, linhas)
+    if importacao.erros:
+        for numero, mensagem in importacao.erros[:MAX_ERROS_IMPORTACAO]:
+            messages.error(request, f'Linha {numero}: {mensagem}' if numero else mensagem)
+        if len(importacao.erros) > MAX_ERROS_IMPORTACAO:
+            messages.error(request, f'... e mais {len(importacao.erros) - MAX_ERROS_IMPORTACAO} erro(s). Nenhum aluno foi cadastrado.')
+        return redirect('analise_turma', turma.codigo)
+    
+    return _resposta_convites(request, turma, importacao.alunos)
+
+@login_required
+@educador_only
+@require_POST
+def reenviar_convites(request, codigo_turma):
+    """
+    Gera de novo o CSV de convites dos alunos da turma que ainda não
+    definiram senha (convite perdido ou vencido).
+    """
+    turma = get_object_or_404(Turma, codigo=codigo_turma.upper())
+    if not request.user.is_superuser and turma.educador_id != request.user.pk:
+        raise PermissionDenied("Você não tem permissão para acessar esta turma.")
+    
+    alunos = list(convites_pendentes(turma))
+    if not alunos:
+        messages.info(request, 'Todos os alunos importados já definiram a senha.')
+        return redirect('analise_turma', turma.codigo)
+    return _resposta_convites(request, turma, alunos)
+
+def _resposta_convites(request, turma, alunos):
+    """CSV com nome, e-mail, matrícula e link de convite de cada aluno."""
+    def linhas_convites():
+        for aluno in alunos:
+            uidb64, token = convite(aluno)
+            link = request.build_absolute_uri(reverse('aceitar_convite', args=[uidb64, token]))
+            yield aluno.first_name, aluno.email, aluno.matricula_aluno, link
+    
+    response = StreamingHttpResponse(
+        linhas_csv(('nome', 'email', 'matricula', 'convite'), linhas_convites()),
+        content_type='text/csv; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{turma.codigo}-convites.csv"'
+    return response
+
+MAX_ERROS_IMPORTACAO = 10
+
+class AceitarConviteView(PasswordResetConfirmView):
+    """
+    Primeiro acesso de um aluno importado: define a senha e entra no jogo.
+    O link deixa de valer depois de usado.
+    """
+    token_generator = token_convite
+    template_name = 'aceitar_convite.html'
+    post_reset_login = True
+    success_url = reverse_lazy('redirect_handler')
+
 
 @login_required
 @educador_required
@@ -789,15 +976,7 @@ def gerar_codigo_turma(request):
     Gera um código único de turma para educadores.
     """
     if request.method == 'POST':
-        while True:
-            letras = ''.join(random.choices(string.ascii_uppercase, k=3))
-            numeros = ''.join(random.choices(string.digits, k=3))
-            codigo = f"{letras}-{numeros}"
-            
-            
-            if not User.objects.filter(codigo_turma=codigo).exists():
-                break
-        
+        codigo = alocar_codigo_turma()
         
         messages.success(request, f'Código de turma gerado: {codigo}')
         return redirect('dashboard')
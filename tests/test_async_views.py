@@ -0,0 +1,83 @@
+"""
+Testes das views assíncronas pela pilha ASGI
+Cobre ranking, conquistas e analise_turma com o AsyncClient
+"""
+from django.test import TestCase, AsyncClient
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Partida, Startup, Turma
+from core.query_budget import QueryBudgetTestMixin
+from core.services.ranking import sincronizar_entrada
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class AsyncViewsTests(QueryBudgetTestMixin, TestCase):
+    """Testes das páginas de leitura servidas como views assíncronas"""
+
+    def setUp(self):
+        self.educador = User.objects.create_user(
+            username='educador',
+            password='pass123',
+            categoria='EDUCADOR_NEGOCIOS'
+        )
+        self.turma = Turma.objects.create(codigo='ASG-001', nome='Turma ASGI', educador=self.educador)
+        self.aluno = User.objects.create_user(
+            username='aluno',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='ASG-001'
+        )
+        self.partida = Partida.objects.create(usuario=self.aluno, nome_empresa='Empresa Async')
+        Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('10000.00'), valuation=Decimal('50000.00'))
+        sincronizar_entrada(self.partida.pk)
+        self.client = AsyncClient()
+
+    async def test_ranking_assincrono(self):
+        """Testa o ranking pela pilha ASGI, dentro do orçamento de consultas"""
+        await self.client.aforce_login(self.aluno)
+        response = await self.client.get(reverse('ranking'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Empresa Async')
+        self.assertTrue(0 < response.relatorio_consultas.consultas <= 6)
+
+    async def test_ranking_nao_modificado(self):
+        """Testa que o ETag calculado fora do event loop gera 304"""
+        await self.client.aforce_login(self.aluno)
+        etag = (await self.client.get(reverse('ranking')))['ETag']
+        response = await self.client.get(reverse('ranking'), headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_conquistas_assincrono(self):
+        """Testa a página de conquistas pela pilha ASGI"""
+        await self.client.aforce_login(self.aluno)
+        response = await self.client.get(reverse('conquistas'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'conquistas.html')
+
+    async def test_conquistas_bloqueia_educador(self):
+        """Testa que o educador é redirecionado também na view assíncrona"""
+        await self.client.aforce_login(self.educador)
+        response = await self.client.get(reverse('conquistas'))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+    async def test_analise_turma_assincrona(self):
+        """Testa a análise da turma com o ORM assíncrono"""
+        await self.client.aforce_login(self.educador)
+        response = await self.client.get(reverse('analise_turma', args=['ASG-001']))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_alunos'], 1)
+        self.assertEqual(response.context['kpis']['total_startups'], 1)
+
+    async def test_analise_turma_de_outro_educador(self):
+        """Testa que outro educador recebe 403"""
+        outro = await User.objects.acreate(username='outro', categoria='EDUCADOR_NEGOCIOS')
+        await self.client.aforce_login(outro)
+        response = await self.client.get(reverse('analise_turma', args=['ASG-001']))
+        self.assertEqual(response.status_code, 403)
+
+    async def test_ranking_sem_login(self):
+        """Testa o redirecionamento para o login na view assíncrona"""
+        response = await self.client.get(reverse('ranking'))
+        self.assertEqual(response.status_code, 302)
@@ -36,6 +36,15 @@ class AuthenticationFlowTests(TestCase):
         })
         self.assertEqual(response.status_code, 302)  # Redirect após login
     
+    def test_login_sem_diferenciar_maiusculas(self):
+        """Testa que 'TestUser' entra na conta 'testuser', como na unicidade do cadastro"""
+        User.objects.create_user(**self.user_data)
+        response = self.client.post(reverse('login'), {
+            'username': 'TestUser',
+            'password': self.user_data['password']
+        })
+        self.assertEqual(response.status_code, 302)
+    
     def test_user_logout(self):
         """Testa o logout de usuário"""
         User.objects.create_user(**self.user_data)
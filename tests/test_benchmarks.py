@@ -0,0 +1,144 @@
+"""
+Testes da suíte de benchmarks
+Cobre as fábricas de dados, a medição das views e a comparação de resultados
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Min, Q
+from core.models import HistoricoDecisao, LeaderboardEntry, SnapshotStartup, StartupMetricaTurno, Startup
+from benchmarks.comparar import regressoes
+from benchmarks.fabricas import semear
+from benchmarks.medicao import medir_views, percentil
+from benchmarks.sessoes import medir_sessoes
+
+User = get_user_model()
+
+
+class FabricasTests(TestCase):
+    """Testes do banco semeado para os benchmarks"""
+
+    def test_semear_cria_hierarquia(self):
+        """Testa educadores, turmas, alunos e partidas com histórico longo"""
+        cenario = semear(educadores=2, turmas=2, alunos=3, turnos=25)
+        self.assertEqual(len(cenario.turmas), 4)
+        self.assertEqual(len(cenario.alunos), 12)
+        self.assertEqual(cenario.alunos[0].turma_id, cenario.turmas[0].id)
+        self.assertEqual(HistoricoDecisao.objects.count(), 12 * 25)
+        self.assertEqual(StartupMetricaTurno.objects.count(), 12 * 25)
+        self.assertEqual(SnapshotStartup.objects.count(), 12 * 2)
+        self.assertEqual(LeaderboardEntry.objects.count(), 12)
+
+    def test_semear_muitos_alunos_poucos_turnos(self):
+        """Testa que o passeio aleatório nunca deixa receita, valuation ou equipe negativos"""
+        semear(educadores=2, turmas=2, alunos=50, turnos=5)
+        for modelo in (Startup, StartupMetricaTurno, SnapshotStartup):
+            self.assertFalse(
+                modelo.objects.filter(
+                    Q(receita_mensal__lt=0) | Q(valuation__lt=0) | Q(funcionarios__lt=0)
+                ).exists()
+            )
+        # Como no jogo, o turno 1 não tem decisão
+        turnos = HistoricoDecisao.objects.aggregate(primeiro=Min('turno'), ultimo=Max('turno'))
+        self.assertEqual(turnos, {'primeiro': 2, 'ultimo': 6})
+        self.assertFalse(Startup.objects.exclude(turno_atual=6).exists())
+
+    def test_semear_deterministico(self):
+        """Testa que a mesma seed gera o mesmo estado"""
+        def valuations():
+            return list(Startup.objects.order_by('partida__usuario__username').values_list('valuation', flat=True))
+
+        semear(educadores=1, turmas=1, alunos=2, turnos=5, seed=7)
+        primeira = valuations()
+        User.objects.all().delete()
+        semear(educadores=1, turmas=1, alunos=2, turnos=5, seed=7)
+        self.assertEqual(valuations(), primeira)
+
+
+class MedicaoTests(TestCase):
+    """Testes da medição de latência e consultas"""
+
+    def test_medir_views(self):
+        """Testa que cada view medida tem latência e consultas por requisição"""
+        cenario = semear(educadores=1, turmas=1, alunos=2, turnos=10)
+        resultados = medir_views(cenario, repeticoes=3)
+        self.assertEqual(
+            list(resultados),
+            ['salvar_jogo', 'carregar_jogo', 'ranking', 'analise_turma', 'metricas_turmas'],
+        )
+        for metricas in resultados.values():
+            self.assertEqual(metricas['requisicoes'], 3)
+            self.assertGreater(metricas['consultas_max'], 0)
+            self.assertLessEqual(metricas['p50_ms'], metricas['p99_ms'])
+
+    def test_percentil(self):
+        self.assertEqual(percentil([5.0], 99), 5.0)
+        self.assertAlmostEqual(percentil(list(range(1, 101)), 50), 50.5)
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'sessoes': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sessoes'},
+})
+class SessoesTests(TestCase):
+    """Testes da medição dos perfis de sessão"""
+
+    def test_perfil_producao_economiza_consultas_no_ciclo(self):
+        """Testa que sessão em cache e mensagens em cookie tiram consultas de cada requisição"""
+        cenario = semear(educadores=1, turmas=1, alunos=1, turnos=3)
+        resultado = medir_sessoes(cenario)
+        # Ao menos a leitura da sessão em cada uma das duas requisições
+        self.assertGreaterEqual(resultado['economia_por_ciclo'], 2)
+        for view in ('salvar_jogo', 'carregar_jogo'):
+            self.assertLess(resultado['producao'][view], resultado['banco'][view])
+
+
+class PerfilSessaoSettingsTests(TestCase):
+    """Configurações do perfil de sessão que falham ao carregar as settings"""
+
+    def _carregar_settings(self, **variaveis):
+        ambiente = {**os.environ, **variaveis}
+        ambiente.pop('REDIS_URL', None)
+        return subprocess.run(
+            [sys.executable, '-c', 'import config.settings'],
+            cwd=settings.BASE_DIR, env=ambiente, capture_output=True, text=True,
+        )
+
+    def test_cache_de_sessoes_comporta_uma_turma(self):
+        """Testa que o cache em arquivo não descarta sessões com poucas centenas de alunos logados"""
+        opcoes = settings.CACHES['sessoes'].get('OPTIONS', {})
+        if settings.CACHES['sessoes']['BACKEND'].endswith('FileBasedCache'):
+            self.assertGreaterEqual(opcoes.get('MAX_ENTRIES', 300), 5000)
+
+    def test_producao_em_varias_instancias_exige_redis(self):
+        """Testa que o cache de sessões local não é usado por mais de uma instância"""
+        resultado = self._carregar_settings(PERFIL_SESSAO='producao', INSTANCIAS='2')
+        self.assertNotEqual(resultado.returncode, 0)
+        self.assertIn('REDIS_URL', resultado.stderr)
+
+    def test_producao_em_uma_instancia(self):
+        resultado = self._carregar_settings(PERFIL_SESSAO='producao', INSTANCIAS='1')
+        self.assertEqual(resultado.returncode, 0, resultado.stderr)
+
+    def test_perfil_desconhecido(self):
+        resultado = self._carregar_settings(PERFIL_SESSAO='redis')
+        self.assertNotEqual(resultado.returncode, 0)
+        self.assertIn('ImproperlyConfigured', resultado.stderr)
+
+
+class CompararTests(TestCase):
+    """Testes da comparação entre dois resultados"""
+
+    def test_regressoes(self):
+        """Testa latência acima da tolerância e consultas a mais como regressão"""
+        base = {'views': {'ranking': {'p50_ms': 10.0, 'p99_ms': 20.0, 'consultas_max': 4}}}
+        novo = {'views': {'ranking': {'p50_ms': 11.0, 'p99_ms': 30.0, 'consultas_max': 5}}}
+        self.assertEqual(
+            regressoes(base, novo, tolerancia=0.2),
+            [('ranking', 'p99_ms', 20.0, 30.0), ('ranking', 'consultas_max', 4, 5)],
+        )
+        self.assertEqual(regressoes(base, base), [])
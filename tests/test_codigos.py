@@ -0,0 +1,114 @@
+"""
+Testes do alocador de códigos de turma
+Cobre a permutação com chave, o contador no banco e a criação de turmas
+"""
+import re
+from unittest import mock
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Sequencia, Turma
+from core.services import codigos
+from core.services.codigos import (
+    SEQUENCIA_TURMA, TOTAL_CODIGOS, CodigosEsgotados, alocar_codigo_turma, criar_turma,
+    despermutar, formatar, permutar,
+)
+
+User = get_user_model()
+
+CHAVE = bytes(range(32))
+
+
+class PermutacaoTests(TestCase):
+    """Testes da permutação sobre o espaço AAA-999"""
+
+    def test_bijetiva(self):
+        """Testa que a inversa recupera o índice e que índices distintos não colidem"""
+        posicoes = {permutar(indice, CHAVE) for indice in range(5000)}
+        self.assertEqual(len(posicoes), 5000)
+        for indice in (0, 1, 999, 1000, TOTAL_CODIGOS - 1):
+            posicao = permutar(indice, CHAVE)
+            self.assertTrue(0 <= posicao < TOTAL_CODIGOS)
+            self.assertEqual(despermutar(posicao, CHAVE), indice)
+
+    def test_chave_muda_a_ordem(self):
+        """Testa que chaves diferentes geram sequências diferentes"""
+        outra = bytes(32)
+        self.assertNotEqual(
+            [permutar(indice, CHAVE) for indice in range(10)],
+            [permutar(indice, outra) for indice in range(10)],
+        )
+
+    def test_sequencia_parece_aleatoria(self):
+        """Testa que índices consecutivos não geram códigos consecutivos"""
+        codigos_gerados = [formatar(permutar(indice, CHAVE)) for indice in range(3)]
+        self.assertEqual(len({codigo[:3] for codigo in codigos_gerados}), 3)
+
+    def test_formatar(self):
+        self.assertEqual(formatar(0), 'AAA-000')
+        self.assertEqual(formatar(1001), 'AAB-001')
+        self.assertEqual(formatar(TOTAL_CODIGOS - 1), 'ZZZ-999')
+
+
+class AlocadorTests(TestCase):
+    """Testes da alocação pelo contador no banco"""
+
+    def test_aloca_codigos_distintos_no_formato(self):
+        """Testa o formato e a unicidade dos códigos alocados"""
+        alocados = [alocar_codigo_turma() for _ in range(50)]
+        self.assertEqual(len(set(alocados)), 50)
+        for codigo in alocados:
+            self.assertRegex(codigo, r'^[A-Z]{3}-[0-9]{3}$')
+        self.assertEqual(Sequencia.objects.get(nome=SEQUENCIA_TURMA).valor, 50)
+
+    def test_sem_consulta_de_existencia(self):
+        """Testa que a alocação não consulta as turmas"""
+        alocar_codigo_turma()
+        with CaptureQueriesContext(connection) as consultas:
+            alocar_codigo_turma()
+        sql = [consulta['sql'] for consulta in consultas.captured_queries if 'core_' in consulta['sql']]
+        self.assertEqual(len(sql), 2)
+        self.assertTrue(all('core_sequencia' in comando for comando in sql))
+
+    def test_chave_gerada_uma_vez(self):
+        """Testa que a chave do contador é criada no primeiro uso e mantida"""
+        alocar_codigo_turma()
+        chave = Sequencia.objects.get(nome=SEQUENCIA_TURMA).chave
+        alocar_codigo_turma()
+        self.assertEqual(Sequencia.objects.get(nome=SEQUENCIA_TURMA).chave, chave)
+        self.assertEqual(len(bytes.fromhex(chave)), 32)
+
+    def test_espaco_esgotado(self):
+        """Testa o erro quando todos os códigos já foram alocados"""
+        alocar_codigo_turma()
+        Sequencia.objects.filter(nome=SEQUENCIA_TURMA).update(valor=TOTAL_CODIGOS)
+        with self.assertRaises(CodigosEsgotados):
+            alocar_codigo_turma()
+
+
+class CriarTurmaTests(TestCase):
+    """Testes da criação de turmas com código alocado"""
+
+    def setUp(self):
+        self.educador = User.objects.create_user(
+            username='educador',
+            password='testpass123',
+            categoria='EDUCADOR_NEGOCIOS'
+        )
+
+    def test_pula_codigo_legado(self):
+        """Testa que um código sorteado antes do alocador é pulado"""
+        Turma.objects.create(codigo='AAA-000', nome='Legada', educador=self.educador)
+        with mock.patch.object(codigos, 'alocar_codigo_turma', side_effect=['AAA-000', 'BBB-111']):
+            turma = criar_turma(nome='Nova', educador=self.educador)
+        self.assertEqual(turma.codigo, 'BBB-111')
+
+    def test_view_criar_turma(self):
+        """Testa que a view cria a turma com o código alocado"""
+        client = Client()
+        client.login(username='educador', password='testpass123')
+        client.post(reverse('criar_turma'), {'nome_turma': 'Turma Nova'})
+        turma = Turma.objects.get(nome='Turma Nova')
+        self.assertTrue(re.match(r'^[A-Z]{3}-[0-9]{3}$', turma.codigo))
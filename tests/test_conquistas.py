@@ -8,6 +8,8 @@ from core.models import Partida, Startup, Conquista, ConquistaDesbloqueada
 from core.services.conquistas import (
     verificar_conquistas_progesso,
     _garantir_conquistas_existem,
+    obter_catalogo_conquistas,
+    catalogo_conquistas,
     CONQUISTAS_SALDO
 )
 from decimal import Decimal
@@ -357,3 +359,121 @@ class ConquistasSistemaTests(TestCase):
             titulo='Bilionário! Você Zerou o Game!'
         ).exists()
         self.assertTrue(bilionario)
+
+
+class ConquistasConsultasTests(TestCase):
+    """Testes do número de consultas da verificação incremental"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@test.com',
+            password='testpass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(
+            usuario=self.user,
+            nome_empresa='Test Startup'
+        )
+        self.startup = Startup.objects.create(
+            partida=self.partida,
+            nome='Test Startup',
+            saldo_caixa=Decimal('0.00'),
+            turno_atual=5
+        )
+        _garantir_conquistas_existem()
+    
+    def test_consultas_constantes_com_todos_limiares(self):
+        """Testa que cruzar todos os limiares de saldo usa um número fixo de consultas"""
+        self.startup.saldo_caixa = Decimal('1000000000.00')
+        self.startup.save()
+        
+        obter_catalogo_conquistas()
+        with self.assertNumQueries(2):
+            novas = verificar_conquistas_progesso(self.user, self.partida)
+        
+        # Todas as conquistas de saldo + Persistente!
+        self.assertEqual(len(novas), len(CONQUISTAS_SALDO) + 1)
+        self.assertEqual(
+            ConquistaDesbloqueada.objects.filter(partida=self.partida).count(),
+            len(CONQUISTAS_SALDO) + 1
+        )
+    
+    def test_apenas_limiares_novos_com_saldo_anterior(self):
+        """Testa que apenas os limiares cruzados desde o saldo anterior são avaliados"""
+        self.startup.saldo_caixa = Decimal('350000.00')
+        self.startup.turno_atual = 1
+        self.startup.save()
+        
+        novas = verificar_conquistas_progesso(
+            self.user, self.partida, saldo_anterior=Decimal('150000.00')
+        )
+        
+        titulos = [c.titulo for c in novas]
+        self.assertEqual(titulos, ['R$ 200 mil no Caixa', 'R$ 300 mil no Caixa'])
+    
+    def test_sem_limiar_cruzado_nao_consulta_banco(self):
+        """Testa que sem limiares novos nenhuma consulta é feita"""
+        self.startup.saldo_caixa = Decimal('150000.00')
+        self.startup.turno_atual = 1
+        self.startup.save()
+        obter_catalogo_conquistas()
+        
+        with self.assertNumQueries(0):
+            novas = verificar_conquistas_progesso(
+                self.user, self.partida, saldo_anterior=Decimal('120000.00')
+            )
+        
+        self.assertEqual(novas, [])
+
+
+class CatalogoConquistasTests(TestCase):
+    """Testes do catálogo de conquistas em memória"""
+    
+    def test_catalogo_semeado_pela_migracao(self):
+        """Testa que o catálogo já está completo sem semeadura preguiçosa"""
+        catalogo_conquistas.invalidar()
+        
+        # Uma única consulta para carregar o catálogo
+        with self.assertNumQueries(1):
+            catalogo = obter_catalogo_conquistas()
+        
+        self.assertTrue(catalogo.completo)
+        self.assertIn('Persistente!', catalogo.por_titulo)
+        self.assertEqual(len(catalogo.limiares), len(CONQUISTAS_SALDO))
+    
+    def test_catalogo_sem_consultas_apos_carregado(self):
+        """Testa que leituras seguintes do catálogo não consultam o banco"""
+        obter_catalogo_conquistas()
+        
+        with self.assertNumQueries(0):
+            obter_catalogo_conquistas()
+    
+    def test_catalogo_invalidado_ao_salvar_conquista(self):
+        """Testa que salvar uma conquista invalida o catálogo"""
+        obter_catalogo_conquistas()
+        versao = catalogo_conquistas.versao
+        
+        Conquista.objects.create(
+            titulo='Conquista Nova',
+            descricao='Descrição',
+            tipo='progresso',
+            pontos=5
+        )
+        
+        self.assertGreater(catalogo_conquistas.versao, versao)
+        self.assertIn('Conquista Nova', obter_catalogo_conquistas().por_titulo)
+    
+    def test_catalogo_invalidado_ao_remover_conquista(self):
+        """Testa que remover uma conquista invalida o catálogo"""
+        conquista = Conquista.objects.create(
+            titulo='Conquista Temporária',
+            descricao='Descrição',
+            tipo='progresso',
+            pontos=5
+        )
+        self.assertIn('Conquista Temporária', obter_catalogo_conquistas().por_titulo)
+        
+        conquista.delete()
+        
+        self.assertNotIn('Conquista Temporária', obter_catalogo_conquistas().por_titulo)
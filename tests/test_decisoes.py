@@ -0,0 +1,151 @@
+"""
+Testes do catálogo de decisões
+Cobre a tabela compilada, invalidação por edição e pré-condições no turno
+"""
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Decisao, Partida, Startup
+from core.services.catalogo import CatalogoEmMemoria
+from core.services.decisoes import EFEITO_NEUTRO, obter_tabela_decisoes, tabela_decisoes
+from core.services.turno import TurnEngine, DecisaoIndisponivel
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class TabelaDecisoesTests(TestCase):
+    """Testes da tabela de decisões em memória"""
+
+    def setUp(self):
+        tabela_decisoes.invalidar()
+
+    def tearDown(self):
+        tabela_decisoes.invalidar()
+
+    def test_decisoes_iniciais_semeadas(self):
+        """Testa que as três decisões originais vêm da migração"""
+        titulos = [efeito.titulo for efeito in obter_tabela_decisoes().ordenadas]
+        self.assertEqual(titulos, [
+            'Investir em Marketing Agressivo',
+            'Contratar Engenheiro Sênior',
+            'Não fazer nada (Economizar)',
+        ])
+
+    def test_efeito_por_titulo(self):
+        """Testa a consulta do efeito pelo título"""
+        efeito = obter_tabela_decisoes().efeito('Contratar Engenheiro Sênior')
+        self.assertEqual(efeito.custo, Decimal('8000.00'))
+        self.assertEqual(efeito.valuation, Decimal('25000.00'))
+        self.assertEqual(efeito.funcionarios, 1)
+
+    def test_decisao_desconhecida_neutra(self):
+        """Testa que decisões desconhecidas não têm efeito"""
+        self.assertIs(obter_tabela_decisoes().efeito('Inexistente'), EFEITO_NEUTRO)
+
+    def test_tabela_quente_sem_consultas(self):
+        """Testa que a tabela carregada não consulta o banco"""
+        obter_tabela_decisoes()
+        with self.assertNumQueries(0):
+            obter_tabela_decisoes().efeito('Investir em Marketing Agressivo')
+
+    def test_edicao_invalida_tabela(self):
+        """Testa que editar uma decisão reflete no próximo turno"""
+        obter_tabela_decisoes()
+        decisao = Decisao.objects.get(titulo='Investir em Marketing Agressivo')
+        decisao.custo = Decimal('6000.00')
+        decisao.save()
+
+        efeito = obter_tabela_decisoes().efeito('Investir em Marketing Agressivo')
+        self.assertEqual(efeito.custo, Decimal('6000.00'))
+
+    def test_edicao_vale_em_outro_worker(self):
+        """Testa que a edição feita em um processo chega à cópia de outro pela versão compartilhada"""
+        outro_worker = CatalogoEmMemoria('decisoes', tabela_decisoes._construir)
+        outro_worker.obter()
+        versao = outro_worker.versao
+
+        decisao = Decisao.objects.get(titulo='Investir em Marketing Agressivo')
+        decisao.custo = Decimal('6000.00')
+        decisao.save()
+
+        self.assertNotEqual(outro_worker.versao, versao)
+        self.assertEqual(outro_worker.versao, tabela_decisoes.versao)
+        efeito = outro_worker.obter().efeito('Investir em Marketing Agressivo')
+        self.assertEqual(efeito.custo, Decimal('6000.00'))
+
+    @override_settings(CATALOGO_VALIDADE=0)
+    def test_copia_vencida_recarregada(self):
+        """Testa que, sem aviso de outro processo, a cópia local vence após CATALOGO_VALIDADE"""
+        obter_tabela_decisoes()
+        Decisao.objects.filter(titulo='Investir em Marketing Agressivo').update(custo=Decimal('6000.00'))
+
+        efeito = obter_tabela_decisoes().efeito('Investir em Marketing Agressivo')
+        self.assertEqual(efeito.custo, Decimal('6000.00'))
+
+    def test_decisao_inativa_fora_da_tabela(self):
+        """Testa que decisões desativadas saem do catálogo"""
+        Decisao.objects.filter(titulo='Não fazer nada (Economizar)').update(ativa=False)
+        tabela_decisoes.invalidar()
+
+        self.assertNotIn('Não fazer nada (Economizar)', obter_tabela_decisoes().por_titulo)
+
+
+class PreCondicoesDecisaoTests(TestCase):
+    """Testes das pré-condições das decisões no turno e na tela do jogo"""
+
+    def setUp(self):
+        tabela_decisoes.invalidar()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('30000.00'))
+        Decisao.objects.create(
+            titulo='Abrir Escritório',
+            nome_curto='Escritório',
+            descricao='Sede própria para o time.',
+            icone='🏢',
+            custo=Decimal('10000.00'),
+            turno_minimo=3,
+            funcionarios_minimos=2,
+            mensagem='Escritório aberto!',
+        )
+
+    def tearDown(self):
+        tabela_decisoes.invalidar()
+
+    def test_decisao_bloqueada_antes_do_turno_minimo(self):
+        """Testa que o TurnEngine recusa decisões cujas pré-condições não foram atendidas"""
+        with self.assertRaises(DecisaoIndisponivel):
+            TurnEngine(self.partida).jogar('Abrir Escritório')
+
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.turno_atual, 1)
+
+    def test_decisao_liberada_com_pre_condicoes(self):
+        """Testa que a decisão é aplicada quando as pré-condições são atendidas"""
+        self.startup.turno_atual = 3
+        self.startup.funcionarios = 2
+        self.startup.save()
+
+        TurnEngine(self.partida).jogar('Abrir Escritório')
+
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.saldo_caixa, Decimal('20000.00'))
+
+    def test_cards_renderizados_do_catalogo(self):
+        """Testa que a tela do jogo exibe apenas as decisões disponíveis"""
+        self.client = Client()
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('carregar_jogo', args=[self.partida.id]))
+        self.assertContains(response, 'value="Investir em Marketing Agressivo"')
+        self.assertNotContains(response, 'value="Abrir Escritório"')
+
+        Startup.objects.filter(pk=self.startup.pk).update(turno_atual=3, funcionarios=2)
+        response = self.client.get(reverse('carregar_jogo', args=[self.partida.id]))
+        self.assertContains(response, 'value="Abrir Escritório"')
+        self.assertContains(response, '- R$ 10.000 custo')
@@ -0,0 +1,104 @@
+"""
+Testes das estatísticas de perfil (UserStats)
+Cobre a manutenção incremental pelo turno e pelos sinais e a leitura no perfil
+"""
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Conquista, ConquistaDesbloqueada, LeaderboardEntry, Partida, Startup, Turma, UserStats
+from core.services.estatisticas import recalcular_stats
+from core.services.turno import TurnEngine, simulate_turns
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class UserStatsTests(TestCase):
+    """Testes do resumo por usuário"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.client.force_login(self.user)
+        self.client.post(reverse('nova_partida'), {'nome_empresa': 'Empresa'})
+        self.partida = Partida.objects.get(usuario=self.user)
+
+    def _stats(self):
+        return UserStats.objects.get(pk=self.user.pk)
+
+    def test_igual_ao_recalculo(self):
+        """Testa que a manutenção incremental chega aos mesmos números do recálculo"""
+        TurnEngine(self.partida).jogar('Contratar Engenheiro Sênior')
+        simulate_turns(self.partida, ['Investir em Marketing Agressivo'] * 3)
+        outra = Partida.objects.create(usuario=self.user, nome_empresa='Outra', ativa=False)
+        Startup.objects.create(partida=outra, saldo_caixa=Decimal('10.00'))
+
+        incremental = self._stats()
+        recalculado = recalcular_stats(self.user.pk)
+        for campo in ['total_partidas', 'partidas_ativas', 'total_conquistas', 'maior_saldo', 'maior_valuation', 'maior_turno']:
+            self.assertEqual(getattr(incremental, campo), getattr(recalculado, campo), campo)
+        self.assertEqual(incremental.total_partidas, 2)
+        self.assertEqual(incremental.partidas_finalizadas, 1)
+        self.assertEqual(incremental.maior_turno, 5)
+
+    def test_segunda_partida_sem_sinais(self):
+        """Testa que a criação pela view grava ranking e estatísticas iguais aos recalculados"""
+        with self.assertNumQueries(10):
+            self.client.post(reverse('nova_partida'), {'nome_empresa': 'Segunda'})
+        segunda = Partida.objects.get(usuario=self.user, nome_empresa='Segunda')
+
+        entrada = LeaderboardEntry.objects.get(pk=segunda.pk)
+        self.assertEqual((entrada.total_conquistas, entrada.pontuacao_conquistas, entrada.saldo_caixa), (1, 10, Decimal('30000.00')))
+        self.assertEqual(entrada.categoria, 'ESTUDANTE_UNIVERSITARIO')
+        incremental = self._stats()
+        recalculado = recalcular_stats(self.user.pk)
+        for campo in ['total_partidas', 'partidas_ativas', 'total_conquistas', 'maior_saldo', 'maior_turno']:
+            self.assertEqual(getattr(incremental, campo), getattr(recalculado, campo), campo)
+        self.assertEqual(incremental.total_partidas, 2)
+
+    def test_recordes_nao_diminuem(self):
+        """Testa que gastar caixa não reduz o recorde de saldo"""
+        TurnEngine(self.partida).jogar('Contratar Engenheiro Sênior')
+        self.assertEqual(self._stats().maior_saldo, Decimal('30000.00'))
+
+    def test_partida_encerrada(self):
+        """Testa que encerrar uma partida atualiza as ativas"""
+        self.partida.ativa = False
+        self.partida.save()
+        self.assertEqual(self._stats().partidas_ativas, 0)
+
+    def test_conquista_removida(self):
+        """Testa que conquistas removidas pelo admin são descontadas"""
+        total = self._stats().total_conquistas
+        conquista = Conquista.objects.create(titulo='Manual', descricao='Dada pelo admin', tipo='social')
+        desbloqueio = ConquistaDesbloqueada.objects.create(partida=self.partida, conquista=conquista)
+        self.assertEqual(self._stats().total_conquistas, total + 1)
+
+        desbloqueio.delete()
+        self.assertEqual(self._stats().total_conquistas, total)
+
+    def test_perfil_uma_consulta(self):
+        """Testa que o perfil lê o resumo e a turma com uma consulta"""
+        turma = Turma.objects.create(
+            codigo='ABC-123',
+            nome='Turma',
+            educador=User.objects.create_user(username='edu', password='x', categoria='EDUCADOR_NEGOCIOS'),
+        )
+        User.objects.filter(pk=self.user.pk).update(turma=turma)
+
+        # Sessão, usuário, ETag e o resumo com a turma
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('perfil'))
+        self.assertEqual(response.context['total_partidas'], 1)
+        self.assertEqual(response.context['turma'], turma)
+
+    def test_resumo_ausente_recalculado(self):
+        """Testa que usuários sem resumo têm a linha criada na primeira visita"""
+        UserStats.objects.all().delete()
+        response = self.client.get(reverse('perfil'))
+        self.assertEqual(response.context['total_partidas'], 1)
+        self.assertTrue(UserStats.objects.filter(pk=self.user.pk).exists())
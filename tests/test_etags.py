@@ -0,0 +1,116 @@
+"""
+Testes do GET condicional (ETag)
+Cobre o 304 das páginas de leitura e as mudanças que invalidam o ETag
+"""
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Conquista, ConquistaDesbloqueada, Partida, Startup
+from core.services.turno import TurnEngine
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class ETagTests(TestCase):
+    """Testes das respostas 304 Not Modified"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('3000.00'))
+        self.client.force_login(self.user)
+
+    def _etag(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        return response['ETag']
+
+    def test_jogo_nao_modificado(self):
+        """Testa que a página do jogo responde 304 sem renderizar nem consultar a partida inteira"""
+        url = reverse('carregar_jogo', args=[self.partida.id])
+        etag = self._etag(url)
+
+        # Sessão, usuário e a consulta do ETag
+        with self.assertNumQueries(3):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_turno_muda_etag_do_jogo(self):
+        """Testa que um turno gera um novo ETag para o jogo e o perfil"""
+        jogo = reverse('carregar_jogo', args=[self.partida.id])
+        etag_jogo = self._etag(jogo)
+        etag_perfil = self._etag(reverse('perfil'))
+
+        TurnEngine(self.partida).jogar('Não fazer nada (Economizar)')
+
+        self.assertEqual(self.client.get(jogo, HTTP_IF_NONE_MATCH=etag_jogo).status_code, 200)
+        self.assertEqual(self.client.get(reverse('perfil'), HTTP_IF_NONE_MATCH=etag_perfil).status_code, 200)
+
+    def test_mensagens_pendentes_renderizam(self):
+        """Testa que avisos na sessão nunca são escondidos por um 304"""
+        url = reverse('carregar_jogo', args=[self.partida.id])
+        etag = self._etag(url)
+
+        # Decisão recusada: nada muda na startup, mas há um aviso a exibir
+        self.client.post(reverse('salvar_jogo', args=[self.partida.id]), {'decisao': 'Contratar Engenheiro Sênior'})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Saldo insuficiente')
+
+        # Com os avisos exibidos, o ETag volta a valer
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_novo_login_renderiza_com_novo_csrf(self):
+        """Testa que, após sair e entrar de novo, a página volta com o token CSRF novo em vez de 304"""
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.login(username='player', password='pass123')
+        url = reverse('carregar_jogo', args=[self.partida.id])
+        etag = self._etag(url)
+
+        self.client.logout()
+        self.client.login(username='player', password='pass123')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # O token da página nova é aceito
+        token = response.context['csrf_token']
+        response = self.client.post(
+            reverse('salvar_jogo', args=[self.partida.id]),
+            {'decisao': 'Não fazer nada (Economizar)', 'csrfmiddlewaretoken': str(token)},
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_paginas_do_jogador(self):
+        """Testa histórico, conquistas e perfil sem mudanças"""
+        for nome in ['historico', 'conquistas', 'perfil']:
+            etag = self._etag(reverse(nome))
+            self.assertEqual(self.client.get(reverse(nome), HTTP_IF_NONE_MATCH=etag).status_code, 304, nome)
+
+    def test_conquista_pelo_admin_muda_etag(self):
+        """Testa que uma conquista gravada fora do turno invalida a página de conquistas"""
+        etag = self._etag(reverse('conquistas'))
+        conquista = Conquista.objects.create(titulo='Manual', descricao='Dada pelo admin', tipo='social')
+        ConquistaDesbloqueada.objects.create(partida=self.partida, conquista=conquista)
+
+        self.assertEqual(self.client.get(reverse('conquistas'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_ranking(self):
+        """Testa que o ranking muda com turnos de outros jogadores e com os filtros"""
+        outro = User.objects.create_user(username='outro', password='pass123', categoria='ESTUDANTE_UNIVERSITARIO')
+        partida = Partida.objects.create(usuario=outro, nome_empresa='Outra')
+        Startup.objects.create(partida=partida, saldo_caixa=Decimal('30000.00'))
+
+        url = reverse('ranking')
+        etag = self._etag(url)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotEqual(self._etag(url, criterio='saldo'), etag)
+
+        TurnEngine(partida).jogar('Não fazer nada (Economizar)')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
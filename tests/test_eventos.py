@@ -0,0 +1,180 @@
+"""
+Testes do motor de eventos aleatórios
+Cobre a tabela de probabilidades, o sorteio determinístico e a aplicação no turno
+"""
+import random
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Evento, EventoPartida, Partida, Startup
+from core.rng import PartidaRNG
+from core.services.catalogo import CatalogoEmMemoria
+from core.services.eventos import TabelaEventos, obter_tabela_eventos, tabela_eventos
+from core.services.turno import TurnEngine, simulate_turns
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class RngFixo:
+    """Gerador que devolve sempre o mesmo número"""
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def random(self):
+        return self.valor
+
+
+class TabelaEventosTests(TestCase):
+    """Testes da tabela de probabilidades em memória"""
+
+    def setUp(self):
+        tabela_eventos.invalidar()
+        self.crise = Evento.objects.create(
+            titulo='Crise de Mercado',
+            descricao='O mercado esfriou.',
+            categoria=Evento.Categoria.MERCADO,
+            chance_base=Decimal('0.200'),
+            impacto_valuation=Decimal('-5000.00'),
+        )
+        self.investidor = Evento.objects.create(
+            titulo='Investidor Anjo',
+            descricao='Um investidor apostou na ideia.',
+            categoria=Evento.Categoria.INVESTIMENTO,
+            chance_base=Decimal('0.300'),
+            impacto_saldo=Decimal('10000.00'),
+            turno_minimo=5,
+        )
+
+    def tearDown(self):
+        tabela_eventos.invalidar()
+
+    def test_faixas_por_turno_minimo(self):
+        """Testa que cada faixa libera apenas os eventos do seu turno mínimo"""
+        tabela = obter_tabela_eventos()
+        self.assertEqual(tabela.limites, (1, 5))
+
+        # Turno 3: só a crise (chance 0.2)
+        self.assertEqual(tabela.sortear(3, RngFixo(0.1)).titulo, 'Crise de Mercado')
+        self.assertIsNone(tabela.sortear(3, RngFixo(0.3)))
+
+        # Turno 5: crise [0, 0.2) e investidor [0.2, 0.5)
+        self.assertEqual(tabela.sortear(5, RngFixo(0.3)).titulo, 'Investidor Anjo')
+        self.assertIsNone(tabela.sortear(5, RngFixo(0.6)))
+
+    def test_chances_normalizadas_acima_de_um(self):
+        """Testa que chances somando mais de 1 sempre disparam um evento"""
+        eventos = [
+            Evento(pk=1, titulo='A', descricao='', chance_base=Decimal('0.8'), turno_minimo=1),
+            Evento(pk=2, titulo='B', descricao='', chance_base=Decimal('0.8'), turno_minimo=1),
+        ]
+        tabela = TabelaEventos(eventos)
+        self.assertEqual(tabela.sortear(1, RngFixo(0.49)).titulo, 'A')
+        self.assertEqual(tabela.sortear(1, RngFixo(0.99)).titulo, 'B')
+
+    def test_sem_eventos_antes_do_primeiro_turno_minimo(self):
+        """Testa que turnos anteriores a qualquer evento não sorteiam nada"""
+        Evento.objects.filter(pk=self.crise.pk).update(ativo=False)
+        tabela_eventos.invalidar()
+        self.assertIsNone(obter_tabela_eventos().sortear(4, RngFixo(0.0)))
+
+    def test_tabela_quente_sem_consultas(self):
+        """Testa que o sorteio com a tabela carregada não consulta o banco"""
+        obter_tabela_eventos()
+        with self.assertNumQueries(0):
+            obter_tabela_eventos().sortear(10, random.Random(1))
+
+    def test_edicao_invalida_tabela(self):
+        """Testa que editar um evento reflete no próximo sorteio"""
+        obter_tabela_eventos()
+        self.crise.turno_minimo = 2
+        self.crise.save()
+        self.assertEqual(obter_tabela_eventos().limites, (2, 5))
+
+    def test_edicao_vale_em_outro_worker(self):
+        """Testa que a edição feita em um processo chega à tabela de outro"""
+        outro_worker = CatalogoEmMemoria('eventos', tabela_eventos._construir)
+        self.assertEqual(outro_worker.obter().limites, (1, 5))
+        self.crise.turno_minimo = 2
+        self.crise.save()
+        self.assertEqual(outro_worker.obter().limites, (2, 5))
+
+    def test_sorteio_deterministico(self):
+        """Testa que a mesma partida e turno repetem o sorteio"""
+        tabela = obter_tabela_eventos()
+        primeiro = [tabela.sortear(t, PartidaRNG(7).eventos(t)) for t in range(1, 30)]
+        segundo = [tabela.sortear(t, PartidaRNG(7).eventos(t)) for t in range(1, 30)]
+        self.assertEqual(primeiro, segundo)
+
+
+class EventosNoTurnoTests(TestCase):
+    """Testes da aplicação dos eventos pelo TurnEngine"""
+
+    def setUp(self):
+        tabela_eventos.invalidar()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(
+            partida=self.partida,
+            saldo_caixa=Decimal('30000.00'),
+            receita_mensal=Decimal('1000.00'),
+        )
+        self.evento = Evento.objects.create(
+            titulo='Churn de Clientes',
+            descricao='Clientes cancelaram contratos.',
+            categoria=Evento.Categoria.RISCO,
+            chance_base=Decimal('1.000'),
+            impacto_saldo=Decimal('-3000.00'),
+            impacto_receita=Decimal('-5000.00'),
+            impacto_funcionarios=-2,
+        )
+
+    def tearDown(self):
+        tabela_eventos.invalidar()
+
+    def test_evento_aplicado_e_registrado(self):
+        """Testa que o evento entra no mesmo turno e é gravado em EventoPartida"""
+        resultado = TurnEngine(self.partida).jogar('Não fazer nada (Economizar)')
+
+        self.assertEqual(resultado.evento.titulo, 'Churn de Clientes')
+        self.startup.refresh_from_db()
+        # 30000 + 1000 de receita - 3000 do evento
+        self.assertEqual(self.startup.saldo_caixa, Decimal('28000.00'))
+        # Receita e equipe não ficam negativas
+        self.assertEqual(self.startup.receita_mensal, Decimal('0.00'))
+        self.assertEqual(self.startup.funcionarios, 0)
+        self.assertEqual(resultado.startup.receita_mensal, self.startup.receita_mensal)
+
+        ocorrencia = EventoPartida.objects.get(partida=self.partida)
+        self.assertEqual(ocorrencia.turno, 2)
+        self.assertTrue(ocorrencia.resolvido)
+
+    def test_evento_na_simulacao(self):
+        """Testa que a simulação em lote grava todos os eventos com um bulk_create"""
+        resultado = simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 3)
+
+        self.assertEqual(len(resultado.eventos), 3)
+        self.assertEqual(
+            list(EventoPartida.objects.filter(partida=self.partida).values_list('turno', flat=True)),
+            [2, 3, 4],
+        )
+        self.startup.refresh_from_db()
+        # 31000 - 3000, depois receita zerada: -3000 por turno
+        self.assertEqual(self.startup.saldo_caixa, Decimal('22000.00'))
+
+    def test_mensagem_do_evento(self):
+        """Testa que o jogador é avisado do evento na tela do jogo"""
+        client = Client()
+        client.force_login(self.user)
+        response = client.post(
+            reverse('salvar_jogo', args=[self.partida.id]),
+            {'decisao': 'Não fazer nada (Economizar)'},
+            follow=True,
+        )
+        self.assertContains(response, 'Evento: Churn de Clientes')
@@ -74,7 +74,7 @@ class PerformanceTests(TestCase):
         self.client.login(username='user0', password='testpass123')
         
         # Conta número de queries
-        with self.assertNumQueries(5):  # Ajustado conforme execução atual
+        with self.assertNumQueries(5):  # Ranking lido de LeaderboardEntry, mais o ETag
             response = self.client.get(reverse('ranking'))
     
     def test_dashboard_loads_quickly(self):
@@ -5,6 +5,7 @@ Cobre CadastroUsuarioForm, EditarPerfilForm e validações.
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from decimal import Decimal
+from unittest.mock import patch
 
 from core.forms import CadastroUsuarioForm, EditarPerfilForm
 from core.models import User
@@ -383,6 +384,62 @@ class CadastroUsuarioFormTestCase(TestCase):
         self.assertEqual(user.documento, '12345678000195')
         self.assertEqual(user.tipo_documento, 'CNPJ')
 
+    def _dados_educador(self, **extras):
+        dados = {
+            'username': 'educador',
+            'email': 'educador@test.com',
+            'password1': 'SenhaSegura123!@',
+            'password2': 'SenhaSegura123!@',
+            'first_name': 'Dr. Educador',
+            'categoria': 'EDUCADOR_NEGOCIOS',
+            'cpf': '12345678901',
+            'nome_instituicao': 'UFMG',
+        }
+        dados.update(extras)
+        return dados
+
+    def test_username_duplicado_sem_diferenciar_maiusculas(self):
+        """'Existente' colide com 'existente'"""
+        User.objects.create_user(username='existente', password='pass')
+
+        form = CadastroUsuarioForm(data=self._dados_educador(username='Existente'))
+        self.assertFalse(form.is_valid())
+        self.assertIn('username', form.errors)
+
+    def test_todos_os_conflitos_de_uma_vez(self):
+        """Usuário, e-mail e CPF repetidos aparecem juntos, em uma única consulta"""
+        User.objects.create_user(username='educador', email='EDUCADOR@test.com', password='pass', documento='12345678901')
+
+        form = CadastroUsuarioForm(data=self._dados_educador())
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(set(form.errors), {'username', 'email', 'cpf'})
+
+    def test_username_invalido_para_o_modelo(self):
+        """O validador de username do modelo continua valendo com a unicidade excluída"""
+        # Sem a checagem do próprio formulário, só o modelo recusa o espaço
+        with patch.object(CadastroUsuarioForm, 'clean_username', lambda form: form.cleaned_data['username']):
+            form = CadastroUsuarioForm(data=self._dados_educador(username='nome com espaço'))
+            self.assertFalse(form.is_valid())
+        self.assertIn('username', form.errors)
+
+    def test_email_acima_do_tamanho_do_modelo(self):
+        """Um e-mail maior que o campo do modelo é recusado no formulário, não no banco"""
+        email = 'a' * 250 + '@test.com'
+        form = CadastroUsuarioForm(data=self._dados_educador(email=email))
+        self.assertFalse(form.is_valid())
+        self.assertIn('email', form.errors)
+
+    def test_cnpj_duplicado(self):
+        """O CNPJ já usado como documento é recusado"""
+        User.objects.create_user(username='empresa', password='pass', documento='12345678000195')
+
+        form = CadastroUsuarioForm(data=self._dados_educador(
+            categoria='PROFISSIONAL_CORPORATIVO', cnpj='12345678000195', nome_empresa='Tech Solutions',
+        ))
+        self.assertFalse(form.is_valid())
+        self.assertIn('cnpj', form.errors)
+
 
 class EditarPerfilFormTestCase(TestCase):
     """Testes para EditarPerfilForm"""
@@ -11,6 +11,7 @@ from django.urls import reverse
 
 from core.forms import CadastroUsuarioForm, EditarPerfilForm
 from core.models import Partida, Startup, Turma, HistoricoDecisao
+from core.services.cadastro import Conflitos, conflitos
 from core.views import formatar_moeda_br
 
 User = get_user_model()
@@ -251,6 +252,22 @@ class ViewsFullCoverageTestCase(TestCase):
         resp = self.client.post(reverse('registro'), data)
         self.assertEqual(resp.status_code, 302)
 
+    def test_registro_concorrente_mostra_conflito(self):
+        # O outro cadastro entra depois da verificação: o índice recusa o INSERT
+        User.objects.create_user(username='outro', email='NOVO@test.com', password='pass')
+        data = base_user_data(username='novo_user', email='novo@test.com', categoria='ASPIRANTE_EMPREENDEDOR',
+                              cpf='12345678901', area_atuacao='Tecnologia')
+        verificacoes = [Conflitos()]
+
+        def conflitos_atrasados(*args):
+            return verificacoes.pop() if verificacoes else conflitos(*args)
+
+        with patch('core.forms.conflitos', side_effect=conflitos_atrasados):
+            resp = self.client.post(reverse('registro'), data)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('email', resp.context['form'].errors)
+        self.assertFalse(User.objects.filter(username='novo_user').exists())
+
     def test_salvar_jogo_partida_ativa_false(self):
         partida = Partida.objects.create(usuario=self.student, nome_empresa='Empresa X', ativa=False)
         self.client.force_login(self.student)
@@ -0,0 +1,92 @@
+"""
+Testes dos perfis de hash de senha (core/hashers.py) e do benchmark_hash.
+"""
+import os
+import subprocess
+import sys
+from importlib.util import find_spec
+from io import StringIO
+from unittest import skipIf
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, identify_hasher
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.hashers import PBKDF2Calibrado
+
+User = get_user_model()
+
+HASHERS_TESTE = ['core.hashers.PBKDF2Calibrado', 'django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+@override_settings(PASSWORD_HASHERS=HASHERS_TESTE, HASH_PBKDF2_ITERACOES=1000)
+class PerfilHashTestCase(TestCase):
+    """Custo configurável e novo hash transparente no login"""
+
+    def _iteracoes(self, usuario):
+        usuario.refresh_from_db()
+        return identify_hasher(usuario.password).decode(usuario.password)['iterations']
+
+    def test_iteracoes_das_settings(self):
+        """O hash usa as iterações de HASH_PBKDF2_ITERACOES"""
+        usuario = User.objects.create_user(username='aluno', password='SenhaSegura123!@')
+        self.assertEqual(self._iteracoes(usuario), 1000)
+
+    def test_sem_iteracoes_usa_padrao_do_django(self):
+        """Sem HASH_PBKDF2_ITERACOES vale o custo padrão do Django"""
+        with self.settings(HASH_PBKDF2_ITERACOES=None):
+            self.assertEqual(PBKDF2Calibrado().iterations, PBKDF2PasswordHasher.iterations)
+
+    def test_login_refaz_hash_com_novo_custo(self):
+        """Depois de aumentar o custo, o próximo login regrava a senha com as novas iterações"""
+        usuario = User.objects.create_user(username='aluno', password='SenhaSegura123!@')
+        with self.settings(HASH_PBKDF2_ITERACOES=2000):
+            response = Client().post(reverse('login'), {'username': 'aluno', 'password': 'SenhaSegura123!@'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._iteracoes(usuario), 2000)
+
+    def test_login_migra_hash_de_outro_hasher(self):
+        """Senhas de um hasher antigo ainda entram e passam para o hasher do perfil"""
+        with self.settings(PASSWORD_HASHERS=HASHERS_TESTE[::-1]):
+            usuario = User.objects.create_user(username='aluno', password='SenhaSegura123!@')
+        self.assertTrue(Client().login(username='aluno', password='SenhaSegura123!@'))
+        usuario.refresh_from_db()
+        self.assertTrue(usuario.password.startswith('pbkdf2_sha256$1000$'))
+
+
+class BenchmarkHashTestCase(TestCase):
+    """Comando de medição dos perfis"""
+
+    def test_mede_cada_configuracao(self):
+        """Uma linha por configuração, com logins por núcleo e núcleos para o pico"""
+        saida = StringIO()
+        call_command('benchmark_hash', '--iteracoes', '100', '200', '--segundos', '0.01', stdout=saida)
+        linhas = saida.getvalue().splitlines()
+        self.assertEqual(len(linhas), 3)
+        self.assertTrue(linhas[1].startswith('PBKDF2 100 iterações'))
+
+
+class PerfilHashSettingsTestCase(TestCase):
+    """Perfil inválido ou sem dependência falha ao carregar as settings"""
+
+    def _carregar_settings(self, perfil):
+        ambiente = {**os.environ, 'PERFIL_HASH': perfil}
+        return subprocess.run(
+            [sys.executable, '-c', 'import config.settings'],
+            cwd=settings.BASE_DIR, env=ambiente, capture_output=True, text=True,
+        )
+
+    @skipIf(find_spec('argon2'), 'argon2-cffi instalado')
+    def test_argon2_sem_argon2_cffi(self):
+        """Sem argon2-cffi, o perfil argon2 impede a inicialização"""
+        resultado = self._carregar_settings('argon2')
+        self.assertNotEqual(resultado.returncode, 0)
+        self.assertIn('argon2-cffi', resultado.stderr)
+
+    def test_perfil_desconhecido(self):
+        resultado = self._carregar_settings('md5')
+        self.assertNotEqual(resultado.returncode, 0)
+        self.assertIn('ImproperlyConfigured', resultado.stderr)
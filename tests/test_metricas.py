@@ -0,0 +1,100 @@
+"""
+Testes da série histórica de métricas
+Cobre a gravação por turno, o LTTB e o endpoint de colunas para os gráficos
+"""
+import math
+
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Partida, Startup, StartupMetricaTurno
+from core.services.metricas import lttb, metrica_de, serie_metricas
+from core.services.turno import TurnEngine, simulate_turns
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class LttbTests(TestCase):
+    """Testes da redução de pontos"""
+
+    def test_serie_curta_intacta(self):
+        """Testa que séries menores que o limite não são reduzidas"""
+        self.assertEqual(lttb([1, 2, 3], [5, 6, 7], 10), [0, 1, 2])
+
+    def test_limite_e_extremos(self):
+        """Testa que o resultado respeita o limite e mantém o primeiro e o último ponto"""
+        xs = list(range(1000))
+        ys = [math.sin(x / 20) for x in xs]
+        indices = lttb(xs, ys, 100)
+
+        self.assertEqual(len(indices), 100)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], 999)
+        self.assertEqual(indices, sorted(set(indices)))
+
+    def test_mantem_pico(self):
+        """Testa que um pico isolado sobrevive à redução"""
+        xs = list(range(500))
+        ys = [0.0] * 500
+        ys[250] = 100.0
+        self.assertIn(250, lttb(xs, ys, 50))
+
+
+class SerieMetricasTests(TestCase):
+    """Testes da gravação e leitura da série"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('900000.00'))
+        metrica_de(self.startup).save()
+        self.client.force_login(self.user)
+
+    def test_turno_grava_metrica(self):
+        """Testa que cada turno acrescenta uma linha com o estado gravado"""
+        TurnEngine(self.partida).jogar('Contratar Engenheiro Sênior')
+        simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 3)
+
+        serie = serie_metricas(self.partida.id)
+        self.assertEqual(serie['turno'], [1, 2, 3, 4, 5])
+        self.assertEqual(serie['funcionarios'], [1, 2, 2, 2, 2])
+        self.assertEqual(serie['valuation'][1], 25000.0)
+        self.startup.refresh_from_db()
+        self.assertEqual(serie['saldo_caixa'][-1], float(self.startup.saldo_caixa))
+
+    def test_nova_partida_grava_primeiro_ponto(self):
+        """Testa que a criação da partida registra o turno 1"""
+        self.client.post(reverse('nova_partida'), {'nome_empresa': 'Nova'})
+        partida = Partida.objects.get(nome_empresa='Nova')
+        self.assertEqual(list(partida.metricas.values_list('turno', flat=True)), [1])
+
+    def test_endpoint_reduz_partida_longa(self):
+        """Testa que uma partida de 1000 turnos envia no máximo `pontos` turnos alinhados"""
+        simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 500)
+        simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 499)
+        self.assertEqual(StartupMetricaTurno.objects.filter(partida=self.partida).count(), 1000)
+
+        response = self.client.get(reverse('metricas_serie', args=[self.partida.id]), {'pontos': 200})
+        serie = response.json()
+        self.assertEqual(len(serie['turno']), 200)
+        self.assertEqual(serie['turno'][0], 1)
+        self.assertEqual(serie['turno'][-1], 1000)
+        self.assertEqual(len(serie['saldo_caixa']), 200)
+
+    def test_endpoint_referencia_invalida(self):
+        """Testa que métricas desconhecidas são recusadas"""
+        response = self.client.get(reverse('metricas_serie', args=[self.partida.id]), {'referencia': 'senha'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_endpoint_apenas_do_dono(self):
+        """Testa que outro jogador não vê a série"""
+        outro = User.objects.create_user(username='outro', password='pass123', categoria='ESTUDANTE_UNIVERSITARIO')
+        self.client.force_login(outro)
+        response = self.client.get(reverse('metricas_serie', args=[self.partida.id]))
+        self.assertEqual(response.status_code, 404)
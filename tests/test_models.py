@@ -105,3 +105,76 @@ class TurmaModelTests(TestCase):
         Turma.objects.create(codigo='ABC-123', nome='Turma 1', educador=self.educador)
         with self.assertRaises(Exception):
             Turma.objects.create(codigo='ABC-123', nome='Turma 2', educador=self.educador)
+
+
+class UserTurmaTests(TestCase):
+    """Testes do vínculo User.turma resolvido a partir do código"""
+
+    def setUp(self):
+        self.educador = User.objects.create_user(
+            username='educador',
+            password='testpass123',
+            categoria='EDUCADOR_NEGOCIOS'
+        )
+        self.turma = Turma.objects.create(codigo='ABC-123', nome='Turma', educador=self.educador)
+
+    def test_codigo_resolve_turma(self):
+        """Testa que o código informado (em qualquer caixa) vincula a turma"""
+        aluno = User.objects.create_user(
+            username='aluno',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='abc-123'
+        )
+        self.assertEqual(aluno.codigo_turma, 'ABC-123')
+        self.assertEqual(aluno.turma, self.turma)
+
+    def test_codigo_inexistente_sem_turma(self):
+        """Testa que um código sem turma cadastrada deixa a FK vazia"""
+        aluno = User.objects.create_user(
+            username='aluno',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='XYZ-999'
+        )
+        self.assertIsNone(aluno.turma)
+
+    def test_turma_criada_depois_vincula_alunos(self):
+        """Testa que criar a turma vincula usuários que já tinham o código"""
+        aluno = User.objects.create_user(
+            username='aluno',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='XYZ-999'
+        )
+        turma = Turma.objects.create(codigo='XYZ-999', nome='Nova', educador=self.educador)
+
+        aluno.refresh_from_db()
+        self.assertEqual(aluno.turma, turma)
+
+    def test_troca_e_remocao_de_codigo(self):
+        """Testa que mudar ou apagar o código atualiza a FK"""
+        outra = Turma.objects.create(codigo='DEF-456', nome='Outra', educador=self.educador)
+        aluno = User.objects.create_user(
+            username='aluno',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='ABC-123'
+        )
+        aluno = User.objects.get(pk=aluno.pk)
+
+        aluno.codigo_turma = 'DEF-456'
+        aluno.save()
+        self.assertEqual(User.objects.get(pk=aluno.pk).turma, outra)
+
+        aluno.codigo_turma = ''
+        aluno.save(update_fields=['codigo_turma'])
+        self.assertIsNone(User.objects.get(pk=aluno.pk).turma)
+
+    def test_save_sem_mudanca_nao_consulta_turma(self):
+        """Testa que salvar sem trocar o código não busca a turma de novo"""
+        aluno = User.objects.create_user(
+            username='aluno',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='ABC-123'
+        )
+        aluno = User.objects.get(pk=aluno.pk)
+        aluno.first_name = 'Ana'
+        with self.assertNumQueries(2):  # UPDATE do usuário + UPDATE do ranking
+            aluno.save()
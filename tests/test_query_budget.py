@@ -0,0 +1,158 @@
+"""
+Testes do orçamento de consultas por view
+Cada view com @query_budget é exercitada com volume de dados suficiente
+para revelar consultas por item (N+1)
+"""
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Partida, Startup, Turma
+from core.query_budget import (
+    QueryBudgetTestMixin, OrcamentoConsultasExcedido, query_budget, relatorio, limpar_relatorio
+)
+from core.services.turno import TurnEngine
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    """Testes da medição feita pelo middleware"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.client.force_login(self.user)
+        limpar_relatorio()
+
+    def test_relatorio_por_nome_de_url(self):
+        """Testa que as requisições são agregadas pelo nome da URL"""
+        self.client.get(reverse('dashboard'))
+        response = self.client.get(reverse('dashboard'))
+
+        totais = relatorio()['dashboard']
+        self.assertEqual(totais.requisicoes, 2)
+        self.assertEqual(totais.consultas, 2 * response.relatorio_consultas.consultas)
+        self.assertEqual(totais.acima_do_orcamento, 0)
+
+    @override_settings(DEBUG=True)
+    def test_cabecalho_server_timing_em_debug(self):
+        """Testa que o cabeçalho Server-Timing é enviado em DEBUG"""
+        response = self.client.get(reverse('dashboard'))
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    @override_settings(DEBUG=False)
+    def test_sem_cabecalho_fora_de_debug(self):
+        """Testa que o cabeçalho não é enviado em produção"""
+        response = self.client.get(reverse('dashboard'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_decorator_preserva_view(self):
+        """Testa que o decorator apenas anota a view"""
+        def view(request):
+            return 'ok'
+        self.assertIs(query_budget(3)(view), view)
+        self.assertEqual(view.query_budget, 3)
+
+    @override_settings(QUERY_BUDGET_ESTRITO=True)
+    def test_modo_estrito_falha_acima_do_orcamento(self):
+        """Testa que o modo estrito falha quando a view excede o orçamento"""
+        from core import views
+        orcamento_original = views.dashboard.query_budget
+        views.dashboard.query_budget = 0
+        try:
+            with self.assertRaises(OrcamentoConsultasExcedido):
+                self.client.get(reverse('dashboard'))
+        finally:
+            views.dashboard.query_budget = orcamento_original
+
+
+class OrcamentoViewsJogadorTests(QueryBudgetTestMixin, TestCase):
+    """Views do jogador dentro do orçamento, com várias partidas e turnos"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partidas = []
+        for i in range(8):
+            partida = Partida.objects.create(usuario=self.user, nome_empresa=f'Empresa {i}')
+            Startup.objects.create(partida=partida, saldo_caixa=Decimal('50000.00'))
+            for _ in range(4):
+                TurnEngine(partida).jogar('Investir em Marketing Agressivo')
+            self.partidas.append(partida)
+        self.client.force_login(self.user)
+
+    def test_paginas_do_jogador(self):
+        """Testa dashboard, perfil, histórico, conquistas, ranking e jogo"""
+        partida = self.partidas[0]
+        for url in [
+            reverse('dashboard'),
+            reverse('perfil'),
+            reverse('historico'),
+            reverse('conquistas'),
+            reverse('ranking'),
+            reverse('carregar_jogo', args=[partida.id]),
+            reverse('metricas', args=[partida.id]),
+            reverse('metricas_serie', args=[partida.id]),
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertSemConsultasRepetidas(response)
+
+    def test_turno_dentro_do_orcamento(self):
+        """Testa que o envio de um turno respeita o orçamento"""
+        response = self.client.post(
+            reverse('salvar_jogo', args=[self.partidas[0].id]),
+            {'decisao': 'Investir em Marketing Agressivo', 'chave_turno': 'a' * 32}
+        )
+        self.assertEqual(response.status_code, 302)
+
+    def test_nova_partida_dentro_do_orcamento(self):
+        """Testa que criar uma partida respeita o orçamento"""
+        response = self.client.post(reverse('nova_partida'), {'nome_empresa': 'Nova'})
+        self.assertEqual(response.status_code, 302)
+
+
+class OrcamentoViewsEducadorTests(QueryBudgetTestMixin, TestCase):
+    """Views do educador dentro do orçamento, com várias turmas e alunos"""
+
+    def setUp(self):
+        self.client = Client()
+        self.educador = User.objects.create_user(
+            username='educador',
+            password='pass123',
+            categoria='EDUCADOR_NEGOCIOS'
+        )
+        for i in range(10):
+            turma = Turma.objects.create(codigo=f'TUR-{i:03d}', nome=f'Turma {i}', educador=self.educador)
+            for j in range(3):
+                aluno = User.objects.create_user(
+                    username=f'aluno{i}_{j}',
+                    password='pass123',
+                    categoria='ESTUDANTE_UNIVERSITARIO',
+                    codigo_turma=turma.codigo
+                )
+                partida = Partida.objects.create(usuario=aluno, nome_empresa=f'Empresa {i}-{j}')
+                Startup.objects.create(partida=partida, valuation=Decimal(10000 * (j + 1)))
+        self.client.force_login(self.educador)
+
+    def test_paginas_do_educador(self):
+        """Testa que as páginas de turmas não consultam por turma"""
+        for url in [
+            reverse('educador_dashboard'),
+            reverse('educador_perfil'),
+            reverse('ranking_turmas'),
+            reverse('metricas_turmas'),
+            reverse('ranking'),
+            reverse('analise_turma', args=['TUR-000']),
+        ]:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
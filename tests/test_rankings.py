@@ -1,9 +1,14 @@
 """
 Testes dos rankings e relatórios
 """
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
-from core.models import User, Startup, Turma, Partida
+from core.models import User, Startup, Turma, Partida, Conquista, ConquistaDesbloqueada, LeaderboardEntry
+from core.services.ranking import reconstruir_ranking
+from core.services.turmas import TurmaStats
+from core.services.turno import TurnEngine, simulate_turns
+from decimal import Decimal
 
 
 class RankingTests(TestCase):
@@ -64,6 +69,156 @@ class RankingTests(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class LeaderboardEntryTests(TestCase):
+    """Testes da tabela desnormalizada do ranking"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='testpass123',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='ABC-123',
+            estado='SP'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('30000.00'))
+
+    def test_entrada_criada_com_a_startup(self):
+        """Testa que a criação da startup adiciona a partida ao ranking"""
+        entrada = LeaderboardEntry.objects.get(partida=self.partida)
+        self.assertEqual(entrada.nome_empresa, 'Empresa')
+        self.assertEqual(entrada.saldo_caixa, Decimal('30000.00'))
+        self.assertEqual(entrada.categoria, 'ESTUDANTE_UNIVERSITARIO')
+        self.assertEqual(entrada.codigo_turma, 'ABC-123')
+        self.assertEqual(entrada.estado, 'SP')
+
+    def test_turno_atualiza_entrada(self):
+        """Testa que o turno atualiza métricas e conquistas na mesma transação"""
+        TurnEngine(self.partida).jogar('Contratar Engenheiro Sênior')
+
+        entrada = LeaderboardEntry.objects.get(partida=self.partida)
+        self.assertEqual(entrada.valuation, Decimal('25000.00'))
+        self.assertEqual(entrada.saldo_caixa, Decimal('22000.00'))
+        self.assertEqual(entrada.turno_atual, 2)
+        self.assertEqual(entrada.funcionarios, 2)
+        primeira = Conquista.objects.get(titulo='Primeira Simulação')
+        self.assertEqual(entrada.total_conquistas, 1)
+        self.assertEqual(entrada.pontuacao_conquistas, primeira.pontos)
+
+    def test_conquistas_em_lote_contadas(self):
+        """Testa que conquistas gravadas em lote entram na pontuação"""
+        self.startup.saldo_caixa = Decimal('99000.00')
+        self.startup.save()
+
+        simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 5)
+
+        entrada = LeaderboardEntry.objects.get(partida=self.partida)
+        desbloqueadas = ConquistaDesbloqueada.objects.filter(partida=self.partida)
+        self.assertEqual(entrada.total_conquistas, desbloqueadas.count())
+        self.assertEqual(entrada.pontuacao_conquistas, sum(d.conquista.pontos for d in desbloqueadas))
+        self.assertEqual(entrada.turno_atual, 6)
+
+    def test_partida_encerrada_sai_do_ranking(self):
+        """Testa que partidas encerradas são removidas do ranking"""
+        self.partida.ativa = False
+        self.partida.save()
+        self.assertFalse(LeaderboardEntry.objects.filter(partida=self.partida).exists())
+
+    def test_mudanca_de_perfil_propagada(self):
+        """Testa que mudanças de turma e região do usuário chegam ao ranking"""
+        self.user.codigo_turma = 'XYZ-999'
+        self.user.estado = 'RJ'
+        self.user.save()
+
+        entrada = LeaderboardEntry.objects.get(partida=self.partida)
+        self.assertEqual(entrada.codigo_turma, 'XYZ-999')
+        self.assertEqual(entrada.estado, 'RJ')
+
+    def test_reconstruir_ranking(self):
+        """Testa que a reconstrução recupera linhas divergentes"""
+        LeaderboardEntry.objects.filter(partida=self.partida).delete()
+
+        self.assertEqual(reconstruir_ranking(), 1)
+        self.assertEqual(LeaderboardEntry.objects.get(partida=self.partida).saldo_caixa, Decimal('30000.00'))
+
+    def test_ranking_usa_tabela_desnormalizada(self):
+        """Testa que a página exibe as linhas do ranking ordenadas"""
+        outro = User.objects.create_user(username='outro', password='testpass123', categoria='ESTUDANTE_UNIVERSITARIO')
+        partida = Partida.objects.create(usuario=outro, nome_empresa='Rival')
+        Startup.objects.create(partida=partida, saldo_caixa=Decimal('90000.00'))
+
+        self.client.login(username='player', password='testpass123')
+        response = self.client.get(reverse('ranking'), {'criterio': 'saldo'})
+
+        nomes = [entrada.nome_empresa for entrada in response.context['startups']]
+        self.assertEqual(nomes, ['Rival', 'Empresa'])
+
+
+class FiltrosRankingCacheTests(TestCase):
+    """Testes do cache das listas de país e estado do ranking"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='testpass123',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            estado='SP'
+        )
+        partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        Startup.objects.create(partida=partida)
+        aspirante = User.objects.create_user(
+            username='aspirante',
+            password='testpass123',
+            categoria='ASPIRANTE_EMPREENDEDOR',
+            estado='BA'
+        )
+        partida = Partida.objects.create(usuario=aspirante, nome_empresa='Outra')
+        Startup.objects.create(partida=partida)
+        self.client.login(username='player', password='testpass123')
+
+    def test_listas_da_audiencia(self):
+        """Testa que as listas consideram apenas a categoria do jogador"""
+        response = self.client.get(reverse('ranking'))
+        self.assertEqual(response.context['estados_disponiveis'], ['SP'])
+        self.assertEqual(response.context['paises_disponiveis'], ['Brasil'])
+
+    def test_listas_em_cache(self):
+        """Testa que a segunda visita não consulta as listas no banco"""
+        self.client.get(reverse('ranking'))
+        # Sessão, usuário, ETag e a página; nenhuma consulta das listas
+        with self.assertNumQueries(4):
+            self.client.get(reverse('ranking'))
+
+    def test_nova_partida_invalida_listas(self):
+        """Testa que uma partida nova de outra região aparece nos filtros"""
+        self.client.get(reverse('ranking'))
+
+        outro = User.objects.create_user(
+            username='outro',
+            password='testpass123',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            estado='RJ'
+        )
+        partida = Partida.objects.create(usuario=outro, nome_empresa='Nova')
+        Startup.objects.create(partida=partida)
+
+        response = self.client.get(reverse('ranking'))
+        self.assertEqual(response.context['estados_disponiveis'], ['RJ', 'SP'])
+
+    def test_mudanca_de_regiao_invalida_listas(self):
+        """Testa que a mudança de estado do jogador atualiza os filtros"""
+        self.client.get(reverse('ranking'))
+
+        self.user.estado = 'MG'
+        self.user.save()
+
+        response = self.client.get(reverse('ranking'))
+        self.assertEqual(response.context['estados_disponiveis'], ['MG'])
+
+
 class RelatoriosTests(TestCase):
     """Testes dos relatórios e métricas"""
     
@@ -98,3 +253,74 @@ class RelatoriosTests(TestCase):
         self.client.login(username='educador', password='testpass123')
         response = self.client.get(reverse('analise_turma', args=[self.turma.codigo]))
         self.assertEqual(response.status_code, 200)
+
+
+class TurmaStatsTests(TestCase):
+    """Testes dos indicadores agregados por turma"""
+
+    def setUp(self):
+        self.client = Client()
+        self.educador = User.objects.create_user(
+            username='educador',
+            password='testpass123',
+            categoria='EDUCADOR_NEGOCIOS'
+        )
+        self.turmas = [
+            Turma.objects.create(codigo=f'TUR-{i:03d}', nome=f'Turma {i}', educador=self.educador)
+            for i in range(3)
+        ]
+        for i, valuation in enumerate(['100000.00', '300000.00']):
+            aluno = User.objects.create_user(
+                username=f'aluno{i}',
+                password='testpass123',
+                categoria='ESTUDANTE_UNIVERSITARIO',
+                codigo_turma='TUR-000'
+            )
+            partida = Partida.objects.create(usuario=aluno, nome_empresa=f'Empresa {i}')
+            Startup.objects.create(partida=partida, valuation=Decimal(valuation), saldo_caixa=Decimal('20000.00'))
+        # Partida encerrada não entra nos indicadores
+        encerrada = Partida.objects.create(usuario=aluno, nome_empresa='Encerrada', ativa=False)
+        Startup.objects.create(partida=encerrada, valuation=Decimal('900000.00'))
+        User.objects.create_user(
+            username='aluno_sem_partida',
+            password='testpass123',
+            categoria='ESTUDANTE_UNIVERSITARIO',
+            codigo_turma='TUR-001'
+        )
+
+    def test_indicadores_por_turma(self):
+        """Testa alunos, startups ativas e valuation de cada turma"""
+        stats = {s.turma.codigo: s for s in TurmaStats.para_turmas(self.turmas)}
+
+        self.assertEqual(stats['TUR-000'].total_alunos, 2)
+        self.assertEqual(stats['TUR-000'].startups_ativas, 2)
+        self.assertEqual(stats['TUR-000'].media_valuation, Decimal('200000.00'))
+        self.assertEqual(stats['TUR-000'].maior_valuation, Decimal('300000.00'))
+        self.assertEqual(stats['TUR-000'].media_caixa, Decimal('20000.00'))
+        self.assertEqual(stats['TUR-001'].total_alunos, 1)
+        self.assertEqual(stats['TUR-001'].startups_ativas, 0)
+        self.assertEqual(stats['TUR-002'].total_alunos, 0)
+
+    def test_uma_consulta_para_todas_as_turmas(self):
+        """Testa que o número de consultas não depende do número de turmas"""
+        with self.assertNumQueries(1):
+            TurmaStats.para_turmas(self.turmas)
+
+        for i in range(3, 30):
+            Turma.objects.create(codigo=f'TUR-{i:03d}', nome=f'Turma {i}', educador=self.educador)
+        turmas = list(Turma.objects.filter(educador=self.educador))
+        with self.assertNumQueries(1):
+            TurmaStats.para_turmas(turmas)
+
+    def test_paginas_com_consultas_constantes(self):
+        """Testa que ranking_turmas e metricas_turmas não consultam por turma"""
+        self.client.login(username='educador', password='testpass123')
+        for url in ['ranking_turmas', 'metricas_turmas']:
+            with self.assertNumQueries(4):
+                response = self.client.get(reverse(url))
+            self.assertEqual(len(response.context['turmas_dados']), 3)
+
+        response = self.client.get(reverse('metricas_turmas'))
+        self.assertEqual(response.context['total_alunos'], 3)
+        self.assertEqual(response.context['total_startups'], 2)
+        self.assertEqual(response.context['maior_valuation'], Decimal('300000.00'))
@@ -0,0 +1,98 @@
+"""
+Testes do replay da startup
+Cobre as variações gravadas no histórico, os snapshots periódicos e a reconstrução por turno
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from core.models import Evento, HistoricoDecisao, Partida, SnapshotStartup, Startup
+from core.services.eventos import tabela_eventos
+from core.services.replay import INTERVALO_SNAPSHOT, EstadoTurno, replay
+from core.services.turno import TurnEngine, simulate_turns
+from decimal import Decimal
+
+User = get_user_model()
+
+DECISOES = ['Investir em Marketing Agressivo', 'Contratar Engenheiro Sênior', 'Não fazer nada (Economizar)']
+
+
+class ReplayTests(TestCase):
+    """Testes da reconstrução do estado em qualquer turno"""
+
+    def setUp(self):
+        tabela_eventos.invalidar()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa', seed=7)
+        self.startup = Startup.objects.create(
+            partida=self.partida,
+            saldo_caixa=Decimal('500000.00'),
+            receita_mensal=Decimal('1000.00'),
+        )
+        Evento.objects.create(
+            titulo='Processo Trabalhista',
+            descricao='Um ex-funcionário processou a empresa.',
+            categoria=Evento.Categoria.RISCO,
+            chance_base=Decimal('0.300'),
+            impacto_saldo=Decimal('-2500.00'),
+            impacto_funcionarios=-1,
+        )
+
+    def tearDown(self):
+        tabela_eventos.invalidar()
+
+    def _jogar_registrando(self, turnos):
+        """Joga turno a turno e guarda o estado real ao fim de cada um"""
+        estados = {1: EstadoTurno.de_startup(self.startup)}
+        engine = TurnEngine(self.partida)
+        for indice in range(turnos):
+            startup = engine.jogar(DECISOES[indice % len(DECISOES)]).startup
+            estados[startup.turno_atual] = EstadoTurno.de_startup(startup)
+        return estados
+
+    def test_historico_guarda_variacoes(self):
+        """Testa que o histórico registra a variação completa do turno"""
+        TurnEngine(self.partida).jogar('Contratar Engenheiro Sênior')
+
+        historico = HistoricoDecisao.objects.get(partida=self.partida)
+        self.assertEqual(historico.delta_saldo, Decimal('-7000.00'))
+        self.assertEqual(historico.delta_receita, Decimal('2000.00'))
+        self.assertEqual(historico.delta_valuation, Decimal('25000.00'))
+        self.assertEqual(historico.delta_funcionarios, 1)
+
+    def test_snapshots_periodicos(self):
+        """Testa que um snapshot é gravado a cada INTERVALO_SNAPSHOT turnos"""
+        self._jogar_registrando(2 * INTERVALO_SNAPSHOT)
+        self.assertEqual(
+            list(SnapshotStartup.objects.filter(partida=self.partida).values_list('turno', flat=True)),
+            [INTERVALO_SNAPSHOT, 2 * INTERVALO_SNAPSHOT],
+        )
+
+    def test_replay_de_todos_os_turnos(self):
+        """Testa que o replay reconstrói exatamente o estado de cada turno"""
+        estados = self._jogar_registrando(25)
+        for turno, estado in estados.items():
+            self.assertEqual(replay(self.partida, turno), estado)
+
+        # A partir de um snapshot: busca do snapshot e soma das variações
+        with self.assertNumQueries(2):
+            replay(self.partida, INTERVALO_SNAPSHOT + 3)
+
+    def test_replay_da_simulacao(self):
+        """Testa que a simulação em lote grava variações e snapshots equivalentes"""
+        simulate_turns(self.partida, DECISOES * 5)
+        self.startup.refresh_from_db()
+
+        self.assertEqual(replay(self.partida, 16), EstadoTurno.de_startup(self.startup))
+        self.assertTrue(SnapshotStartup.objects.filter(partida=self.partida, turno=INTERVALO_SNAPSHOT).exists())
+        self.assertEqual(replay(self.partida, 1).saldo_caixa, Decimal('500000.00'))
+
+    def test_turno_fora_da_partida(self):
+        """Testa que turnos inexistentes são recusados"""
+        self._jogar_registrando(12)
+        with self.assertRaises(ValueError):
+            replay(self.partida, 0)
+        with self.assertRaises(ValueError):
+            replay(self.partida, 20)
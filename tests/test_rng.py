@@ -0,0 +1,74 @@
+"""
+Testes dos geradores aleatórios por partida
+Cobre a seed da partida, os fluxos derivados e o replay de uma simulação
+"""
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from core.models import Evento, EventoPartida, Partida, Startup
+from core.rng import PartidaRNG
+from core.services.eventos import tabela_eventos
+from core.services.turno import simulate_turns
+from decimal import Decimal
+
+User = get_user_model()
+
+
+class PartidaRNGTests(TestCase):
+    """Testes dos fluxos derivados da seed"""
+
+    def test_mesma_seed_mesma_sequencia(self):
+        """Testa que o mesmo fluxo repete a sequência"""
+        primeiro = [PartidaRNG(42).eventos(3).random() for _ in range(3)]
+        segundo = [PartidaRNG(42).eventos(3).random() for _ in range(3)]
+        self.assertEqual(primeiro, segundo)
+
+    def test_fluxos_independentes(self):
+        """Testa que finalidades, turnos e seeds diferentes geram sequências diferentes"""
+        rng = PartidaRNG(42)
+        base = rng.eventos(3).random()
+        self.assertNotEqual(base, rng.mercado(3).random())
+        self.assertNotEqual(base, rng.eventos(4).random())
+        self.assertNotEqual(base, PartidaRNG(43).eventos(3).random())
+
+
+class SeedPartidaTests(TestCase):
+    """Testes da seed gravada na partida"""
+
+    def setUp(self):
+        tabela_eventos.invalidar()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        Evento.objects.create(
+            titulo='Viralizou',
+            descricao='Um post sobre a startup viralizou.',
+            categoria=Evento.Categoria.MERCADO,
+            chance_base=Decimal('0.400'),
+            impacto_valuation=Decimal('2000.00'),
+        )
+
+    def tearDown(self):
+        tabela_eventos.invalidar()
+
+    def _jogar(self, seed):
+        partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa', seed=seed)
+        Startup.objects.create(partida=partida, saldo_caixa=Decimal('30000.00'))
+        simulate_turns(partida, ['Não fazer nada (Economizar)'] * 40)
+        partida.startup.refresh_from_db()
+        turnos = list(EventoPartida.objects.filter(partida=partida).values_list('turno', flat=True))
+        return turnos, partida.startup.valuation
+
+    def test_seed_distinta_por_partida(self):
+        """Testa que cada partida nova recebe a sua seed"""
+        primeira = Partida.objects.create(usuario=self.user, nome_empresa='A')
+        segunda = Partida.objects.create(usuario=self.user, nome_empresa='B')
+        self.assertNotEqual(primeira.seed, segunda.seed)
+
+    def test_replay_com_a_mesma_seed(self):
+        """Testa que a mesma seed reproduz os mesmos eventos e o mesmo resultado"""
+        original = self._jogar(seed=2024)
+        self.assertTrue(original[0])
+        self.assertEqual(self._jogar(seed=2024), original)
+        self.assertNotEqual(self._jogar(seed=2025)[0], original[0])
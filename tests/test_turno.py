@@ -0,0 +1,336 @@
+"""
+Testes do motor de turnos (TurnEngine)
+Cobre efeitos das decisões, idempotência e regras de bloqueio
+"""
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from core.models import Partida, Startup, HistoricoDecisao, ConquistaDesbloqueada, Decisao
+from core.services.turno import TurnEngine, DecisaoIndisponivel, PartidaEncerrada, SaldoInsuficiente, simulate_turns
+from core.management.commands.benchmark_turnos import Command as BenchmarkTurnos
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+import json
+
+User = get_user_model()
+
+
+class TurnEngineTests(TestCase):
+    """Testes do serviço TurnEngine"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(
+            partida=self.partida,
+            saldo_caixa=Decimal('30000.00'),
+            receita_mensal=Decimal('2000.00'),
+            funcionarios=0
+        )
+
+    def test_aplica_efeitos_da_decisao(self):
+        """Testa que os efeitos da decisão são gravados no banco"""
+        resultado = TurnEngine(self.partida).jogar('Contratar Engenheiro Sênior')
+
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.saldo_caixa, Decimal('24000.00'))
+        self.assertEqual(self.startup.receita_mensal, Decimal('4000.00'))
+        self.assertEqual(self.startup.valuation, Decimal('25000.00'))
+        self.assertEqual(self.startup.funcionarios, 1)
+        self.assertEqual(self.startup.turno_atual, 2)
+
+        # O estado retornado reflete o que foi gravado
+        self.assertEqual(resultado.startup.saldo_caixa, self.startup.saldo_caixa)
+        self.assertEqual(resultado.startup.turno_atual, 2)
+        self.assertFalse(resultado.duplicado)
+
+    def test_registra_historico(self):
+        """Testa que o turno é registrado no histórico"""
+        TurnEngine(self.partida).jogar('Investir em Marketing Agressivo')
+
+        historico = HistoricoDecisao.objects.get(partida=self.partida)
+        self.assertEqual(historico.turno, 2)
+        self.assertEqual(historico.decisao_tomada, 'Investir em Marketing Agressivo')
+
+    def test_chave_repetida_descartada(self):
+        """Testa que um envio repetido com a mesma chave não aplica o turno de novo"""
+        engine = TurnEngine(self.partida)
+        engine.jogar('Investir em Marketing Agressivo', chave_idempotencia='abc123')
+        resultado = engine.jogar('Investir em Marketing Agressivo', chave_idempotencia='abc123')
+
+        self.assertTrue(resultado.duplicado)
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.turno_atual, 2)
+        self.assertEqual(self.startup.saldo_caixa, Decimal('27000.00'))
+        self.assertEqual(HistoricoDecisao.objects.filter(partida=self.partida).count(), 1)
+
+    def test_chaves_diferentes_aplicam_turnos(self):
+        """Testa que chaves diferentes geram turnos distintos"""
+        engine = TurnEngine(self.partida)
+        engine.jogar('Não fazer nada (Economizar)', chave_idempotencia='a')
+        engine.jogar('Não fazer nada (Economizar)', chave_idempotencia='b')
+
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.turno_atual, 3)
+
+    def test_saldo_insuficiente(self):
+        """Testa que saldo insuficiente não altera a startup"""
+        self.startup.saldo_caixa = Decimal('100.00')
+        self.startup.receita_mensal = Decimal('0.00')
+        self.startup.save()
+
+        with self.assertRaises(SaldoInsuficiente) as ctx:
+            TurnEngine(self.partida).jogar('Contratar Engenheiro Sênior')
+
+        self.assertEqual(ctx.exception.necessario, Decimal('8000.00'))
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.turno_atual, 1)
+        self.assertFalse(HistoricoDecisao.objects.filter(partida=self.partida).exists())
+
+    def test_efeito_negativo_sem_margem(self):
+        """Testa que uma decisão que zeraria a equipe abaixo de zero é recusada sem gravar"""
+        Decisao.objects.create(titulo='Demitir Equipe', nome_curto='Demitir', delta_funcionarios=-2, ordem=99)
+
+        with self.assertRaises(DecisaoIndisponivel):
+            TurnEngine(self.partida).jogar('Demitir Equipe')
+        with self.assertRaises(DecisaoIndisponivel):
+            simulate_turns(self.partida, ['Demitir Equipe'])
+
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.funcionarios, 0)
+        self.assertEqual(self.startup.turno_atual, 1)
+
+    def test_partida_encerrada(self):
+        """Testa que partidas encerradas não aceitam turnos"""
+        self.partida.ativa = False
+        self.partida.save()
+
+        with self.assertRaises(PartidaEncerrada):
+            TurnEngine(self.partida).jogar('Não fazer nada (Economizar)')
+
+    def test_conquistas_desbloqueadas_no_turno(self):
+        """Testa que conquistas cruzadas no turno são retornadas"""
+        self.startup.saldo_caixa = Decimal('99000.00')
+        self.startup.save()
+
+        resultado = TurnEngine(self.partida).jogar('Não fazer nada (Economizar)')
+
+        titulos = [c.titulo for c in resultado.novas_conquistas]
+        self.assertIn('Primeiros R$ 100 mil', titulos)
+
+
+class SalvarJogoIdempotenciaTests(TestCase):
+    """Testes de idempotência do envio do formulário de turno"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='player',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('30000.00'))
+        self.client.force_login(self.user)
+
+    def test_formulario_contem_chave_turno(self):
+        """Testa que a página do jogo envia uma chave de idempotência"""
+        response = self.client.get(reverse('carregar_jogo', args=[self.partida.id]))
+        self.assertContains(response, 'name="chave_turno"')
+
+    def test_duplo_clique_aplica_um_turno(self):
+        """Testa que dois envios do mesmo formulário aplicam apenas um turno"""
+        dados = {'decisao': 'Investir em Marketing Agressivo', 'chave_turno': 'f' * 32}
+        self.client.post(reverse('salvar_jogo', args=[self.partida.id]), dados)
+        response = self.client.post(reverse('salvar_jogo', args=[self.partida.id]), dados)
+
+        self.assertRedirects(response, reverse('carregar_jogo', args=[self.partida.id]))
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.turno_atual, 2)
+        self.assertEqual(self.startup.saldo_caixa, Decimal('25000.00'))
+
+
+class SimulateTurnsTests(TestCase):
+    """Testes da simulação de vários turnos em lote"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='bot',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        self.startup = Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('30000.00'))
+
+    def test_mesmo_estado_que_turnos_individuais(self):
+        """Testa que o lote chega ao mesmo estado que os turnos um a um"""
+        decisoes = ['Investir em Marketing Agressivo', 'Contratar Engenheiro Sênior'] * 3
+
+        outra = Partida.objects.create(usuario=self.user, nome_empresa='Comparação')
+        Startup.objects.create(partida=outra, saldo_caixa=Decimal('30000.00'))
+        for decisao in decisoes:
+            TurnEngine(outra).jogar(decisao)
+
+        resultado = simulate_turns(self.partida, decisoes)
+
+        esperado = Startup.objects.get(pk=outra.pk)
+        self.startup.refresh_from_db()
+        self.assertEqual(resultado.turnos_aplicados, 6)
+        self.assertEqual(self.startup.saldo_caixa, esperado.saldo_caixa)
+        self.assertEqual(self.startup.valuation, esperado.valuation)
+        self.assertEqual(self.startup.turno_atual, 7)
+        self.assertEqual(
+            list(HistoricoDecisao.objects.filter(partida=self.partida).order_by('turno').values_list('turno', flat=True)),
+            [2, 3, 4, 5, 6, 7]
+        )
+
+    def test_consultas_constantes(self):
+        """Testa que o número de consultas não cresce com o número de turnos"""
+        simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 5)
+        with self.assertNumQueries(10):
+            simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 2)
+        # Lotes que cruzam snapshots gravam todos com um único bulk_create
+        with self.assertNumQueries(11):
+            simulate_turns(self.partida, ['Não fazer nada (Economizar)'] * 40)
+
+    def test_decisao_invalida_desfaz_lote(self):
+        """Testa que uma decisão inválida no meio do lote não grava nada"""
+        self.startup.saldo_caixa = Decimal('9000.00')
+        self.startup.save()
+
+        with self.assertRaises(SaldoInsuficiente) as ctx:
+            simulate_turns(self.partida, ['Contratar Engenheiro Sênior', 'Contratar Engenheiro Sênior'])
+
+        self.assertEqual(ctx.exception.indice, 1)
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.turno_atual, 1)
+        self.assertFalse(HistoricoDecisao.objects.filter(partida=self.partida).exists())
+
+    def test_para_quando_partida_termina(self):
+        """Testa que a simulação encerra a partida ao zerar o caixa"""
+        self.startup.saldo_caixa = Decimal('5000.00')
+        self.startup.save()
+
+        resultado = simulate_turns(self.partida, ['Investir em Marketing Agressivo'] * 3)
+
+        self.assertEqual(resultado.turnos_aplicados, 1)
+        self.assertFalse(resultado.partida_ativa)
+        self.partida.refresh_from_db()
+        self.assertFalse(self.partida.ativa)
+        with self.assertRaises(PartidaEncerrada):
+            simulate_turns(self.partida, ['Não fazer nada (Economizar)'])
+
+    def test_conquista_de_saldo_no_pico(self):
+        """Testa que limiares cruzados no meio do lote são desbloqueados"""
+        self.startup.saldo_caixa = Decimal('97000.00')
+        self.startup.receita_mensal = Decimal('4000.00')
+        self.startup.save()
+
+        # Sobe para 101 mil e termina abaixo de 100 mil
+        resultado = simulate_turns(self.partida, ['Não fazer nada (Economizar)', 'Contratar Engenheiro Sênior'])
+
+        self.assertLess(resultado.startup.saldo_caixa, Decimal('100000.00'))
+        self.assertIn('Primeiros R$ 100 mil', [c.titulo for c in resultado.novas_conquistas])
+        self.assertTrue(
+            ConquistaDesbloqueada.objects.filter(partida=self.partida, conquista__titulo='Primeiros R$ 100 mil').exists()
+        )
+
+
+class SimularTurnosViewTests(TestCase):
+    """Testes do endpoint JSON de simulação"""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            username='bot',
+            password='pass123',
+            categoria='ESTUDANTE_UNIVERSITARIO'
+        )
+        self.partida = Partida.objects.create(usuario=self.user, nome_empresa='Empresa')
+        Startup.objects.create(partida=self.partida, saldo_caixa=Decimal('30000.00'))
+        self.client.force_login(self.user)
+        self.url = reverse('simular_turnos', args=[self.partida.id])
+
+    def test_simulacao_retorna_estado_final(self):
+        """Testa que o endpoint aplica as decisões e retorna o estado final"""
+        response = self.client.post(
+            self.url,
+            json.dumps({'decisoes': ['Investir em Marketing Agressivo'] * 2}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        dados = response.json()
+        self.assertEqual(dados['turnos_aplicados'], 2)
+        self.assertEqual(dados['startup']['turno_atual'], 3)
+        self.assertEqual(dados['startup']['saldo_caixa'], '23000.00')
+        self.assertTrue(dados['partida_ativa'])
+
+    def test_corpo_invalido(self):
+        """Testa que um corpo sem lista de decisões é recusado"""
+        response = self.client.post(self.url, 'nada', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_decisao_invalida_informa_indice(self):
+        """Testa que o erro informa qual decisão falhou"""
+        Startup.objects.filter(pk=self.partida.pk).update(saldo_caixa=Decimal('9000.00'))
+        response = self.client.post(
+            self.url,
+            json.dumps({'decisoes': ['Contratar Engenheiro Sênior'] * 2}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['indice'], 1)
+
+    def test_get_nao_permitido(self):
+        """Testa que apenas POST é aceito"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_partida_de_outro_usuario(self):
+        """Testa que não é possível simular partidas de outro usuário"""
+        outro = User.objects.create_user(username='outro', password='pass123', categoria='ESTUDANTE_UNIVERSITARIO')
+        self.client.force_login(outro)
+        response = self.client.post(self.url, json.dumps({'decisoes': []}), content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+
+class BenchmarkTurnosTests(TestCase):
+    """Testes do comando que compara o fluxo antigo com o TurnEngine"""
+
+    def test_fluxo_legado_reproduz_salvar_jogo_antigo(self):
+        """Testa que o cenário legado não passa pelo TurnEngine nem pelo catálogo de decisões"""
+        user = User.objects.create_user(username='legado', password='pass123', categoria='ESTUDANTE_UNIVERSITARIO')
+        partida = Partida.objects.create(usuario=user, nome_empresa='Legado')
+        Startup.objects.create(partida=partida, saldo_caixa=Decimal('30000.00'))
+
+        comando = BenchmarkTurnos()
+        with patch('core.services.turno.TurnEngine.jogar') as jogar, \
+                patch('core.services.decisoes.tabela_decisoes.obter') as catalogo:
+            for _ in range(5):
+                comando._turno_legado(partida)
+        jogar.assert_not_called()
+        catalogo.assert_not_called()
+
+        startup = Startup.objects.get(pk=partida.pk)
+        self.assertEqual(startup.turno_atual, 6)
+        self.assertEqual(startup.receita_mensal, Decimal('15000.00'))
+        self.assertEqual(HistoricoDecisao.objects.filter(partida=partida).count(), 5)
+        self.assertEqual(
+            set(ConquistaDesbloqueada.objects.filter(partida=partida).values_list('conquista__titulo', flat=True)),
+            {'Primeira Simulação', 'Persistente!'},
+        )
+
+    def test_comando_informa_banco_e_cenarios(self):
+        saida = StringIO()
+        call_command('benchmark_turnos', '--turnos', '3', stdout=saida)
+        linhas = saida.getvalue().splitlines()
+        self.assertEqual(linhas[0], 'Banco: sqlite (3 turnos por cenário)')
+        self.assertEqual(len(linhas), 5)
+        self.assertTrue(linhas[1].startswith('legado (autocommit)'))
@@ -1,6 +1,8 @@
 """
 Testes simplificados para views cobrindo funcionalidades críticas.
 """
+import csv
+
 from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -346,6 +348,65 @@ class HistoricoViewTestCase(TestCase):
         decisoes_por_empresa = response.context['decisoes_por_empresa']
         self.assertEqual(len(decisoes_por_empresa), 1)
         self.assertEqual(decisoes_por_empresa[0]['total_decisoes'], 2)
+    
+    def test_historico_paginado_por_chave(self):
+        """Testa que as páginas seguem o cursor (partida, turno) sem repetir decisões"""
+        HistoricoDecisao.objects.bulk_create([
+            HistoricoDecisao(partida=self.partida, decisao_tomada=f'Decisão {turno}', turno=turno)
+            for turno in range(1, 61)
+        ])
+        self.client.login(username='player', password='pass123')
+        
+        primeira = self.client.get(reverse('historico'))
+        grupo = primeira.context['decisoes_por_empresa'][0]
+        self.assertEqual(grupo['total_decisoes'], 60)
+        self.assertEqual([d.turno for d in grupo['decisoes']][:2], [60, 59])
+        self.assertEqual(len(grupo['decisoes']), 50)
+        self.assertEqual(primeira.context['proxima_pagina'], f'{self.partida.id}-11')
+        
+        segunda = self.client.get(reverse('historico'), {'apos': primeira.context['proxima_pagina']})
+        turnos = [d.turno for d in segunda.context['decisoes_por_empresa'][0]['decisoes']]
+        self.assertEqual(turnos, list(range(10, 0, -1)))
+        self.assertIsNone(segunda.context['proxima_pagina'])
+    
+    def test_historico_cursor_invalido(self):
+        """Testa que um cursor inválido volta à primeira página"""
+        self.client.login(username='player', password='pass123')
+        response = self.client.get(reverse('historico'), {'apos': 'abc'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['primeira_pagina'])
+    
+    def test_exportar_historico_csv(self):
+        """Testa a exportação completa em CSV por streaming"""
+        HistoricoDecisao.objects.create(partida=self.partida, decisao_tomada='Investir em Marketing Agressivo', turno=1)
+        HistoricoDecisao.objects.create(partida=self.partida, decisao_tomada='Contratar Engenheiro Sênior', turno=2)
+        self.client.login(username='player', password='pass123')
+        
+        response = self.client.get(reverse('exportar_historico'))
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        linhas = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(linhas[0].split(',')[:3], ['empresa', 'turno', 'decisao'])
+        self.assertEqual(len(linhas), 3)
+        self.assertTrue(linhas[1].startswith('Test Startup,1,Investir em Marketing Agressivo'))
+    
+    def test_exportar_historico_neutraliza_formulas(self):
+        """Testa que uma decisão enviada como fórmula sai como texto no CSV"""
+        HistoricoDecisao.objects.create(partida=self.partida, decisao_tomada='=cmd|\' /C calc\'!A0', turno=1)
+        self.client.login(username='player', password='pass123')
+
+        conteudo = b''.join(self.client.get(reverse('exportar_historico')).streaming_content).decode()
+        self.assertEqual(list(csv.reader(conteudo.splitlines()))[1][2], "'=cmd|' /C calc'!A0")
+
+    def test_exportar_historico_apenas_do_usuario(self):
+        """Testa que a exportação não inclui decisões de outros jogadores"""
+        outro = User.objects.create_user(username='outro', password='pass123', categoria='ESTUDANTE_UNIVERSITARIO')
+        alheia = Partida.objects.create(usuario=outro, nome_empresa='Outra')
+        HistoricoDecisao.objects.create(partida=alheia, decisao_tomada='Segredo', turno=1)
+        self.client.login(username='player', password='pass123')
+        
+        conteudo = b''.join(self.client.get(reverse('exportar_historico')).streaming_content).decode()
+        self.assertNotIn('Segredo', conteudo)
 
 
 class ConquistasViewTestCase(TestCase):
@@ -2,10 +2,20 @@
 Testes de views específicas de educadores
 Cobre dashboards, criação de turma, análise, métricas e relatórios
 """
-from django.test import TestCase, Client
+import csv
+from datetime import datetime, timedelta
+from importlib.util import find_spec
+from unittest import skipIf, skipUnless
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from core.models import Turma, Partida, Startup
+from core.models import Turma, Partida, Startup, HistoricoDecisao
+from core.services.matriculas import TokenConvite, token_convite
 from decimal import Decimal
 
 User = get_user_model()
@@ -340,3 +350,241 @@ class GerarCodigoTurmaTests(TestCase):
         # Gerar novo código deve ser diferente
         novo_codigo = Turma.gerar_codigo_unico()
         self.assertNotEqual(novo_codigo, 'ABC-123')
+
+
+class ExportacaoTurmaTests(TestCase):
+    """Testes da exportação dos dados da turma"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.educador = User.objects.create_user(
+            username='educador',
+            password='testpass123',
+            categoria='EDUCADOR_NEGOCIOS'
+        )
+        self.turma = Turma.objects.create(codigo='EXP-001', nome='Turma Exportação', educador=self.educador)
+        for indice in range(3):
+            aluno = User.objects.create_user(
+                username=f'aluno{indice}',
+                password='testpass123',
+                categoria='ESTUDANTE_UNIVERSITARIO',
+                codigo_turma='EXP-001'
+            )
+            partida = Partida.objects.create(usuario=aluno, nome_empresa=f'Empresa {indice}')
+            Startup.objects.create(partida=partida, saldo_caixa=Decimal('10000.00'))
+            HistoricoDecisao.objects.create(partida=partida, decisao_tomada='Contratar Engenheiro Sênior', turno=1)
+        self.client.login(username='educador', password='testpass123')
+    
+    def _linhas(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode().splitlines()
+    
+    def test_exportar_startups_csv(self):
+        """Testa que cada aluno tem uma linha com o estado da startup"""
+        response = self.client.get(reverse('exportar_turma', args=['EXP-001']))
+        self.assertIn('EXP-001-startups.csv', response['Content-Disposition'])
+        linhas = self._linhas(response)
+        self.assertEqual(linhas[0].split(',')[:3], ['turma', 'aluno', 'empresa'])
+        self.assertEqual(len(linhas), 4)
+        self.assertIn('10000.00', linhas[1])
+    
+    def test_exportar_decisoes_de_todas_as_turmas(self):
+        """Testa a exportação das decisões a partir das métricas das turmas"""
+        response = self.client.get(reverse('exportar_turmas'), {'tabela': 'decisoes'})
+        linhas = self._linhas(response)
+        self.assertEqual(len(linhas), 4)
+        self.assertIn('Contratar Engenheiro Sênior', linhas[1])
+    
+    def test_exportar_csv_neutraliza_formulas(self):
+        """Testa que texto do aluno começando como fórmula não é executado pela planilha"""
+        partida = Partida.objects.get(nome_empresa='Empresa 0')
+        partida.nome_empresa = '@SUM(1+1)'
+        partida.save()
+        HistoricoDecisao.objects.create(partida=partida, decisao_tomada='=HYPERLINK("http://x","y")', turno=2)
+        HistoricoDecisao.objects.create(partida=partida, decisao_tomada='-1+1', turno=3, delta_saldo=Decimal('-500.00'))
+
+        linhas = list(csv.reader(self._linhas(self.client.get(reverse('exportar_turmas'), {'tabela': 'decisoes'}))))
+        celulas = [celula for linha in linhas[1:] for celula in linha]
+        self.assertIn("'@SUM(1+1)", celulas)
+        self.assertIn('\'=HYPERLINK("http://x","y")', celulas)
+        self.assertIn("'-1+1", celulas)
+        # Números negativos continuam números
+        self.assertIn('-500.00', celulas)
+
+    def test_exportar_consultas_constantes(self):
+        """Testa que a exportação não faz consultas por aluno"""
+        with self.assertNumQueries(4):
+            self._linhas(self.client.get(reverse('exportar_turma', args=['EXP-001']), {'tabela': 'conquistas'}))
+    
+    def test_tabela_invalida(self):
+        """Testa que uma tabela desconhecida volta para a análise da turma"""
+        response = self.client.get(reverse('exportar_turma', args=['EXP-001']), {'tabela': 'senhas'})
+        self.assertRedirects(response, reverse('analise_turma', args=['EXP-001']))
+    
+    def test_turma_de_outro_educador(self):
+        """Testa que o educador só exporta as próprias turmas"""
+        outro = User.objects.create_user(username='outro', password='testpass123', categoria='EDUCADOR_NEGOCIOS')
+        self.client.force_login(outro)
+        response = self.client.get(reverse('exportar_turma', args=['EXP-001']))
+        self.assertEqual(response.status_code, 403)
+    
+    def test_aluno_nao_exporta(self):
+        """Testa que alunos não acessam a exportação"""
+        self.client.login(username='aluno0', password='testpass123')
+        response = self.client.get(reverse('exportar_turmas'))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+    
+    @skipIf(find_spec('pyarrow'), 'pyarrow instalado')
+    def test_parquet_sem_pyarrow(self):
+        """Testa que sem o pyarrow o pedido de Parquet volta com uma mensagem"""
+        response = self.client.get(reverse('exportar_turmas'), {'formato': 'parquet'})
+        self.assertRedirects(response, reverse('metricas_turmas'), fetch_redirect_response=False)
+    
+    @skipUnless(find_spec('pyarrow'), 'pyarrow não instalado')
+    def test_exportar_parquet(self):
+        """Testa que o Parquet gerado em blocos é lido de volta com todas as linhas"""
+        import io
+        import pyarrow.parquet as pq
+        response = self.client.get(reverse('exportar_turma', args=['EXP-001']), {'formato': 'parquet'})
+        tabela = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(tabela.num_rows, 3)
+
+
+class ImportacaoAlunosTests(TestCase):
+    """Testes da importação da lista de alunos e dos convites"""
+    
+    def setUp(self):
+        self.client = Client()
+        self.educador = User.objects.create_user(
+            username='educador',
+            password='testpass123',
+            categoria='EDUCADOR_NEGOCIOS'
+        )
+        self.turma = Turma.objects.create(codigo='IMP-001', nome='Turma Importação', educador=self.educador)
+        self.client.login(username='educador', password='testpass123')
+    
+    def _importar(self, conteudo):
+        arquivo = SimpleUploadedFile('alunos.csv', conteudo.encode('utf-8-sig'), content_type='text/csv')
+        return self.client.post(reverse('importar_alunos', args=['IMP-001']), {'arquivo': arquivo})
+    
+    def _convites(self, response):
+        self.assertEqual(response.status_code, 200)
+        return list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+    
+    def test_importar_cria_alunos_na_turma(self):
+        """Testa que os alunos entram na turma, sem senha utilizável, e recebem convites"""
+        response = self._importar('Nome;E-mail;Matrícula\nAna Lima;Ana@Escola.com;123\nBruno;bruno@escola.com;456\n')
+        convites = self._convites(response)
+        self.assertEqual([c['email'] for c in convites], ['Ana@Escola.com', 'bruno@escola.com'])
+        self.assertIn('/convite/', convites[0]['convite'])
+        
+        ana = User.objects.get(username='ana@escola.com')
+        self.assertEqual(ana.turma, self.turma)
+        self.assertEqual(ana.matricula_aluno, '123')
+        self.assertEqual(ana.categoria, 'ESTUDANTE_UNIVERSITARIO')
+        self.assertFalse(ana.has_usable_password())
+    
+    def test_importar_consultas_nao_crescem_com_a_turma(self):
+        """Testa que validação e criação não fazem consultas por aluno"""
+        linhas = ''.join(f'Aluno {i},aluno{i}@escola.com,{i}\n' for i in range(300))
+        with CaptureQueriesContext(connection) as consultas:
+            convites = self._convites(self._importar('nome,email,matricula\n' + linhas))
+        self.assertEqual(len(convites), 300)
+        # Sessão, usuário, turma, conflitos e o savepoint; os INSERTs em lote dependem do banco
+        outras = [c['sql'] for c in consultas.captured_queries if not c['sql'].startswith('INSERT')]
+        self.assertEqual(len(outras), 6)
+        self.assertEqual(self.turma.alunos.count(), 300)
+    
+    def test_erros_de_todas_as_linhas_e_nada_criado(self):
+        """Testa que qualquer linha inválida cancela a importação inteira"""
+        User.objects.create_user(username='existente', email='EXISTENTE@escola.com', password='x')
+        response = self._importar(
+            'nome,email,matricula\n'
+            'Ok,ok@escola.com,1\n'
+            'Repetido,OK@escola.com,2\n'
+            'Existente,Existente@Escola.com,3\n'
+            ',sem-arroba,abc\n'
+        )
+        self.assertRedirects(response, reverse('analise_turma', args=['IMP-001']), fetch_redirect_response=False)
+        mensagens = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertEqual([m.split(':')[0] for m in mensagens], ['Linha 3', 'Linha 4', 'Linha 5', 'Linha 5', 'Linha 5'])
+        # O e-mail aparece como está no arquivo, para o educador encontrá-lo
+        self.assertIn("'Existente@Escola.com'", mensagens[1])
+        self.assertFalse(User.objects.filter(email__iexact='ok@escola.com').exists())
+    
+    def test_nome_e_email_acima_do_tamanho_dos_campos(self):
+        """Testa que nome e e-mail longos demais viram erros da linha, não um erro do banco"""
+        email_longo = 'a' * 140 + '@escola.com'
+        response = self._importar(f'nome,email,matricula\n{"N" * 151},ok@escola.com,1\nAna,{email_longo},2\n')
+        self.assertRedirects(response, reverse('analise_turma', args=['IMP-001']), fetch_redirect_response=False)
+        mensagens = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertEqual(len(mensagens), 2)
+        self.assertIn('Nome muito longo', mensagens[0])
+        self.assertIn('E-mail muito longo', mensagens[1])
+        self.assertFalse(User.objects.filter(email='ok@escola.com').exists())
+    
+    def test_colunas_ausentes(self):
+        """Testa que um CSV sem a coluna de matrícula é recusado"""
+        response = self._importar('nome,email\nAna,ana@escola.com\n')
+        self.assertRedirects(response, reverse('analise_turma', args=['IMP-001']), fetch_redirect_response=False)
+        self.assertFalse(User.objects.filter(email='ana@escola.com').exists())
+    
+    def test_turma_de_outro_educador(self):
+        """Testa que o educador só importa alunos nas próprias turmas"""
+        outro = User.objects.create_user(username='outro', password='testpass123', categoria='EDUCADOR_NEGOCIOS')
+        self.client.force_login(outro)
+        response = self._importar('nome,email,matricula\nAna,ana@escola.com,1\n')
+        self.assertEqual(response.status_code, 403)
+    
+    def test_convite_define_senha_uma_unica_vez(self):
+        """Testa o primeiro acesso pelo convite e que o link não vale duas vezes"""
+        convite = self._convites(self._importar('nome,email,matricula\nAna,ana@escola.com,1\n'))[0]['convite']
+        aluno = Client()
+        
+        formulario = aluno.get(convite, follow=True)
+        self.assertTrue(formulario.context['validlink'])
+        response = aluno.post(formulario.request['PATH_INFO'], {
+            'new_password1': 'SenhaNova123!@',
+            'new_password2': 'SenhaNova123!@',
+        })
+        self.assertRedirects(response, reverse('redirect_handler'), fetch_redirect_response=False)
+        self.assertTrue(User.objects.get(username='ana@escola.com').check_password('SenhaNova123!@'))
+        
+        self.assertFalse(Client().get(convite, follow=True).context['validlink'])
+    
+    def test_convite_vale_pelo_prazo_proprio(self):
+        """Testa que o convite ignora o prazo de redefinição de senha e vence em PRAZO_CONVITE"""
+        convite = self._convites(self._importar('nome,email,matricula\nAna,ana@escola.com,1\n'))[0]['convite']
+        agora = datetime.now()
+        
+        with self.settings(PASSWORD_RESET_TIMEOUT=60), patch.object(token_convite, 'prazo', 10 * 24 * 3600):
+            with patch.object(TokenConvite, '_now', return_value=agora + timedelta(days=9)):
+                self.assertTrue(Client().get(convite, follow=True).context['validlink'])
+            with patch.object(TokenConvite, '_now', return_value=agora + timedelta(days=11)):
+                self.assertFalse(Client().get(convite, follow=True).context['validlink'])
+    
+    @override_settings(PRAZO_CONVITE=3600)
+    def test_prazo_lido_das_settings(self):
+        self.assertEqual(TokenConvite().prazo, 3600)
+
+    def test_reenviar_convites_pendentes(self):
+        """Testa que o educador gera de novo os convites só de quem ainda não definiu a senha"""
+        self._importar('nome,email,matricula\nAna,ana@escola.com,1\nBruno,bruno@escola.com,2\n')
+        ana = User.objects.get(username='ana@escola.com')
+        ana.set_password('SenhaNova123!@')
+        ana.save()
+        
+        convites = self._convites(self.client.post(reverse('reenviar_convites', args=['IMP-001'])))
+        self.assertEqual([c['email'] for c in convites], ['bruno@escola.com'])
+        self.assertTrue(Client().get(convites[0]['convite'], follow=True).context['validlink'])
+        
+        User.objects.filter(username='bruno@escola.com').update(password=ana.password)
+        response = self.client.post(reverse('reenviar_convites', args=['IMP-001']))
+        self.assertRedirects(response, reverse('analise_turma', args=['IMP-001']), fetch_redirect_response=False)
+    
+    def test_reenviar_convites_de_outro_educador(self):
+        """Testa que o educador só reenvia convites das próprias turmas"""
+        outro = User.objects.create_user(username='outro', password='testpass123', categoria='EDUCADOR_NEGOCIOS')
+        self.client.force_login(outro)
+        self.assertEqual(self.client.post(reverse('reenviar_convites', args=['IMP-001'])).status_code, 403)